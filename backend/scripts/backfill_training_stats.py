@@ -0,0 +1,25 @@
+import argparse
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from backend.src.migrations import migreer_database
+from backend.src.repositories.data_repository import DataRepository
+
+
+def backfill(alles: bool):
+    migreer_database()
+    aantal = DataRepository.herbereken_training_stats(alles=alles)
+    if aantal is None:
+        print("✗ TrainingStats konden niet berekend worden")
+        return
+    print(f"✓ TrainingStats berekend voor {aantal} trainingen")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vul de TrainingStats samenvattingstabel aan voor oude trainingen")
+    parser.add_argument("--alles", action="store_true", help="Bereken de samenvatting van alle trainingen opnieuw")
+    args = parser.parse_args()
+    backfill(args.alles)
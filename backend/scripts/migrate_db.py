@@ -0,0 +1,91 @@
+import argparse
+import os
+import sqlite3
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from backend.config import DATABASE_PATH
+from backend.src.migrations import schema_versie, voer_migraties_uit
+from backend.src.repositories.data_repository import (
+    COLORBATTLE_LEADERBOARD_SQL,
+    LEADERBOARD_SQL,
+    MEMORY_LEADERBOARD_SQL,
+    RANKING_INDEX_SQL,
+    TRAINING_SCORE_SQL,
+)
+
+# De zwaarste queries uit DataRepository, met voorbeeldparameters voor EXPLAIN QUERY PLAN
+RAPPORT_QUERIES = [
+    ("Ranking index laden", RANKING_INDEX_SQL, ()),
+    ("Score van één training", TRAINING_SCORE_SQL, (1,)),
+    ("Leaderboard met moeilijkheid en datum", LEADERBOARD_SQL.format(
+        filter=" AND t.MoeilijkheidsId = ? AND DATE(t.Start) = ?"
+    ), (1, 1, "2026-01-27", 10)),
+    ("Memory leaderboard met moeilijkheid", MEMORY_LEADERBOARD_SQL.format(
+        filter=" AND t.MoeilijkheidsId = ?"
+    ), (2, 4, 10)),
+    ("Color Battle leaderboard", COLORBATTLE_LEADERBOARD_SQL.format(filter=""), (5, 10)),
+    ("Rondewaarden van een training", """
+        SELECT * FROM RondeWaarden WHERE TrainingsId = ? ORDER BY RondeNummer ASC, RondeWaardeId ASC
+    """, (1,)),
+]
+
+
+def query_plannen(db: sqlite3.Connection) -> dict:
+    plannen = {}
+    for naam, sql, params in RAPPORT_QUERIES:
+        try:
+            rows = db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            plannen[naam] = [row[3] for row in rows]
+        except sqlite3.Error as error:
+            # Voor de migraties bestaan tabellen als TrainingStats nog niet
+            plannen[naam] = [f"Niet uitvoerbaar: {error}"]
+    return plannen
+
+
+def print_rapport(voor: dict, na: dict):
+    print("\n=== Query plan rapport ===")
+    for naam, _, _ in RAPPORT_QUERIES:
+        print(f"\n{naam}")
+        print("  Voor:")
+        for regel in voor[naam]:
+            print(f"    {regel}")
+        print("  Na:")
+        for regel in na[naam]:
+            print(f"    {regel}")
+
+
+def migreer(db_path: str, alleen_rapport: bool):
+    conn = sqlite3.connect(db_path)
+
+    # Rapport op een kopie in het geheugen zodat de echte database pas daarna gewijzigd wordt
+    kopie = sqlite3.connect(":memory:")
+    conn.backup(kopie)
+    voor = query_plannen(kopie)
+    voer_migraties_uit(kopie)
+    na = query_plannen(kopie)
+    kopie.close()
+    print_rapport(voor, na)
+
+    if alleen_rapport:
+        print(f"\nDatabase niet gewijzigd (schema versie {schema_versie(conn)})")
+        conn.close()
+        return
+
+    uitgevoerd = voer_migraties_uit(conn)
+    if uitgevoerd:
+        print(f"\n✓ Migraties uitgevoerd: {', '.join(str(nummer) for nummer in uitgevoerd)}")
+    else:
+        print("\n✓ Database was al up-to-date")
+    print(f"  Schema versie: {schema_versie(conn)}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migreer de BrainMove database naar de laatste schema versie")
+    parser.add_argument("--db", default=DATABASE_PATH, help="Pad naar de database")
+    parser.add_argument("--alleen-rapport", action="store_true", help="Toon enkel het query plan rapport")
+    args = parser.parse_args()
+    migreer(args.db, args.alleen_rapport)
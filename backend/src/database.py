@@ -1,16 +1,129 @@
 import sqlite3
-import os
-from backend.config import DATABASE_PATH  # pip install mysql-connector-python niet meer nodig
+import threading
+from contextlib import contextmanager
+from backend.config import DATABASE_PATH, DB_TIMEOUT  # pip install mysql-connector-python niet meer nodig
+
+# PRAGMA's die één keer per connectie gezet worden (niet per query)
+CONNECTIE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+    f"PRAGMA busy_timeout = {DB_TIMEOUT * 1000}",
+)
+
+
+class ConnectionPool:
+    """Houdt per thread één warme SQLite connectie open in plaats van per query te connecteren"""
+
+    def __init__(self, database_path: str, timeout: float = DB_TIMEOUT, pragmas=CONNECTIE_PRAGMAS):
+        self._database_path = database_path
+        self._timeout = timeout
+        self._pragmas = pragmas
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connecties = {}  # {thread ident: connectie}
+        self._stats = {
+            "aangemaakt": 0,
+            "hergebruikt": 0,
+            "gesloten": 0,
+            "fouten": 0,
+        }
+
+    def _maak_connectie(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self._database_path, timeout=self._timeout, check_same_thread=False)
+        db.row_factory = sqlite3.Row  # Voor dict-achtige resultaten
+        for pragma in self._pragmas:
+            db.execute(pragma)
+        return db
+
+    def _ruim_dode_threads_op(self):
+        """Sluit connecties van threads die niet meer bestaan (moet onder lock)"""
+        levende_threads = {thread.ident for thread in threading.enumerate()}
+        for ident in [ident for ident in self._connecties if ident not in levende_threads]:
+            try:
+                self._connecties.pop(ident).close()
+            except sqlite3.Error:
+                pass
+            self._stats["gesloten"] += 1
+
+    def verkrijg_connectie(self) -> sqlite3.Connection:
+        """Geef de connectie van de huidige thread terug, maak er één aan indien nodig"""
+        db = getattr(self._local, "connectie", None)
+        if db is not None:
+            with self._lock:
+                self._stats["hergebruikt"] += 1
+            return db
+
+        try:
+            db = self._maak_connectie()
+        except sqlite3.Error:
+            with self._lock:
+                self._stats["fouten"] += 1
+            raise
+
+        self._local.connectie = db
+        with self._lock:
+            self._ruim_dode_threads_op()
+            self._connecties[threading.get_ident()] = db
+            self._stats["aangemaakt"] += 1
+        return db
+
+    def vervang_connectie(self):
+        """Gooi de connectie van de huidige thread weg (bv. na een kapotte connectie)"""
+        db = getattr(self._local, "connectie", None)
+        self._local.connectie = None
+        if db is None:
+            return
+        with self._lock:
+            self._connecties.pop(threading.get_ident(), None)
+            self._stats["gesloten"] += 1
+            self._stats["fouten"] += 1
+        try:
+            db.close()
+        except sqlite3.Error:
+            pass
+
+    def sluit_alle(self):
+        """Sluit alle open connecties (bij afsluiten van de applicatie)"""
+        with self._lock:
+            for db in self._connecties.values():
+                try:
+                    db.close()
+                except sqlite3.Error:
+                    pass
+                self._stats["gesloten"] += 1
+            self._connecties.clear()
+        self._local = threading.local()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "open_connecties": len(self._connecties),
+                "database_pad": self._database_path,
+            }
+
 
 class Database:
 
+    _pool = ConnectionPool(DATABASE_PATH)
+
     @staticmethod
     def __open_connection():
         try:
-            db = sqlite3.connect(DATABASE_PATH, timeout=30)
-            db.row_factory = sqlite3.Row  # Voor dict-achtige resultaten
+            db = Database._pool.verkrijg_connectie()
             cursor = db.cursor()
             return db, cursor
+        except sqlite3.ProgrammingError:
+            # Connectie werd gesloten: vervang ze één keer
+            Database._pool.vervang_connectie()
+            try:
+                db = Database._pool.verkrijg_connectie()
+                return db, db.cursor()
+            except sqlite3.Error as err:
+                print(f"Database connectie fout: {err}")
+                return None, None
         except sqlite3.Error as err:
             print(f"Database connectie fout: {err}")
             return None, None
@@ -25,14 +138,12 @@ class Database:
             cursor.execute(sqlQuery, params or ())
             rows = cursor.fetchall()
             result = [dict(row) for row in rows]  # Naar echte dicts
-            cursor.close()
-            db.close()
             return result
         except Exception as error:
             print(f"Query fout: {error}")
-            cursor.close()
-            db.close()
             return None
+        finally:
+            cursor.close()
 
     @staticmethod
     def get_one_row(sqlQuery, params=None):
@@ -42,19 +153,18 @@ class Database:
         try:
             cursor.execute(sqlQuery, params or ())
             row = cursor.fetchone()
-            cursor.close()
-            db.close()
             if row is None:
                 return None
             return dict(row)
         except Exception as error:
             print(f"Query fout: {error}")
-            try:
-                cursor.close()
-                db.close()
-            except:
-                pass
             return None
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _is_insert(sqlQuery: str) -> bool:
+        return sqlQuery.lstrip().upper().startswith(("INSERT", "REPLACE"))
 
     # Executes INSERT, UPDATE, DELETE
     @staticmethod
@@ -65,23 +175,56 @@ class Database:
         try:
             cursor.execute(sqlQuery, params or ())
             db.commit()
-            
-            last_id = cursor.lastrowid
-            if last_id is not None and last_id > 0:
-                result = last_id  # INSERT
+
+            # lastrowid blijft op een hergebruikte connectie staan na een eerdere INSERT:
+            # enkel een INSERT die echt een rij toevoegde geeft een id terug
+            if Database._is_insert(sqlQuery) and cursor.rowcount > 0:
+                result = cursor.lastrowid  # INSERT
             else:
                 result = cursor.rowcount  # UPDATE/DELETE
-                
+
             if result == -1:
                 raise Exception("Fout in SQL")
             elif result == 0:
                 result = 0  # Niets gewijzigd
-                
+
         except sqlite3.Error as error:
             db.rollback()
             result = None
             print(f"SQL fout: Data niet opgeslagen. {error}")
         finally:
             cursor.close()
-            db.close()
-            return result
\ No newline at end of file
+            return result
+
+    # Executes meerdere statements als één transactie
+    @staticmethod
+    @contextmanager
+    def transactie():
+        """Geeft een cursor binnen één transactie: commit bij succes, volledige rollback bij een fout"""
+        db, cursor = Database.__open_connection()
+        if not db:
+            raise sqlite3.OperationalError("Geen database connectie")
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            yield cursor
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def connectie() -> sqlite3.Connection:
+        """De gedeelde connectie van de huidige thread (voor migraties en scripts)"""
+        return Database._pool.verkrijg_connectie()
+
+    @staticmethod
+    def pool_stats() -> dict:
+        """Statistieken van de connection pool (aangemaakte/hergebruikte connecties)"""
+        return Database._pool.stats()
+
+    @staticmethod
+    def sluit_connecties():
+        """Sluit alle connecties van de pool"""
+        Database._pool.sluit_alle()
@@ -16,9 +16,17 @@ if __name__ == "__main__":
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     sys.path.insert(0, project_root)
 
+from backend.src.database import Database
+from backend.src.migrations import migreer_database
+from backend.src.repositories.async_data_repository import AsyncDataRepository, run_in_db_thread, sluit_db_thread
 from backend.src.services.mqtt_client import MQTTDeviceManager
+from backend.src.services.latentie import LatentieKalibratie
+from backend.src.services.commando_bevestiging import CommandoBevestiging
+from backend.src.services.klok_sync import klok_sync
+from backend.src.services.telemetrie_opslag import TelemetrieOpslag
+from backend.src.services.station import STANDAARD_STATION, STATIONS, ONDERWERPEN, StationSio, station_room
 from backend.src.routers.leaderboard_router import router as leaderboard_router
-from backend.src.routers.trainingen_router import router as trainingen_router
+from backend.src.routers.trainingen_router import router as trainingen_router, set_game_managers
 from backend.src.routers.games_router import router as games_router
 from backend.src.routers import devices_router
 from backend.src.services.game_service import GameService
@@ -40,7 +48,12 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Vaste vertraging voor kegels zonder latentie metingen
 HARDWARE_DELAY = float(os.getenv("HARDWARE_DELAY", "0.07"))
+# Vertraging op de kegel zelf (ToF poll interval), de netwerk latentie wordt per kegel gemeten
+SENSOR_DELAY = float(os.getenv("SENSOR_DELAY", "0.035"))
+# Bevestigde correct/incorrect commando's, enkel aanzetten (1) met firmware die het ack topic stuurt, standaard fire-and-forget
+COMMANDO_BEVESTIGING = os.getenv("COMMANDO_BEVESTIGING", "0") == "1"
 
 # Initialize SocketIO
 sio = socketio.AsyncServer(
@@ -52,9 +65,80 @@ sio = socketio.AsyncServer(
 )
 
 # Initialize services
-device_manager = MQTTDeviceManager(sio=sio)
-game_service = GameService(device_manager=device_manager, sio=sio, hardware_delay=HARDWARE_DELAY)
-game_manager = GameManager(game_service=game_service, sio=sio)
+latentie = LatentieKalibratie(standaard_correctie=HARDWARE_DELAY, sensor_delay=SENSOR_DELAY)
+bevestiging = CommandoBevestiging() if COMMANDO_BEVESTIGING else None
+telemetrie_opslag = TelemetrieOpslag()
+device_manager = MQTTDeviceManager(sio=sio, latentie=latentie, bevestiging=bevestiging, stations=STATIONS, opslag=telemetrie_opslag)
+
+# Per station een eigen game service (stop event, detectie kanaal) en manager (instellingen, game task)
+game_managers = {}
+for station in STATIONS:
+    station_sio = StationSio(sio, station)
+    station_service = GameService(device_manager=device_manager.station(station), sio=station_sio, hardware_delay=HARDWARE_DELAY)
+    game_managers[station] = GameManager(game_service=station_service, sio=station_sio)
+
+def onbekend_station(station: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=404,
+        content={"status": "error", "message": f"Onbekend station: {station}"}
+    )
+
+# Een client ontvangt enkel events waarop hij geabonneerd is (sessie: station en onderwerpen),
+# schermen zonder abonnement (leaderboard, historie) krijgen geen game of kegel verkeer
+@sio.on('kies_station')
+async def sio_kies_station(sid, data=None):
+    """Kies het station van de client, bestaande abonnementen verhuizen mee"""
+    station = (data or {}).get("station") or STANDAARD_STATION
+    if station not in game_managers:
+        return {"status": "error", "message": f"Onbekend station: {station}"}
+    async with sio.session(sid) as sessie:
+        vorig_station = sessie.get("station", STANDAARD_STATION)
+        sessie["station"] = station
+        onderwerpen = set(sessie.get("onderwerpen", ()))
+    if vorig_station != station:
+        for onderwerp in onderwerpen:
+            await sio.leave_room(sid, station_room(vorig_station, onderwerp))
+            await sio.enter_room(sid, station_room(station, onderwerp))
+    return {"status": "ok", "station": station, "onderwerpen": sorted(onderwerpen)}
+
+@sio.on('abonneer')
+async def sio_abonneer(sid, data=None):
+    """Abonneer de client op een onderwerp ('game' of 'apparaten') van zijn station"""
+    onderwerp = (data or {}).get("onderwerp")
+    if onderwerp not in ONDERWERPEN:
+        return {"status": "error", "message": f"Onbekend onderwerp: {onderwerp}"}
+    async with sio.session(sid) as sessie:
+        station = sessie.get("station", STANDAARD_STATION)
+        sessie["onderwerpen"] = set(sessie.get("onderwerpen", ())) | {onderwerp}
+    await sio.enter_room(sid, station_room(station, onderwerp))
+    return {"status": "ok", "station": station, "onderwerp": onderwerp}
+
+@sio.on('apparaten_snapshot')
+async def sio_apparaten_snapshot(sid, data=None):
+    """Volledige kegel snapshot van het station van de client (bij het abonneren of na een gemiste versie)"""
+    sessie = await sio.get_session(sid)
+    return device_manager.snapshot(sessie.get("station", STANDAARD_STATION))
+
+@sio.on('afmelden')
+async def sio_afmelden(sid, data=None):
+    """Stop met het ontvangen van een onderwerp"""
+    onderwerp = (data or {}).get("onderwerp")
+    if onderwerp not in ONDERWERPEN:
+        return {"status": "error", "message": f"Onbekend onderwerp: {onderwerp}"}
+    async with sio.session(sid) as sessie:
+        station = sessie.get("station", STANDAARD_STATION)
+        sessie["onderwerpen"] = set(sessie.get("onderwerpen", ())) - {onderwerp}
+    await sio.leave_room(sid, station_room(station, onderwerp))
+    return {"status": "ok", "station": station, "onderwerp": onderwerp}
+
+@sio.on('klok_sync')
+async def sio_klok_sync(sid, data=None):
+    """Klok synchronisatie: de returnwaarde is de ack met de monotone servertijd"""
+    return klok_sync.verwerk_ping(sid, data)
+
+@sio.on('disconnect')
+async def sio_disconnect(sid, *args):
+    klok_sync.vergeet(sid)
 
 # Shutdown state
 _should_poweroff = False
@@ -67,13 +151,32 @@ def trigger_shutdown():
 # Inject dependencies
 devices_router.set_device_manager(device_manager)
 devices_router.set_shutdown_callback(trigger_shutdown)
+set_game_managers(game_managers)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    try:
+        uitgevoerd = await run_in_db_thread(migreer_database)
+        if uitgevoerd:
+            logger.info(f"Database gemigreerd naar versie {uitgevoerd[-1]}")
+    except Exception as e:
+        logger.error(f"Database migratie mislukt: {e}")
+
+    # Vul TrainingStats aan voor trainingen die nog geen samenvatting hebben
+    aangevuld = await AsyncDataRepository.herbereken_training_stats()
+    if aangevuld:
+        logger.info(f"TrainingStats aangevuld voor {aangevuld} trainingen")
+    await AsyncDataRepository.laad_ranking_index()
+
     mqtt_task = asyncio.create_task(device_manager.start())
+    telemetrie_task = asyncio.create_task(telemetrie_opslag.verwerk())
     yield
     await device_manager.stop()
     mqtt_task.cancel()
+    telemetrie_task.cancel()
+    # Telemetrie die nog in het geheugen zit niet verliezen
+    await telemetrie_opslag.flush()
+    sluit_db_thread()
 
     # Poweroff after cleanup if requested
     if _should_poweroff:
@@ -125,8 +228,12 @@ sio_app = socketio.ASGIApp(sio, app)
 
 # Game Endpoints
 @app.post("/games/{game_id}/instellingen", tags=["Games"])
-async def get_game_instellingen(json: AlgemeneInstellingen):
-    """Sla game instellingen op in GameManager (single-player of multiplayer)"""
+async def get_game_instellingen(json: AlgemeneInstellingen, station: str = STANDAARD_STATION):
+    """Sla game instellingen op in de GameManager van een station (single-player of multiplayer)"""
+    game_manager = game_managers.get(station)
+    if game_manager is None:
+        return onbekend_station(station)
+
     # Voor multiplayer games (game_id 5)
     if json.game_id == 5 and json.speler1_naam and json.speler2_naam:
         colorbattle_json = ColorBattleInstellingen(
@@ -137,7 +244,8 @@ async def get_game_instellingen(json: AlgemeneInstellingen):
             snelheid=json.snelheid,
             ronde_id=json.ronde_id,
             rondes=json.rondes,
-            kleuren=json.kleuren
+            kleuren=json.kleuren,
+            seed=json.seed
         )
         game_manager.set_colorbattle_instellingen(colorbattle_json)
         return colorbattle_json
@@ -150,20 +258,28 @@ async def get_game_instellingen(json: AlgemeneInstellingen):
         snelheid=json.snelheid,
         ronde_id=json.ronde_id,
         rondes=json.rondes,
-        kleuren=json.kleuren
+        kleuren=json.kleuren,
+        seed=json.seed
     )
     game_manager.set_instellingen(single_json)
     return single_json
 
 @app.post("/games/colorbattle/instellingen", response_model=ColorBattleInstellingen, tags=["Games"])
-async def set_colorbattle_instellingen(json: ColorBattleInstellingen):
+async def set_colorbattle_instellingen(json: ColorBattleInstellingen, station: str = STANDAARD_STATION):
     """Sla Color Battle instellingen op (2 spelers)"""
+    game_manager = game_managers.get(station)
+    if game_manager is None:
+        return onbekend_station(station)
     game_manager.set_colorbattle_instellingen(json)
     return json
 
 @app.get("/games/{game_id}/play", tags=["Games"])
-async def play_game(game_id: int):
-    """Start een game via GameManager"""
+async def play_game(game_id: int, station: str = STANDAARD_STATION):
+    """Start een game via de GameManager van een station"""
+    game_manager = game_managers.get(station)
+    if game_manager is None:
+        return onbekend_station(station)
+
     result = await game_manager.play_game(game_id)
     
     if result.get("status") == "already_running":
@@ -187,13 +303,43 @@ async def play_game(game_id: int):
     return result
 
 @app.get("/games/stop", tags=["Games"])
-async def stop_game():
-    """Stop de actieve game"""
+async def stop_game(station: str = STANDAARD_STATION):
+    """Stop de actieve game van een station"""
+    game_manager = game_managers.get(station)
+    if game_manager is None:
+        return onbekend_station(station)
+
     result = await game_manager.stop_game()
-    await device_manager.stop_alle()
+    await device_manager.stop_alle(station)
     return result
 
 
+@app.get("/stations", tags=["Games"])
+async def get_stations():
+    """Alle stations met hun actieve game en kegels"""
+    return [
+        {
+            "station": station,
+            "game_actief": game_manager.is_game_running(),
+            "game_id": game_manager.game_id,
+            "apparaten": device_manager.verkrijg_apparaten_status(station)
+        }
+        for station, game_manager in game_managers.items()
+    ]
+
+
+@app.get("/database/stats", tags=["Systeem"])
+async def get_database_stats():
+    """Statistieken van de database connection pool"""
+    return Database.pool_stats()
+
+
+@app.get("/klok/clients", tags=["Systeem"])
+async def get_klok_clients():
+    """Gemeten rtt en klok offset per verbonden Socket.IO client"""
+    return klok_sync.stats()
+
+
 @app.get("/")
 async def read_root():
     return {"BrainMoveG1": "Backend is running"}
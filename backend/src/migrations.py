@@ -0,0 +1,347 @@
+import logging
+import sqlite3
+from typing import List
+from backend.src.database import Database
+from backend.src.repositories.gebruiker_cache import NIET_PLAATSHOUDER_SQL
+
+logger = logging.getLogger(__name__)
+
+# Tabellen die door scripts/init_db.py aangemaakt worden, zonder deze valt er niets te migreren
+BASIS_TABELLEN = ("Gebruikers", "Games", "Moeilijkheden", "Rondes", "Trainingen", "RondeWaarden")
+
+
+def _tabel_bestaat(cursor, tabel: str) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabel,))
+    return cursor.fetchone() is not None
+
+
+def _migratie_1_indexen_en_real_waarde(cursor):
+    """Waarde als REAL opslaan en indexen voor de leaderboard/ranking/historie queries"""
+    # SQLite kan het type van een kolom niet wijzigen: tabel opnieuw opbouwen
+    cursor.execute("""
+    CREATE TABLE RondeWaarden_nieuw (
+        RondeWaardeId INTEGER PRIMARY KEY AUTOINCREMENT,
+        TrainingsId INTEGER,
+        RondeNummer INTEGER,
+        Waarde REAL,
+        Uitkomst TEXT,
+        FOREIGN KEY (TrainingsId) REFERENCES Trainingen(TrainingsId)
+    );
+    """)
+    cursor.execute("""
+    INSERT INTO RondeWaarden_nieuw (RondeWaardeId, TrainingsId, RondeNummer, Waarde, Uitkomst)
+    SELECT RondeWaardeId, TrainingsId, RondeNummer, CAST(Waarde AS REAL), Uitkomst
+    FROM RondeWaarden
+    """)
+    cursor.execute("DROP TABLE RondeWaarden")
+    cursor.execute("ALTER TABLE RondeWaarden_nieuw RENAME TO RondeWaarden")
+
+    # Covering index: alle per-training aggregaties (AVG/MIN/MAX/COUNT) lezen enkel de index
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_rondewaarden_training
+    ON RondeWaarden (TrainingsId, RondeNummer, Waarde, Uitkomst)
+    """)
+    # Leaderboard en ranking: filter op game + moeilijkheid, join op gebruiker
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_trainingen_game_moeilijkheid
+    ON Trainingen (GameId, MoeilijkheidsId, Start, GebruikersId)
+    """)
+    # Historie en leaderboard per dag: DATE(Start) kan enkel via een expressie-index
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_trainingen_game_datum
+    ON Trainingen (GameId, DATE(Start))
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_trainingen_gebruiker ON Trainingen (GebruikersId)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_moeilijkheden_game ON Moeilijkheden (GameId)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rondes_game ON Rondes (GameId)")
+    cursor.execute("ANALYZE")
+
+
+def _migratie_2_training_stats(cursor):
+    """Samenvattingstabel met één rij per training (gevuld bij opslaan, backfill via DataRepository)"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS TrainingStats (
+        TrainingsId INTEGER PRIMARY KEY,
+        AantalRondes INTEGER NOT NULL DEFAULT 0,
+        GemiddeldeWaarde REAL,
+        BesteWaarde REAL,
+        TotaleDuur REAL NOT NULL DEFAULT 0,
+        MaxRonde INTEGER,
+        MaxCorrecteRonde INTEGER,
+        AantalCorrect INTEGER NOT NULL DEFAULT 0,
+        AantalFout INTEGER NOT NULL DEFAULT 0,
+        AantalTeLaat INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (TrainingsId) REFERENCES Trainingen(TrainingsId)
+    );
+    """)
+
+
+def _migratie_3_speler_per_rondewaarde(cursor):
+    """Expliciete speler per rondewaarde zodat Color Battle per speler geaggregeerd kan worden"""
+    cursor.execute("ALTER TABLE RondeWaarden ADD COLUMN GebruikersId INTEGER REFERENCES Gebruikers(GebruikersId)")
+
+    # Gewone games: de speler van de training
+    cursor.execute("""
+    UPDATE RondeWaarden
+    SET GebruikersId = (SELECT t.GebruikersId FROM Trainingen t WHERE t.TrainingsId = RondeWaarden.TrainingsId)
+    WHERE TrainingsId IN (SELECT TrainingsId FROM Trainingen WHERE GameId != 5)
+    """)
+
+    # Color Battle: rondes werden om beurten voor speler 1 en speler 2 opgeslagen, speler 2 werd
+    # telkens direct na speler 1 als gebruiker aangemaakt
+    cursor.execute("""
+    WITH volgorde AS (
+        SELECT
+            rv.RondeWaardeId,
+            ROW_NUMBER() OVER (PARTITION BY rv.TrainingsId ORDER BY rv.RondeWaardeId) AS nr,
+            t.GebruikersId AS speler1,
+            (SELECT MIN(g.GebruikersId) FROM Gebruikers g WHERE g.GebruikersId > t.GebruikersId) AS speler2
+        FROM RondeWaarden rv
+        JOIN Trainingen t ON t.TrainingsId = rv.TrainingsId
+        WHERE t.GameId = 5
+    )
+    UPDATE RondeWaarden
+    SET GebruikersId = (
+        SELECT CASE WHEN v.nr % 2 = 1 THEN v.speler1 ELSE v.speler2 END
+        FROM volgorde v
+        WHERE v.RondeWaardeId = RondeWaarden.RondeWaardeId
+    )
+    WHERE TrainingsId IN (SELECT TrainingsId FROM Trainingen WHERE GameId = 5)
+    """)
+
+    # Covering index voor het gemiddelde per (training, speler)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_rondewaarden_training_speler
+    ON RondeWaarden (TrainingsId, GebruikersId, Waarde)
+    """)
+
+
+def _migratie_4_training_deelnemers(cursor):
+    """Deelnemers per training en spelernummer per rondewaarde (speler 2 van Color Battle niet meer raden)"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS TrainingDeelnemers (
+        TrainingsId INTEGER NOT NULL,
+        SpelerNummer INTEGER NOT NULL,
+        GebruikersId INTEGER NOT NULL,
+        PRIMARY KEY (TrainingsId, SpelerNummer),
+        FOREIGN KEY (TrainingsId) REFERENCES Trainingen(TrainingsId),
+        FOREIGN KEY (GebruikersId) REFERENCES Gebruikers(GebruikersId)
+    ) WITHOUT ROWID;
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_trainingdeelnemers_gebruiker ON TrainingDeelnemers (GebruikersId)")
+
+    # Speler 1 is de primaire gebruiker van elke training
+    cursor.execute("""
+    INSERT OR IGNORE INTO TrainingDeelnemers (TrainingsId, SpelerNummer, GebruikersId)
+    SELECT TrainingsId, 1, GebruikersId FROM Trainingen WHERE GebruikersId IS NOT NULL
+    """)
+    # Speler 2 van Color Battle: zelfde afleiding als de backfill van RondeWaarden.GebruikersId (migratie 3)
+    cursor.execute("""
+    INSERT OR IGNORE INTO TrainingDeelnemers (TrainingsId, SpelerNummer, GebruikersId)
+    SELECT TrainingsId, 2, speler2
+    FROM (
+        SELECT t.TrainingsId,
+               (SELECT MIN(g.GebruikersId) FROM Gebruikers g WHERE g.GebruikersId > t.GebruikersId) AS speler2
+        FROM Trainingen t
+        WHERE t.GameId = 5
+    )
+    WHERE speler2 IS NOT NULL
+    """)
+
+    cursor.execute("ALTER TABLE RondeWaarden ADD COLUMN SpelerNummer INTEGER NOT NULL DEFAULT 1")
+    cursor.execute("""
+    WITH volgorde AS (
+        SELECT rv.RondeWaardeId,
+               ROW_NUMBER() OVER (PARTITION BY rv.TrainingsId ORDER BY rv.RondeWaardeId) AS nr
+        FROM RondeWaarden rv
+        JOIN Trainingen t ON t.TrainingsId = rv.TrainingsId
+        WHERE t.GameId = 5
+    )
+    UPDATE RondeWaarden
+    SET SpelerNummer = 2
+    WHERE RondeWaardeId IN (SELECT RondeWaardeId FROM volgorde WHERE nr % 2 = 0)
+    """)
+
+
+def _migratie_5_unieke_gebruikers(cursor):
+    """Dubbele gebruikers samenvoegen en een unieke index op de genormaliseerde naam
+
+    Anonieme spelers (Speler, Speler 1, Speler 2) blijven één gebruiker per training.
+    """
+    cursor.execute("UPDATE Gebruikers SET Gebruikersnaam = TRIM(Gebruikersnaam) WHERE Gebruikersnaam != TRIM(Gebruikersnaam)")
+
+    # Per genormaliseerde naam blijft de oudste gebruiker over
+    cursor.execute(f"""
+    CREATE TEMP TABLE GebruikerSamenvoeging AS
+    SELECT g.GebruikersId AS OudId, eerste.NieuwId
+    FROM Gebruikers g
+    JOIN (
+        SELECT LOWER(TRIM(Gebruikersnaam)) AS Naam, MIN(GebruikersId) AS NieuwId
+        FROM Gebruikers
+        WHERE {NIET_PLAATSHOUDER_SQL}
+        GROUP BY LOWER(TRIM(Gebruikersnaam))
+    ) eerste ON eerste.Naam = LOWER(TRIM(g.Gebruikersnaam))
+    WHERE g.GebruikersId != eerste.NieuwId
+    """)
+
+    for tabel in ("Trainingen", "RondeWaarden", "TrainingDeelnemers"):
+        cursor.execute(f"""
+        UPDATE {tabel}
+        SET GebruikersId = (SELECT s.NieuwId FROM GebruikerSamenvoeging s WHERE s.OudId = {tabel}.GebruikersId)
+        WHERE GebruikersId IN (SELECT OudId FROM GebruikerSamenvoeging)
+        """)
+
+    # Laatst bewerkt = meest recente van alle samengevoegde gebruikers
+    cursor.execute("""
+    UPDATE Gebruikers
+    SET LaatstBewerkt = (
+        SELECT MAX(g.LaatstBewerkt) FROM Gebruikers g
+        WHERE LOWER(TRIM(g.Gebruikersnaam)) = LOWER(TRIM(Gebruikers.Gebruikersnaam))
+    )
+    WHERE GebruikersId IN (SELECT NieuwId FROM GebruikerSamenvoeging)
+    """)
+    cursor.execute("DELETE FROM Gebruikers WHERE GebruikersId IN (SELECT OudId FROM GebruikerSamenvoeging)")
+    cursor.execute("DROP TABLE GebruikerSamenvoeging")
+
+    # Partiële index: dezelfde voorwaarde als de lookup in DataRepository._haal_of_maak_gebruiker
+    cursor.execute(f"""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_gebruikers_naam
+    ON Gebruikers (LOWER(TRIM(Gebruikersnaam)))
+    WHERE {NIET_PLAATSHOUDER_SQL}
+    """)
+    cursor.execute("ANALYZE")
+
+
+def _migratie_6_ronde_plannen(cursor):
+    """Seed en vooraf gegenereerde opdrachten per training, om een training exact opnieuw te spelen"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS RondePlannen (
+        TrainingsId INTEGER PRIMARY KEY,
+        Seed INTEGER NOT NULL,
+        PlanJson TEXT NOT NULL,
+        FOREIGN KEY (TrainingsId) REFERENCES Trainingen(TrainingsId)
+    );
+    """)
+
+
+def _migratie_7_telemetrie(cursor):
+    """Ruwe kegel telemetrie (batterij, status, afstand) en rollups per minuut, uur en dag"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS TelemetrieMetingen (
+        Tijdstip REAL NOT NULL,
+        Station TEXT NOT NULL,
+        Kleur TEXT NOT NULL,
+        Soort TEXT NOT NULL,
+        Waarde REAL
+    );
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_telemetrie_kegel
+    ON TelemetrieMetingen (Station, Kleur, Soort, Tijdstip)
+    """)
+    # Opkuis van oude ruwe metingen
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_telemetrie_tijdstip
+    ON TelemetrieMetingen (Tijdstip)
+    """)
+
+    # Resolutie in seconden (60, 3600, 86400), Bucket = begin van het interval (unix tijd)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS TelemetrieRollups (
+        Resolutie INTEGER NOT NULL,
+        Station TEXT NOT NULL,
+        Kleur TEXT NOT NULL,
+        Soort TEXT NOT NULL,
+        Bucket INTEGER NOT NULL,
+        Aantal INTEGER NOT NULL,
+        Som REAL NOT NULL,
+        Minimum REAL,
+        Maximum REAL,
+        Laatste REAL,
+        PRIMARY KEY (Resolutie, Station, Kleur, Soort, Bucket)
+    ) WITHOUT ROWID;
+    """)
+
+
+def _migratie_8_detectie_log(cursor):
+    """Alle aanrakingen per training met ToF afstand en beoordeling (valse detecties, sensor afstelling)"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS DetectieLog (
+        DetectieId INTEGER PRIMARY KEY AUTOINCREMENT,
+        TrainingsId INTEGER NOT NULL,
+        RondeNummer INTEGER,
+        SpelerNummer INTEGER,
+        Station TEXT NOT NULL,
+        Kleur TEXT NOT NULL,
+        Afstand INTEGER NOT NULL,
+        OntvangenMs REAL NOT NULL,
+        Beoordeling TEXT NOT NULL,
+        FOREIGN KEY (TrainingsId) REFERENCES Trainingen(TrainingsId)
+    );
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_detectielog_training
+    ON DetectieLog (TrainingsId)
+    """)
+
+
+# (versie, beschrijving, functie) - enkel toevoegen, nooit bestaande migraties wijzigen
+MIGRATIES = [
+    (1, "Indexen voor Trainingen/RondeWaarden en Waarde als REAL", _migratie_1_indexen_en_real_waarde),
+    (2, "TrainingStats samenvattingstabel", _migratie_2_training_stats),
+    (3, "GebruikersId per rondewaarde (Color Battle per speler)", _migratie_3_speler_per_rondewaarde),
+    (4, "TrainingDeelnemers en SpelerNummer per rondewaarde", _migratie_4_training_deelnemers),
+    (5, "Dubbele gebruikers samenvoegen en unieke naam index", _migratie_5_unieke_gebruikers),
+    (6, "RondePlannen per training (seed en opdrachten)", _migratie_6_ronde_plannen),
+    (7, "TelemetrieMetingen en TelemetrieRollups", _migratie_7_telemetrie),
+    (8, "DetectieLog per training", _migratie_8_detectie_log),
+]
+
+
+def schema_versie(db: sqlite3.Connection) -> int:
+    return db.execute("PRAGMA user_version").fetchone()[0]
+
+
+def voer_migraties_uit(db: sqlite3.Connection) -> List[int]:
+    """Voer alle openstaande migraties uit, elk in een eigen transactie
+
+    Returns:
+        Lijst met de versienummers die uitgevoerd zijn
+    """
+    cursor = db.cursor()
+    try:
+        ontbrekend = [tabel for tabel in BASIS_TABELLEN if not _tabel_bestaat(cursor, tabel)]
+    finally:
+        cursor.close()
+    if ontbrekend:
+        logger.warning(f"Database niet geïnitialiseerd (ontbrekende tabellen: {', '.join(ontbrekend)}), migraties overgeslagen")
+        return []
+
+    versie = schema_versie(db)
+    uitgevoerd = []
+    for nummer, beschrijving, migratie in MIGRATIES:
+        if nummer <= versie:
+            continue
+
+        cursor = db.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            migratie(cursor)
+            cursor.execute(f"PRAGMA user_version = {nummer}")
+            db.commit()
+        except sqlite3.Error as error:
+            db.rollback()
+            logger.error(f"Database migratie {nummer} mislukt: {error}")
+            raise
+        finally:
+            cursor.close()
+
+        logger.info(f"Database migratie {nummer} uitgevoerd: {beschrijving}")
+        uitgevoerd.append(nummer)
+
+    return uitgevoerd
+
+
+def migreer_database() -> List[int]:
+    """Migreer de applicatie database via de connectie van de huidige thread"""
+    return voer_migraties_uit(Database.connectie())
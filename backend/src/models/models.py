@@ -9,6 +9,7 @@ class Instellingen(BaseModel):
     ronde_id : int
     rondes: int
     kleuren: list[str]
+    seed: Optional[int] = None  # seed van een eerdere training om dezelfde opdrachten opnieuw te spelen
 
 class ColorBattleInstellingen(BaseModel):
     game_id: int
@@ -19,6 +20,7 @@ class ColorBattleInstellingen(BaseModel):
     ronde_id: int
     rondes: int
     kleuren: list[str]
+    seed: Optional[int] = None
 
 class AlgemeneInstellingen(BaseModel):
     """Universeel model voor zowel single-player als multiplayer games"""
@@ -31,6 +33,16 @@ class AlgemeneInstellingen(BaseModel):
     ronde_id: int
     rondes: int
     kleuren: list[str]
+    seed: Optional[int] = None
+
+class RondePlan(BaseModel):
+    """Alle opdrachten van een training, vooraf gegenereerd uit de seed"""
+    game_id: int
+    seed: int
+    kleuren: list[str] = []  # Color Sprint en Falling Colors: kleur per ronde, Memory: de volledige reeks
+    nummer_mapping: dict[str, int] = {}  # Number Match: kleur -> nummer
+    nummers: list[int] = []  # Number Match: nummer per ronde
+    kleurparen: list[tuple[str, str]] = []  # Color Battle: (kleur speler 1, kleur speler 2) per ronde
 
 class Training(BaseModel):
     start_tijd: str
@@ -45,6 +57,35 @@ class RondeWaarde(BaseModel):
     ronde_nummer: int
     waarde: float
     uitkomst: str
+    speler_nummer: int = 1
+
+class NieuweRondeWaarde(BaseModel):
+    ronde_nummer: int
+    waarde: float
+    uitkomst: str
+    speler_nummer: int = 1  # 1-gebaseerde index in TrainingResultaat.gebruikersnamen
+
+class DetectieLogItem(BaseModel):
+    """Eén aanraking tijdens een training, ook de niet beoordeelde (voor sensor afstelling)"""
+    ronde_nummer: Optional[int] = None  # None: voor de eerste ronde
+    speler_nummer: Optional[int] = None  # Color Battle: speler aan wie de aanraking toegekend is
+    station: str
+    kleur: str
+    afstand: int  # ToF afstand in mm
+    ontvangen_ms: float  # ontvangst, in ms sinds de start van de game
+    beoordeling: str  # correct, fout, te laat of genegeerd
+
+class TrainingResultaat(BaseModel):
+    """Volledige training (spelers, training en rondewaarden) om in één transactie op te slaan"""
+    gebruikersnamen: list[str]  # eerste naam = gebruiker gekoppeld aan de training
+    start_tijd: str
+    aantal_kleuren: int
+    ronde_id: int
+    moeilijkheids_id: int
+    game_id: int
+    rondewaarden: list[NieuweRondeWaarde]
+    ronde_plan: Optional[RondePlan] = None
+    detecties: list[DetectieLogItem] = []
 
 class CorrecteRondeWaarde(BaseModel):
     ronde_nummer: int
@@ -0,0 +1,44 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from backend.src.database import Database
+from backend.src.repositories.data_repository import DataRepository
+
+# Eén vaste database thread: SQLite schrijft toch serieel en deze thread houdt
+# via de connection pool zijn eigen warme connectie open
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="brainmove-db")
+
+
+async def run_in_db_thread(func, *args, **kwargs):
+    """Voer een synchrone database functie uit op de database thread zonder de event loop te blokkeren"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, functools.partial(func, *args, **kwargs))
+
+
+def sluit_db_thread():
+    """Wacht lopende queries af en sluit de database thread en connecties"""
+    _db_executor.shutdown(wait=True)
+    Database.sluit_connecties()
+
+
+class AsyncRepository:
+    """Async variant van een repository met dezelfde methodes, uitgevoerd op de database thread"""
+
+    def __init__(self, repository):
+        self._repository = repository
+
+    def __getattr__(self, naam):
+        methode = getattr(self._repository, naam)
+        if not callable(methode):
+            return methode
+
+        @functools.wraps(methode)
+        async def async_methode(*args, **kwargs):
+            return await run_in_db_thread(methode, *args, **kwargs)
+
+        # Bewaar de wrapper zodat __getattr__ maar één keer per methode nodig is
+        setattr(self, naam, async_methode)
+        return async_methode
+
+
+AsyncDataRepository = AsyncRepository(DataRepository)
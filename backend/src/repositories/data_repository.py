@@ -1,155 +1,401 @@
+import sqlite3
 from typing import List, Optional, Any, Dict
 from backend.src.database import Database
+from backend.src.repositories.gebruiker_cache import NIET_PLAATSHOUDER_SQL, gebruiker_cache, is_plaatshouder
+from backend.src.repositories.leaderboard_cache import leaderboard_cache
+from backend.src.repositories.ranking_index import ranking_index
 from backend.src.models.models import (
     MoeilijkheidVoorLeaderboard,
     RondeWaarde,
-    Training,
     GameVoorOverzicht,
     DetailGame,
     Moeilijkheid,
     Ronde,
     LeaderboardItem,
     GameVoorFilter,
-    TrainingVoorHistorie
+    TrainingVoorHistorie,
+    TrainingResultaat,
+    RondePlan,
+    DetectieLogItem
 )
 
+# Herberekent TrainingStats (één rij per training) uit de ruwe RondeWaarden
+TRAINING_STATS_SQL = """
+    INSERT OR REPLACE INTO TrainingStats (
+        TrainingsId, AantalRondes, GemiddeldeWaarde, BesteWaarde, TotaleDuur,
+        MaxRonde, MaxCorrecteRonde, AantalCorrect, AantalFout, AantalTeLaat
+    )
+    SELECT
+        t.TrainingsId,
+        COUNT(rv.RondeWaardeId),
+        AVG(rv.Waarde),
+        MIN(rv.Waarde),
+        COALESCE(SUM(rv.Waarde), 0),
+        MAX(rv.RondeNummer),
+        MAX(CASE WHEN LOWER(rv.Uitkomst) = 'correct' THEN rv.RondeNummer END),
+        SUM(CASE WHEN LOWER(rv.Uitkomst) = 'correct' THEN 1 ELSE 0 END),
+        SUM(CASE WHEN LOWER(rv.Uitkomst) = 'fout' THEN 1 ELSE 0 END),
+        SUM(CASE WHEN LOWER(rv.Uitkomst) = 'te laat' THEN 1 ELSE 0 END)
+    FROM Trainingen t
+    LEFT JOIN RondeWaarden rv ON rv.TrainingsId = t.TrainingsId
+    WHERE {filter}
+    GROUP BY t.TrainingsId
+"""
+
+# Scores van alle trainingen voor de in-memory ranking index
+RANKING_INDEX_SQL = """
+    SELECT t.GameId, t.MoeilijkheidsId, ts.MaxRonde, ts.GemiddeldeWaarde
+    FROM Trainingen t
+    JOIN TrainingStats ts ON ts.TrainingsId = t.TrainingsId
+    WHERE ts.AantalRondes > 0
+"""
+
+# Game, moeilijkheid en samenvatting van één training (voor de ranking)
+TRAINING_SCORE_SQL = """
+    SELECT t.GameId, t.MoeilijkheidsId, ts.AantalRondes, ts.MaxRonde, ts.GemiddeldeWaarde
+    FROM Trainingen t
+    LEFT JOIN TrainingStats ts ON ts.TrainingsId = t.TrainingsId
+    WHERE t.TrainingsId = ?
+"""
+
+# Leaderboard van de games met een gemiddelde reactietijd (lager is beter), {filter} voor moeilijkheid/datum
+LEADERBOARD_SQL = """
+    SELECT
+        ROW_NUMBER() OVER (ORDER BY SUM(ts.TotaleDuur) / SUM(ts.AantalRondes) ASC) as plaats,
+        g.Gebruikersnaam,
+        SUM(ts.TotaleDuur) / SUM(ts.AantalRondes) as waarde
+    FROM Trainingen t
+    JOIN Gebruikers g ON t.GebruikersId = g.GebruikersId
+    JOIN TrainingStats ts ON t.TrainingsId = ts.TrainingsId
+    WHERE t.GameId = ? AND ts.AantalRondes > 0{filter}
+    GROUP BY g.GebruikersId, g.Gebruikersnaam
+    ORDER BY waarde ASC
+    LIMIT ?
+"""
+
+# Memory leaderboard: eerst hoogste correcte ronde, dan gemiddelde waarde
+MEMORY_LEADERBOARD_SQL = """
+    SELECT
+        ROW_NUMBER() OVER (ORDER BY beste_kleuren DESC, gem_waarde ASC) as plaats,
+        Gebruikersnaam,
+        beste_kleuren as waarde
+    FROM (
+        SELECT
+            g.Gebruikersnaam,
+            MAX(ts.MaxCorrecteRonde) as beste_kleuren,
+            SUM(ts.TotaleDuur) / NULLIF(SUM(ts.AantalRondes), 0) as gem_waarde
+        FROM Gebruikers g
+        JOIN Trainingen t ON g.GebruikersId = t.GebruikersId
+        LEFT JOIN TrainingStats ts ON t.TrainingsId = ts.TrainingsId
+        WHERE t.GameId = ?{filter}
+        GROUP BY g.GebruikersId, g.Gebruikersnaam
+    ) ranked
+    ORDER BY beste_kleuren DESC, gem_waarde ASC
+    LIMIT ?
+"""
+
+# Color Battle leaderboard: gemiddelde per (training, speler), daarna gemiddelde per speler
+COLORBATTLE_LEADERBOARD_SQL = """
+    SELECT
+        ROW_NUMBER() OVER (ORDER BY AVG(per_training.gem_waarde) ASC) as plaats,
+        g.Gebruikersnaam,
+        AVG(per_training.gem_waarde) as waarde
+    FROM (
+        SELECT rv.TrainingsId, rv.GebruikersId, AVG(rv.Waarde) as gem_waarde
+        FROM Trainingen t
+        JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
+        WHERE t.GameId = ?{filter} AND rv.GebruikersId IS NOT NULL
+        GROUP BY rv.TrainingsId, rv.GebruikersId
+    ) per_training
+    JOIN Gebruikers g ON per_training.GebruikersId = g.GebruikersId
+    GROUP BY g.Gebruikersnaam
+    ORDER BY waarde ASC
+    LIMIT ?
+"""
+
 class DataRepository:
     
     @staticmethod
     def add_gebruiker(gebruikersnaam: str) -> Any:
-        sql_query = "INSERT INTO Gebruikers (Gebruikersnaam, LaatstBewerkt) VALUES (?, datetime('now'))"
-        params = (gebruikersnaam,)
-        return Database.execute_sql(sql_query, params)
+        """Geef het id van de gebruiker met deze naam terug, maak de gebruiker aan als hij nog niet bestaat"""
+        try:
+            with Database.transactie() as cursor:
+                gebruikers_id = DataRepository._haal_of_maak_gebruiker(cursor, gebruikersnaam)
+        except sqlite3.Error as error:
+            print(f"SQL fout: Gebruiker niet opgeslagen. {error}")
+            return None
+        gebruiker_cache.bewaar(gebruikersnaam, gebruikers_id)
+        return gebruikers_id
 
     @staticmethod
-    def add_training(training: Training) -> Any:
-        sql_query = """
-            INSERT INTO Trainingen 
-            (Start, AantalKleuren, GebruikersId, RondeId, MoeilijkheidsId, GameId) 
-            VALUES (?, ?, ?, ?, ?, ?)
+    def _haal_of_maak_gebruiker(cursor: sqlite3.Cursor, gebruikersnaam: str) -> int:
+        """Get-or-create binnen een lopende transactie via de unieke index op LOWER(TRIM(Gebruikersnaam))
+
+        Anonieme spelers (standaardnaam zoals "Speler") krijgen telkens een nieuwe gebruiker.
         """
-        params = (training.start_tijd, training.aantal_kleuren, training.gebruikers_id, training.ronde_id, training.moeilijkheids_id, training.game_id)
-        return Database.execute_sql(sql_query, params)
+        gebruikersnaam = gebruikersnaam.strip(" ")
+        if is_plaatshouder(gebruikersnaam):
+            cursor.execute(
+                "INSERT INTO Gebruikers (Gebruikersnaam, LaatstBewerkt) VALUES (?, datetime('now'))",
+                (gebruikersnaam,)
+            )
+            return cursor.lastrowid
+
+        gebruikers_id = gebruiker_cache.haal_op(gebruikersnaam)
+        if gebruikers_id is not None:
+            return gebruikers_id
+
+        cursor.execute(
+            "INSERT OR IGNORE INTO Gebruikers (Gebruikersnaam, LaatstBewerkt) VALUES (?, datetime('now'))",
+            (gebruikersnaam,)
+        )
+        cursor.execute(
+            f"SELECT GebruikersId FROM Gebruikers WHERE LOWER(TRIM(Gebruikersnaam)) = LOWER(TRIM(?)) AND {NIET_PLAATSHOUDER_SQL}",
+            (gebruikersnaam,)
+        )
+        return cursor.fetchone()['GebruikersId']
 
     @staticmethod
-    def add_ronde_waarde(ronde_waarde: RondeWaarde) -> Any:
-        sql_query = """
-            INSERT INTO RondeWaarden (TrainingsId, RondeNummer, Waarde, Uitkomst) 
-            VALUES (?, ?, ?, ?)
+    def save_training_resultaat(resultaat: TrainingResultaat) -> Optional[Dict[str, Any]]:
+        """Sla spelers, training en alle rondewaarden op in één transactie
+
+        Returns:
+            {"gebruikers_ids": [...], "trainings_id": id} of None als er niets is opgeslagen
+        """
+        try:
+            with Database.transactie() as cursor:
+                gebruikers_ids = [
+                    DataRepository._haal_of_maak_gebruiker(cursor, gebruikersnaam)
+                    for gebruikersnaam in resultaat.gebruikersnamen
+                ]
+
+                cursor.execute("""
+                    INSERT INTO Trainingen 
+                    (Start, AantalKleuren, GebruikersId, RondeId, MoeilijkheidsId, GameId) 
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (resultaat.start_tijd, resultaat.aantal_kleuren, gebruikers_ids[0], resultaat.ronde_id, resultaat.moeilijkheids_id, resultaat.game_id))
+                trainings_id = cursor.lastrowid
+
+                cursor.executemany("""
+                    INSERT INTO TrainingDeelnemers (TrainingsId, SpelerNummer, GebruikersId)
+                    VALUES (?, ?, ?)
+                """, [
+                    (trainings_id, speler_nummer, gebruikers_id)
+                    for speler_nummer, gebruikers_id in enumerate(gebruikers_ids, start=1)
+                ])
+
+                cursor.executemany("""
+                    INSERT INTO RondeWaarden (TrainingsId, RondeNummer, Waarde, Uitkomst, GebruikersId, SpelerNummer) 
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, [
+                    (trainings_id, ronde.ronde_nummer, ronde.waarde, ronde.uitkomst, gebruikers_ids[ronde.speler_nummer - 1], ronde.speler_nummer)
+                    for ronde in resultaat.rondewaarden
+                ])
+
+                if resultaat.ronde_plan is not None:
+                    cursor.execute("""
+                        INSERT INTO RondePlannen (TrainingsId, Seed, PlanJson) VALUES (?, ?, ?)
+                    """, (trainings_id, resultaat.ronde_plan.seed, resultaat.ronde_plan.model_dump_json()))
+
+                if resultaat.detecties:
+                    cursor.executemany("""
+                        INSERT INTO DetectieLog
+                        (TrainingsId, RondeNummer, SpelerNummer, Station, Kleur, Afstand, OntvangenMs, Beoordeling)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, [
+                        (trainings_id, detectie.ronde_nummer, detectie.speler_nummer, detectie.station, detectie.kleur, detectie.afstand, detectie.ontvangen_ms, detectie.beoordeling)
+                        for detectie in resultaat.detecties
+                    ])
+
+                cursor.execute(TRAINING_STATS_SQL.format(filter="t.TrainingsId = ?"), (trainings_id,))
+                cursor.execute("SELECT MaxRonde, GemiddeldeWaarde FROM TrainingStats WHERE TrainingsId = ?", (trainings_id,))
+                stats_row = cursor.fetchone()
+        except (sqlite3.Error, IndexError) as error:
+            print(f"SQL fout: Training niet opgeslagen. {error}")
+            return None
+
+        for gebruikersnaam, gebruikers_id in zip(resultaat.gebruikersnamen, gebruikers_ids):
+            gebruiker_cache.bewaar(gebruikersnaam, gebruikers_id)
+        leaderboard_cache.invalideer_game(resultaat.game_id)
+        if stats_row is not None:
+            ranking_index.voeg_toe(resultaat.game_id, resultaat.moeilijkheids_id, stats_row['MaxRonde'], stats_row['GemiddeldeWaarde'])
+
+        return {"gebruikers_ids": gebruikers_ids, "trainings_id": trainings_id}
+
+    @staticmethod
+    def save_telemetrie(metingen: List[tuple], rollups: List[tuple], ruw_tot: float, minuten_tot: float) -> Optional[int]:
+        """Schrijf een batch telemetrie en tel de rollups op bij de bestaande, in één transactie
+
+        Args:
+            metingen: (tijdstip, station, kleur, soort, waarde)
+            rollups: (resolutie, station, kleur, soort, bucket, aantal, som, minimum, maximum, laatste)
+            ruw_tot: ruwe metingen van voor dit tijdstip worden verwijderd
+            minuten_tot: minuut rollups van voor dit tijdstip worden verwijderd
+
+        Returns:
+            Aantal opgeslagen metingen of None bij een fout
         """
-        params = (ronde_waarde.trainings_id, ronde_waarde.ronde_nummer, ronde_waarde.waarde, ronde_waarde.uitkomst)
-        return Database.execute_sql(sql_query, params)
+        try:
+            with Database.transactie() as cursor:
+                cursor.executemany("""
+                    INSERT INTO TelemetrieMetingen (Tijdstip, Station, Kleur, Soort, Waarde)
+                    VALUES (?, ?, ?, ?, ?)
+                """, metingen)
+                cursor.executemany("""
+                    INSERT INTO TelemetrieRollups
+                    (Resolutie, Station, Kleur, Soort, Bucket, Aantal, Som, Minimum, Maximum, Laatste)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (Resolutie, Station, Kleur, Soort, Bucket) DO UPDATE SET
+                        Aantal = Aantal + excluded.Aantal,
+                        Som = Som + excluded.Som,
+                        Minimum = MIN(Minimum, excluded.Minimum),
+                        Maximum = MAX(Maximum, excluded.Maximum),
+                        Laatste = excluded.Laatste
+                """, rollups)
+                cursor.execute("DELETE FROM TelemetrieMetingen WHERE Tijdstip < ?", (ruw_tot,))
+                cursor.execute("DELETE FROM TelemetrieRollups WHERE Resolutie = 60 AND Bucket < ?", (minuten_tot,))
+        except sqlite3.Error as error:
+            print(f"SQL fout: Telemetrie niet opgeslagen. {error}")
+            return None
+        return len(metingen)
 
     @staticmethod
-    def get_last_rondewaarden_from_last_training() -> List[RondeWaarde]:
-        sql_query = """
-        SELECT * FROM RondeWaarden
-        WHERE TrainingsId = (
-            SELECT MAX(TrainingsId) FROM Trainingen
-        )
+    def get_telemetrie(station: str, soort: str, resolutie: Optional[int], van: float, tot: float, kleur: Optional[str] = None, limiet: int = 2000) -> Optional[Dict[str, Any]]:
+        """Telemetrie van een station, ruw (resolutie None) of als rollup per resolutie in seconden
+
+        Bij meer dan limiet rijen blijven de recentste over (oplopend gesorteerd) en staat afgekapt op True.
         """
-        rows = Database.get_rows(sql_query)
-        
-        result_list = []
+        kleur_filter = "AND Kleur = ?" if kleur else ""
+        # Eén rij extra ophalen om te weten of het venster afgekapt werd
+        params = [station, soort, van, tot] + ([kleur] if kleur else []) + [limiet + 1]
+
+        if resolutie is None:
+            sql_query = f"""
+                SELECT Tijdstip, Kleur, Waarde
+                FROM TelemetrieMetingen
+                WHERE Station = ? AND Soort = ? AND Tijdstip >= ? AND Tijdstip < ? {kleur_filter}
+                ORDER BY Tijdstip DESC
+                LIMIT ?
+            """
+            rows = Database.get_rows(sql_query, params)
+            if rows is None:
+                return None
+            afgekapt = len(rows) > limiet
+            return {
+                "metingen": [{"tijdstip": row["Tijdstip"], "kleur": row["Kleur"], "waarde": row["Waarde"]} for row in reversed(rows[:limiet])],
+                "afgekapt": afgekapt,
+            }
+
+        sql_query = f"""
+            SELECT Bucket, Kleur, Aantal, Som, Minimum, Maximum, Laatste
+            FROM TelemetrieRollups
+            WHERE Resolutie = ? AND Station = ? AND Soort = ? AND Bucket >= ? AND Bucket < ? {kleur_filter}
+            ORDER BY Bucket DESC
+            LIMIT ?
+        """
+        rows = Database.get_rows(sql_query, [resolutie] + params)
         if rows is None:
-            return result_list
-        
-        for row in rows:
-            item = RondeWaarde(
-                trainings_id=row['TrainingsId'],
+            return None
+        afgekapt = len(rows) > limiet
+        return {
+            "metingen": [
+                {
+                    "tijdstip": row["Bucket"],
+                    "kleur": row["Kleur"],
+                    "aantal": row["Aantal"],
+                    "gemiddelde": row["Som"] / row["Aantal"] if row["Aantal"] else None,
+                    "minimum": row["Minimum"],
+                    "maximum": row["Maximum"],
+                    "laatste": row["Laatste"],
+                }
+                for row in reversed(rows[:limiet])
+            ],
+            "afgekapt": afgekapt,
+        }
+
+    @staticmethod
+    def get_detectie_log(trainings_id: int) -> List[DetectieLogItem]:
+        """Alle aanrakingen van een training in volgorde van ontvangst"""
+        rows = Database.get_rows("""
+            SELECT RondeNummer, SpelerNummer, Station, Kleur, Afstand, OntvangenMs, Beoordeling
+            FROM DetectieLog
+            WHERE TrainingsId = ?
+            ORDER BY DetectieId
+        """, (trainings_id,))
+        return [
+            DetectieLogItem(
                 ronde_nummer=row['RondeNummer'],
-                waarde=row['Waarde'],
-                uitkomst=row['Uitkomst']
+                speler_nummer=row['SpelerNummer'],
+                station=row['Station'],
+                kleur=row['Kleur'],
+                afstand=row['Afstand'],
+                ontvangen_ms=row['OntvangenMs'],
+                beoordeling=row['Beoordeling']
             )
-            result_list.append(item)
-            
-        return result_list
+            for row in rows or []
+        ]
+
+    @staticmethod
+    def get_ronde_plan(trainings_id: int) -> Optional[RondePlan]:
+        """Rondeplan van een training, None voor trainingen van voor de rondeplannen"""
+        row = Database.get_one_row("SELECT PlanJson FROM RondePlannen WHERE TrainingsId = ?", (trainings_id,))
+        if row is None:
+            return None
+        return RondePlan.model_validate_json(row['PlanJson'])
+
+    @staticmethod
+    def herbereken_training_stats(alles: bool = False) -> Optional[int]:
+        """Vul TrainingStats aan voor trainingen zonder samenvatting (backfill)
+
+        Args:
+            alles: True om de samenvatting van alle trainingen opnieuw te berekenen
+        """
+        if alles:
+            sql_filter = "1 = 1"
+        else:
+            sql_filter = "t.TrainingsId NOT IN (SELECT TrainingsId FROM TrainingStats)"
+        try:
+            with Database.transactie() as cursor:
+                cursor.execute(TRAINING_STATS_SQL.format(filter=sql_filter))
+                aantal = cursor.rowcount
+        except sqlite3.Error as error:
+            print(f"SQL fout: TrainingStats niet berekend. {error}")
+            return None
+
+        if aantal:
+            ranking_index.invalideer()
+            leaderboard_cache.invalideer_alles()
+        return aantal
+
+    @staticmethod
+    def laad_ranking_index() -> bool:
+        """Laad alle trainingsscores in de in-memory ranking index"""
+        rows = Database.get_rows(RANKING_INDEX_SQL)
+        if rows is None:
+            return False
+        ranking_index.laad(rows)
+        return True
 
     @staticmethod
     def get_ranking_for_onetraining(trainings_id: int) -> Optional[int]:
-        # Haal eerst de game_id en moeilijkheidsgraad op voor deze training
-        sql_training = "SELECT GameId, MoeilijkheidsId FROM Trainingen WHERE TrainingsId = ?"
-        training_row = Database.get_one_row(sql_training, (trainings_id,))
+        # Haal de game_id, moeilijkheidsgraad en samenvatting op voor deze training
+        training_row = Database.get_one_row(TRAINING_SCORE_SQL, (trainings_id,))
         
-        if not training_row:
+        if not training_row or not training_row.get('AantalRondes'):
             return None
         
-        game_id = training_row.get('GameId')
-        moeilijkheids_id = training_row.get('MoeilijkheidsId')
-        
-        # Voor Memory (game_id = 2): ranking op basis van hoogste RondeNummer, dan gemiddelde waarde
-        if game_id == 2:
-            # Haal het hoogste RondeNummer en gemiddelde waarde voor deze training op
-            sql_stats = """
-                SELECT MAX(RondeNummer) as max_ronde, AVG(Waarde) as avg_waarde
-                FROM RondeWaarden
-                WHERE TrainingsId = ?
-            """
-            stats_row = Database.get_one_row(sql_stats, (trainings_id,))
-            
-            if not stats_row or stats_row.get('max_ronde') is None:
-                return None
-            
-            max_ronde = stats_row.get('max_ronde')
-            avg_waarde = stats_row.get('avg_waarde')
-            
-            # Tel hoeveel trainingen beter zijn (hoger max_ronde OF gelijk max_ronde maar lager avg_waarde)
-            # Filter op dezelfde moeilijkheidsgraad
-            sql_count = """
-                SELECT COUNT(*) as cnt FROM (
-                    SELECT MAX(rv.RondeNummer) as max_ronde, AVG(rv.Waarde) as avg_waarde
-                    FROM Trainingen t
-                    JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
-                    WHERE t.GameId = ? AND t.MoeilijkheidsId = ?
-                    GROUP BY t.TrainingsId
-                ) AS sub 
-                WHERE max_ronde > ? OR (max_ronde = ? AND avg_waarde < ?)
-            """
-            count_row = Database.get_one_row(sql_count, (game_id, moeilijkheids_id, max_ronde, max_ronde, avg_waarde))
-            
-            if not count_row:
-                return None
-            
-            plaats = count_row.get('cnt', 0) + 1
-            return plaats
+        if not ranking_index.geladen and not DataRepository.laad_ranking_index():
+            return None
         
-        # Voor andere games: ranking op basis van gemiddelde waarde (lager is beter)
-        # GEEN filter op moeilijkheidsgraad
-        else:
-            sql_avg = "SELECT AVG(Waarde) as avg_w FROM RondeWaarden WHERE TrainingsId = ?"
-            row = Database.get_one_row(sql_avg, (trainings_id,))
-            
-            if not row or row.get('avg_w') is None:
-                return None
-                
-            target_avg = row.get('avg_w')
-
-            sql_count = """
-                SELECT COUNT(*) as cnt FROM (
-                    SELECT t.TrainingsId, AVG(rv.Waarde) as avg_w 
-                    FROM Trainingen t
-                    JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
-                    WHERE t.GameId = ?
-                    GROUP BY t.TrainingsId
-                ) AS sub WHERE avg_w < ?
-            """
-            count_row = Database.get_one_row(sql_count, (game_id, target_avg))
-            
-            if not count_row:
-                return None
-                
-            plaats = count_row.get('cnt', 0) + 1
-            return plaats
+        # Memory (game_id = 2): hoogste RondeNummer, dan gemiddelde waarde, binnen dezelfde moeilijkheidsgraad
+        # Andere games: gemiddelde waarde (lager is beter), GEEN filter op moeilijkheidsgraad
+        return ranking_index.plaats(
+            training_row['GameId'],
+            training_row['MoeilijkheidsId'],
+            training_row['MaxRonde'],
+            training_row['GemiddeldeWaarde']
+        )
 
-    @staticmethod
-    def get_last_training_id() -> Optional[int]:
-        sql_query = "SELECT MAX(TrainingsId) as last_id FROM Trainingen"
-        row = Database.get_one_row(sql_query)
-        
-        if row and row.get('last_id'):
-            return row.get('last_id')
-        return None
-    
     @staticmethod
     def get_all_games() -> List[Dict]:
         """Haal alle games op zonder highscore berekening"""
@@ -159,6 +405,13 @@ class DataRepository:
     
     @staticmethod
     def get_best_avg_for_game(game_id: int, use_min: bool = False) -> float:
+        return leaderboard_cache.haal_op(
+            ("highscore_avg", game_id, None, None, use_min),
+            lambda: DataRepository._get_best_avg_for_game(game_id, use_min)
+        )
+
+    @staticmethod
+    def _get_best_avg_for_game(game_id: int, use_min: bool = False) -> float:
         """Haal de beste gemiddelde score op voor een game
         
         Args:
@@ -167,32 +420,42 @@ class DataRepository:
         """
         agg_func = "MIN" if use_min else "MAX"
         sql_query = f"""
-        SELECT {agg_func}(avg_waarde) as best_score
-        FROM (
-            SELECT AVG(rw.Waarde) as avg_waarde
-            FROM Trainingen t
-            JOIN RondeWaarden rw ON t.TrainingsId = rw.TrainingsId
-            WHERE t.GameId = ?
-            GROUP BY t.TrainingsId
-        )
+        SELECT {agg_func}(ts.GemiddeldeWaarde) as best_score
+        FROM Trainingen t
+        JOIN TrainingStats ts ON t.TrainingsId = ts.TrainingsId
+        WHERE t.GameId = ?
         """
         row = Database.get_one_row(sql_query, (game_id,))
         return row.get('best_score', 0) if row and row.get('best_score') is not None else 0
     
     @staticmethod
     def get_max_kleuren_for_game(game_id: int) -> int:
+        return leaderboard_cache.haal_op(
+            ("highscore_kleuren", game_id, None, None, None),
+            lambda: DataRepository._get_max_kleuren_for_game(game_id)
+        )
+
+    @staticmethod
+    def _get_max_kleuren_for_game(game_id: int) -> int:
         """Haal het hoogste aantal correcte rondes op voor een game (voor Memory)"""
         sql_query = """
-        SELECT MAX(rv.RondeNummer) as max_kleuren
-        FROM RondeWaarden rv
-        JOIN Trainingen t ON rv.TrainingsId = t.TrainingsId
-        WHERE t.GameId = ? AND LOWER(rv.Uitkomst) = 'correct'
+        SELECT MAX(ts.MaxCorrecteRonde) as max_kleuren
+        FROM TrainingStats ts
+        JOIN Trainingen t ON ts.TrainingsId = t.TrainingsId
+        WHERE t.GameId = ?
         """
         row = Database.get_one_row(sql_query, (game_id,))
         return row.get('max_kleuren', 0) if row and row.get('max_kleuren') is not None else 0
     
     @staticmethod
     def get_game_details(game_id: int) -> DetailGame:
+        return leaderboard_cache.haal_op(
+            ("details", game_id, None, None, 3),
+            lambda: DataRepository._get_game_details(game_id)
+        )
+
+    @staticmethod
+    def _get_game_details(game_id: int) -> DetailGame:
         """Haal de details van een game op, inclusief moeilijkheden en rondes"""
         sql_moeilijkheden = "SELECT MoeilijkheidsId, Moeilijkheid, Snelheid FROM Moeilijkheden WHERE GameId = ?"
         rows_moeilijkheden = Database.get_rows(sql_moeilijkheden, (game_id,))
@@ -205,20 +468,7 @@ class DataRepository:
         eenheid = row_game.get('Eenheid', '') if row_game else ''
         
         # Haal leaderboard op
-        sql_leaderboard = """
-        SELECT 
-            ROW_NUMBER() OVER (ORDER BY AVG(rv.Waarde) ASC) as plaats,
-            g.Gebruikersnaam,
-            AVG(rv.Waarde) as waarde
-        FROM Trainingen t
-        JOIN Gebruikers g ON t.GebruikersId = g.GebruikersId
-        JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
-        WHERE t.GameId = ?
-        GROUP BY g.GebruikersId, g.Gebruikersnaam
-        ORDER BY waarde ASC
-        LIMIT 3
-        """
-        rows_leaderboard = Database.get_rows(sql_leaderboard, (game_id,))
+        rows_leaderboard = Database.get_rows(LEADERBOARD_SQL.format(filter=""), (game_id, 3))
         
         list_moeilijkheden = [Moeilijkheid(moeilijkheid=row['Moeilijkheid'], snelheid=row['Snelheid'], moeilijkheid_id=row['MoeilijkheidsId']) for row in rows_moeilijkheden] if rows_moeilijkheden else []
         list_rondes = [Ronde(ronde_id=row['RondeId'], nummer=row['Nummer']) for row in rows_rondes] if rows_rondes else []
@@ -235,26 +485,20 @@ class DataRepository:
     
     @staticmethod
     def get_leaderboard_for_game(game_id: int, top_n: int = 10) -> List[LeaderboardItem]:
+        return leaderboard_cache.haal_op(
+            ("games", game_id, None, None, top_n),
+            lambda: DataRepository._get_leaderboard_for_game(game_id, top_n)
+        )
+
+    @staticmethod
+    def _get_leaderboard_for_game(game_id: int, top_n: int = 10) -> List[LeaderboardItem]:
         """Haal de leaderboard op voor een specifieke game"""
         # Haal eenheid op voor deze game
         sql_eenheid = "SELECT Eenheid FROM Games WHERE GameId = ?"
         eenheid_row = Database.get_one_row(sql_eenheid, (game_id,))
         eenheid = eenheid_row.get('Eenheid', '') if eenheid_row else ''
         
-        sql_query = """
-        SELECT 
-            ROW_NUMBER() OVER (ORDER BY AVG(rv.Waarde) ASC) as plaats,
-            g.Gebruikersnaam,
-            AVG(rv.Waarde) as waarde
-        FROM Trainingen t
-        JOIN Gebruikers g ON t.GebruikersId = g.GebruikersId
-        JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
-        WHERE t.GameId = ?
-        GROUP BY g.GebruikersId, g.Gebruikersnaam
-        ORDER BY waarde ASC
-        LIMIT ?
-        """
-        rows = Database.get_rows(sql_query, (game_id, top_n))
+        rows = Database.get_rows(LEADERBOARD_SQL.format(filter=""), (game_id, top_n))
         
         leaderboard = []
         if rows:
@@ -292,23 +536,8 @@ class DataRepository:
     def get_trainingen_with_filters(game_id: int, datum: Optional[str], gebruikersnaam: Optional[str]) -> List['TrainingVoorHistorie']:
         """Haal trainingen op met optionele filters voor datum en gebruikersnaam"""
         
-        # Voor Color Battle (game_id = 5): haal beide spelers op
-        if game_id == 5:
-            sql_query = """
-            SELECT 
-                t.TrainingsId, 
-                t.Start, 
-                g.Gebruikersnaam,
-                ROUND(AVG(rv.Waarde), 2) as waarde,
-                ga.Eenheid
-            FROM Trainingen t
-            JOIN Gebruikers g ON t.GebruikersId = g.GebruikersId
-            JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
-            JOIN Games ga ON t.GameId = ga.GameId
-            WHERE t.GameId = ?
-            """
         # Voor Memory (game_id = 2): gebruik AantalKleuren
-        elif game_id == 2:
+        if game_id == 2:
             sql_query = """
             SELECT 
                 t.TrainingsId, 
@@ -327,13 +556,13 @@ class DataRepository:
                 t.TrainingsId, 
                 t.Start, 
                 g.Gebruikersnaam,
-                ROUND(AVG(rv.Waarde), 2) as waarde,
+                ROUND(ts.GemiddeldeWaarde, 2) as waarde,
                 ga.Eenheid
             FROM Trainingen t
             JOIN Gebruikers g ON t.GebruikersId = g.GebruikersId
-            JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
+            JOIN TrainingStats ts ON t.TrainingsId = ts.TrainingsId
             JOIN Games ga ON t.GameId = ga.GameId
-            WHERE t.GameId = ?
+            WHERE t.GameId = ? AND ts.AantalRondes > 0
             """
         
         params = [game_id]
@@ -366,21 +595,22 @@ class DataRepository:
             sql_query += " AND LOWER(g.Gebruikersnaam) LIKE LOWER(?)"
             params.append(f"%{gebruikersnaam}%")
         
-        # Voor Memory: geen GROUP BY nodig, voor andere games wel
-        if game_id == 2:
-            sql_query += " ORDER BY t.Start DESC"
-        else:
-            sql_query += " GROUP BY t.TrainingsId, t.Start, g.Gebruikersnaam, ga.Eenheid ORDER BY t.Start DESC"
+        # Eén rij per training: geen GROUP BY nodig
+        sql_query += " ORDER BY t.Start DESC"
         
         rows = Database.get_rows(sql_query, tuple(params))
         
         trainingen = []
         if rows:
             from backend.src.models.models import TrainingVoorHistorie
+            # Voor Color Battle: spelernamen van alle trainingen in één query
+            spelernamen = {}
+            if game_id == 5:
+                spelernamen = DataRepository.get_colorbattle_spelernamen_voor_trainingen([row['TrainingsId'] for row in rows])
             for row in rows:
                 # Voor Color Battle: combineer beide spelernamen
                 if game_id == 5:
-                    speler1_naam, speler2_naam = DataRepository.get_colorbattle_spelernamen_by_trainingid(row['TrainingsId'])
+                    speler1_naam, speler2_naam = spelernamen.get(row['TrainingsId'], (None, None))
                     gebruikersnaam_display = f"{speler1_naam} vs {speler2_naam}" if speler1_naam and speler2_naam else row['Gebruikersnaam']
                 else:
                     gebruikersnaam_display = row['Gebruikersnaam']
@@ -399,7 +629,7 @@ class DataRepository:
     @staticmethod
     def get_allerondewaarden_by_trainingsId(trainings_id: int) -> List[RondeWaarde]:
         """Haal alle rondewaarden op voor een specifieke training"""
-        sql_query = "SELECT * FROM RondeWaarden WHERE TrainingsId = ? ORDER BY RondeNummer ASC"
+        sql_query = "SELECT * FROM RondeWaarden WHERE TrainingsId = ? ORDER BY RondeNummer ASC, RondeWaardeId ASC"
         rows = Database.get_rows(sql_query, (trainings_id,))
         
         rondewaarden = []
@@ -409,7 +639,8 @@ class DataRepository:
                     trainings_id=row['TrainingsId'],
                     ronde_nummer=row['RondeNummer'],
                     waarde=row['Waarde'],
-                    uitkomst=row['Uitkomst']
+                    uitkomst=row['Uitkomst'],
+                    speler_nummer=row.get('SpelerNummer') or 1
                 )
                 rondewaarden.append(rondewaarde)
         
@@ -436,6 +667,13 @@ class DataRepository:
 
     @staticmethod
     def get_leaderboard_with_filters(game_id: int, moeilijkheids_id: Optional[int] = None, datum: Optional[str] = None) -> List[LeaderboardItem]:
+        return leaderboard_cache.haal_op(
+            ("overview", game_id, moeilijkheids_id, datum, 10),
+            lambda: DataRepository._get_leaderboard_with_filters(game_id, moeilijkheids_id, datum)
+        )
+
+    @staticmethod
+    def _get_leaderboard_with_filters(game_id: int, moeilijkheids_id: Optional[int] = None, datum: Optional[str] = None) -> List[LeaderboardItem]:
         """Haal de leaderboard op voor een specifieke game met optionele moeilijkheidsfilter en datum filter"""
         
         # Converteer datum van dd-mm-yyyy naar yyyy-mm-dd voor database vergelijking
@@ -449,144 +687,29 @@ class DataRepository:
         eenheid_row = Database.get_one_row(sql_eenheid, (game_id,))
         eenheid = eenheid_row.get('Eenheid', '') if eenheid_row else ''
         
-        # Voor Color Battle (game_id = 5): speciale behandeling voor beide spelers
+        params = [game_id]
+        sql_filter = ""
+
+        # Voor Color Battle (game_id = 5): gemiddelde per (training, speler), daarna gemiddelde per speler
         if game_id == 5:
-            sql_query = """
-            SELECT TrainingsId, Start
-            FROM Trainingen
-            WHERE GameId = ?
-            """
-            params = [game_id]
-            
             if datum:
-                sql_query += " AND DATE(Start) = ?"
+                sql_filter = " AND DATE(t.Start) = ?"
                 params.append(datum)
-            
-            trainingen_rows = Database.get_rows(sql_query, tuple(params))
-            
-            # Verzamel scores per speler
-            speler_scores = {}  # {gebruikersnaam: [scores]}
-            
-            if trainingen_rows:
-                for training_row in trainingen_rows:
-                    training_id = training_row['TrainingsId']
-                    speler1_naam, speler2_naam = DataRepository.get_colorbattle_spelernamen_by_trainingid(training_id)
-                    
-                    if not speler1_naam or not speler2_naam:
-                        continue
-                    
-                    # Haal rondewaarden op
-                    rondewaarden = DataRepository.get_allerondewaarden_by_trainingsId(training_id)
-                    
-                    if not rondewaarden:
-                        continue
-                    
-                    # Split waarden per speler
-                    speler1_waarden = [rondewaarden[i].waarde for i in range(0, len(rondewaarden), 2)]
-                    speler2_waarden = [rondewaarden[i].waarde for i in range(1, len(rondewaarden), 2)]
-                    
-                    # Bereken gemiddelde per speler
-                    if speler1_waarden:
-                        speler1_avg = sum(speler1_waarden) / len(speler1_waarden)
-                        if speler1_naam not in speler_scores:
-                            speler_scores[speler1_naam] = []
-                        speler_scores[speler1_naam].append(speler1_avg)
-                    
-                    if speler2_waarden:
-                        speler2_avg = sum(speler2_waarden) / len(speler2_waarden)
-                        if speler2_naam not in speler_scores:
-                            speler_scores[speler2_naam] = []
-                        speler_scores[speler2_naam].append(speler2_avg)
-            
-            # Bereken overall gemiddelde per speler en sorteer
-            speler_gemiddelden = []
-            for gebruikersnaam, scores in speler_scores.items():
-                if scores:
-                    overall_avg = sum(scores) / len(scores)
-                    speler_gemiddelden.append((gebruikersnaam, overall_avg))
-            
-            # Sorteer op gemiddelde (laagste eerst)
-            speler_gemiddelden.sort(key=lambda x: x[1])
-            
-            # Maak leaderboard items
-            leaderboard = []
-            for plaats, (gebruikersnaam, waarde) in enumerate(speler_gemiddelden[:10], start=1):
-                item = LeaderboardItem(
-                    plaats=plaats,
-                    gebruikersnaam=gebruikersnaam,
-                    waarde=round(waarde, 2),
-                    eenheid=eenheid
-                )
-                leaderboard.append(item)
-            
-            return leaderboard
-        
+            sql_query = COLORBATTLE_LEADERBOARD_SQL
+
         # Voor Memory (game_id = 2): sorteer eerst op hoogste RondeNummer (DESC), dan op gemiddelde waarde (ASC)
-        elif game_id == 2:
-            moeilijkheids_filter = ""
-            params = [game_id]
-            if moeilijkheids_id is not None:
-                moeilijkheids_filter = " AND t.MoeilijkheidsId = ?"
-                params.append(moeilijkheids_id)
-            if datum:
-                moeilijkheids_filter += " AND DATE(t.Start) = ?"
-                params.append(datum)
-                
-            
-            sql_query = f"""
-            SELECT 
-                ROW_NUMBER() OVER (ORDER BY beste_kleuren DESC, gem_waarde ASC) as plaats,
-                Gebruikersnaam,
-                beste_kleuren as waarde
-            FROM (
-                SELECT 
-                    g.Gebruikersnaam,
-                    MAX(rondes_per_training.max_ronde) as beste_kleuren,
-                    AVG(rv.Waarde) as gem_waarde
-                FROM Gebruikers g
-                JOIN Trainingen t ON g.GebruikersId = t.GebruikersId
-                LEFT JOIN (
-                    SELECT TrainingsId, MAX(RondeNummer) as max_ronde
-                    FROM RondeWaarden
-                    WHERE LOWER(Uitkomst) = 'correct'
-                    GROUP BY TrainingsId
-                ) rondes_per_training ON t.TrainingsId = rondes_per_training.TrainingsId
-                LEFT JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
-                WHERE t.GameId = ?{moeilijkheids_filter}
-                GROUP BY g.GebruikersId, g.Gebruikersnaam
-            ) ranked
-            ORDER BY beste_kleuren DESC, gem_waarde ASC
-            LIMIT 10
-            """
+        # Voor andere games: sorteer alleen op gemiddelde waarde (ASC)
         else:
-            # Voor andere games: sorteer alleen op gemiddelde waarde (ASC)
-            sql_query = """
-            SELECT 
-                ROW_NUMBER() OVER (ORDER BY AVG(rv.Waarde) ASC) as plaats,
-                g.Gebruikersnaam,
-                AVG(rv.Waarde) as waarde
-            FROM Trainingen t
-            JOIN Gebruikers g ON t.GebruikersId = g.GebruikersId
-            JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
-            WHERE t.GameId = ?
-            """
-            params = [game_id]
-            
             if moeilijkheids_id is not None:
-                sql_query += " AND t.MoeilijkheidsId = ?"
+                sql_filter += " AND t.MoeilijkheidsId = ?"
                 params.append(moeilijkheids_id)
-            
             if datum:
-                sql_query += " AND DATE(t.Start) = ?"
+                sql_filter += " AND DATE(t.Start) = ?"
                 params.append(datum)
-            
-            sql_query += """
-            GROUP BY g.GebruikersId, g.Gebruikersnaam
-            ORDER BY waarde ASC
-            LIMIT 10
-            """
-        
-        rows = Database.get_rows(sql_query, tuple(params))
+            sql_query = MEMORY_LEADERBOARD_SQL if game_id == 2 else LEADERBOARD_SQL
+
+        params.append(10)
+        rows = Database.get_rows(sql_query.format(filter=sql_filter), tuple(params))
         
         leaderboard = []
         if rows:
@@ -654,34 +777,34 @@ class DataRepository:
     @staticmethod
     def get_colorbattle_spelernamen_by_trainingid(training_id: int) -> tuple[Optional[str], Optional[str]]:
         """Haal beide spelernamen op voor een Color Battle training"""
-        # Haal de primaire gebruiker op (gekoppeld aan de training)
-        speler1_query = """
-            SELECT g.Gebruikersnaam 
-            FROM Gebruikers g
-            INNER JOIN Trainingen t ON t.GebruikersId = g.GebruikersId
-            WHERE t.TrainingsId = ?
-        """
-        speler1_row = Database.get_one_row(speler1_query, (training_id,))
-        speler1_naam = speler1_row['Gebruikersnaam'] if speler1_row and 'Gebruikersnaam' in speler1_row else None
-        
-        if not speler1_naam:
-            return None, None
-        
-        # Voor speler 2: haal de laatst toegevoegde gebruiker op die NIET speler 1 is
-        # Dit werkt omdat beide spelers kort na elkaar worden toegevoegd
-        speler2_query = """
-            SELECT Gebruikersnaam 
-            FROM Gebruikers 
-            WHERE GebruikersId = (
-                SELECT MAX(GebruikersId) 
-                FROM Gebruikers 
-                WHERE Gebruikersnaam != ?
-            )
+        return DataRepository.get_colorbattle_spelernamen_voor_trainingen([training_id]).get(training_id, (None, None))
+
+    @staticmethod
+    def get_colorbattle_spelernamen_voor_trainingen(training_ids: List[int]) -> Dict[int, tuple[Optional[str], Optional[str]]]:
+        """Haal de spelernamen (speler 1, speler 2) op voor meerdere trainingen via TrainingDeelnemers
+
+        Returns:
+            {training_id: (speler1_naam, speler2_naam)}, trainingen zonder deelnemers ontbreken
         """
-        speler2_row = Database.get_one_row(speler2_query, (speler1_naam,))
-        speler2_naam = speler2_row['Gebruikersnaam'] if speler2_row and 'Gebruikersnaam' in speler2_row else None
-        
-        return speler1_naam, speler2_naam
+        spelernamen = {}
+        unieke_ids = list(dict.fromkeys(training_ids))
+        # Per blok zodat de limiet op het aantal SQL parameters niet bereikt wordt
+        for start in range(0, len(unieke_ids), 500):
+            blok = unieke_ids[start:start + 500]
+            sql_query = f"""
+                SELECT d.TrainingsId, d.SpelerNummer, g.Gebruikersnaam
+                FROM TrainingDeelnemers d
+                JOIN Gebruikers g ON d.GebruikersId = g.GebruikersId
+                WHERE d.TrainingsId IN ({", ".join("?" * len(blok))}) AND d.SpelerNummer IN (1, 2)
+            """
+            rows = Database.get_rows(sql_query, tuple(blok))
+            if not rows:
+                continue
+            for row in rows:
+                namen = spelernamen.setdefault(row['TrainingsId'], [None, None])
+                namen[row['SpelerNummer'] - 1] = row['Gebruikersnaam']
+
+        return {training_id: tuple(namen) for training_id, namen in spelernamen.items()}
     
     @staticmethod
     def get_colorbattle_winnaar_by_trainingid(training_id: int) -> Optional[str]:
@@ -693,7 +816,7 @@ class DataRepository:
             return None
         
         sql_query = """
-            SELECT RondeNummer, Waarde, Uitkomst
+            SELECT RondeNummer, Waarde, Uitkomst, SpelerNummer
             FROM RondeWaarden
             WHERE TrainingsId = ?
             ORDER BY RondeWaardeId ASC
@@ -703,9 +826,9 @@ class DataRepository:
         if not rows or len(rows) == 0:
             return None
         
-        # Split rondewaarden per speler (even indices = speler1, oneven = speler2)
-        speler1_waarden = [rows[i] for i in range(0, len(rows), 2)]
-        speler2_waarden = [rows[i] for i in range(1, len(rows), 2)]
+        # Split rondewaarden per speler
+        speler1_waarden = [r for r in rows if r['SpelerNummer'] == 1]
+        speler2_waarden = [r for r in rows if r['SpelerNummer'] == 2]
         
         # Tel correcte antwoorden per speler
         speler1_correct = len([r for r in speler1_waarden if r['Uitkomst'].lower() == 'correct'])
@@ -0,0 +1,51 @@
+import string
+import threading
+from typing import Dict, Optional
+
+# SQLite's LOWER() en TRIM() werken enkel op ASCII hoofdletters en spaties: zelfde normalisatie als de unieke index
+_ASCII_KLEINE_LETTERS = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+# Standaardnamen van anonieme spelers (genormaliseerd), die worden nooit samengevoegd
+PLAATSHOUDER_NAMEN = ("speler", "speler 1", "speler 2")
+# Voorwaarde van de partiële index idx_gebruikers_naam: een lookup moet ze herhalen om de index te gebruiken
+NIET_PLAATSHOUDER_SQL = "LOWER(TRIM(Gebruikersnaam)) NOT IN ('speler', 'speler 1', 'speler 2')"
+
+
+def normaliseer_gebruikersnaam(gebruikersnaam: str) -> str:
+    """Python equivalent van LOWER(TRIM(Gebruikersnaam)) uit idx_gebruikers_naam"""
+    return gebruikersnaam.strip(" ").translate(_ASCII_KLEINE_LETTERS)
+
+
+def is_plaatshouder(gebruikersnaam: str) -> bool:
+    return normaliseer_gebruikersnaam(gebruikersnaam) in PLAATSHOUDER_NAMEN
+
+
+class GebruikerCache:
+    """In-process cache van genormaliseerde gebruikersnaam naar GebruikersId
+
+    Enkel ids van gecommitte gebruikers worden bewaard, een rollback kan dus geen ongeldig id achterlaten.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+
+    def haal_op(self, gebruikersnaam: str) -> Optional[int]:
+        if is_plaatshouder(gebruikersnaam):
+            return None
+        with self._lock:
+            return self._ids.get(normaliseer_gebruikersnaam(gebruikersnaam))
+
+    def bewaar(self, gebruikersnaam: str, gebruikers_id: int):
+        if is_plaatshouder(gebruikersnaam):
+            return
+        with self._lock:
+            self._ids[normaliseer_gebruikersnaam(gebruikersnaam)] = gebruikers_id
+
+    def leeg(self):
+        with self._lock:
+            self._ids.clear()
+
+
+gebruiker_cache = GebruikerCache()
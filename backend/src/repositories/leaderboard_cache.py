@@ -0,0 +1,74 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+LEADERBOARD_CACHE_GROOTTE = int(os.getenv("LEADERBOARD_CACHE_GROOTTE", "256"))
+
+
+class LeaderboardCache:
+    """Begrensde LRU cache voor leaderboards en highscores
+
+    Sleutels zijn tuples (soort, game_id, moeilijkheids_id, datum, top_n). Een game wordt
+    enkel geïnvalideerd wanneer er een training van die game opgeslagen wordt.
+    """
+
+    def __init__(self, max_grootte: int = LEADERBOARD_CACHE_GROOTTE):
+        self._max_grootte = max_grootte
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._generatie = 0  # Verhoogd bij elke invalidatie
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidaties": 0,
+            "verwijderd_lru": 0,
+        }
+
+    def haal_op(self, sleutel: tuple, bereken: Callable[[], Any]) -> Any:
+        """Geef de gecachete waarde terug of bereken en bewaar ze"""
+        with self._lock:
+            if sleutel in self._items:
+                self._items.move_to_end(sleutel)
+                self._stats["hits"] += 1
+                return self._items[sleutel]
+            self._stats["misses"] += 1
+            generatie = self._generatie
+
+        waarde = bereken()
+
+        with self._lock:
+            # Niet bewaren als er intussen geïnvalideerd werd (mogelijk verouderd resultaat)
+            if self._generatie == generatie:
+                self._items[sleutel] = waarde
+                self._items.move_to_end(sleutel)
+                while len(self._items) > self._max_grootte:
+                    self._items.popitem(last=False)
+                    self._stats["verwijderd_lru"] += 1
+        return waarde
+
+    def invalideer_game(self, game_id: Hashable):
+        with self._lock:
+            self._generatie += 1
+            for sleutel in [sleutel for sleutel in self._items if sleutel[1] == game_id]:
+                del self._items[sleutel]
+            self._stats["invalidaties"] += 1
+
+    def invalideer_alles(self):
+        with self._lock:
+            self._generatie += 1
+            self._items.clear()
+            self._stats["invalidaties"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            totaal = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_ratio": round(self._stats["hits"] / totaal, 3) if totaal else 0,
+                "grootte": len(self._items),
+                "max_grootte": self._max_grootte,
+            }
+
+
+leaderboard_cache = LeaderboardCache()
@@ -0,0 +1,83 @@
+import bisect
+import threading
+from typing import Dict, List, Optional, Tuple
+
+MEMORY_GAME_ID = 2
+
+
+class RankingIndex:
+    """Gesorteerde trainingsscores per (game, moeilijkheid) zodat een plaats in O(log n) opgezocht wordt
+
+    Een score is een tuple waarbij lager beter is:
+    - Memory: (-hoogste ronde, gemiddelde waarde)
+    - Andere games: (gemiddelde waarde,)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scores: Dict[Tuple[int, int], List[tuple]] = {}
+        self._geladen = False
+
+    @property
+    def geladen(self) -> bool:
+        return self._geladen
+
+    @staticmethod
+    def score(game_id: int, max_ronde: Optional[int], gemiddelde_waarde: Optional[float]) -> Optional[tuple]:
+        if gemiddelde_waarde is None:
+            return None
+        if game_id == MEMORY_GAME_ID:
+            if max_ronde is None:
+                return None
+            return (-max_ronde, gemiddelde_waarde)
+        return (gemiddelde_waarde,)
+
+    def laad(self, rows: List[Dict]):
+        """Bouw de index op uit rijen met GameId, MoeilijkheidsId, MaxRonde en GemiddeldeWaarde"""
+        scores = {}
+        for row in rows:
+            score = self.score(row['GameId'], row['MaxRonde'], row['GemiddeldeWaarde'])
+            if score is not None:
+                scores.setdefault((row['GameId'], row['MoeilijkheidsId']), []).append(score)
+        for lijst in scores.values():
+            lijst.sort()
+
+        with self._lock:
+            self._scores = scores
+            self._geladen = True
+
+    def invalideer(self):
+        """Markeer de index als verouderd: de volgende lookup laadt hem opnieuw"""
+        with self._lock:
+            self._scores = {}
+            self._geladen = False
+
+    def voeg_toe(self, game_id: int, moeilijkheids_id: int, max_ronde: Optional[int], gemiddelde_waarde: Optional[float]):
+        score = self.score(game_id, max_ronde, gemiddelde_waarde)
+        if score is None:
+            return
+        with self._lock:
+            if not self._geladen:
+                return  # Wordt bij het (her)laden toch meegenomen
+            bisect.insort(self._scores.setdefault((game_id, moeilijkheids_id), []), score)
+
+    def plaats(self, game_id: int, moeilijkheids_id: int, max_ronde: Optional[int], gemiddelde_waarde: Optional[float]) -> int:
+        """Plaats = aantal strikt betere trainingen + 1
+
+        Memory rankt binnen dezelfde moeilijkheid, de andere games over alle moeilijkheden heen.
+        """
+        score = self.score(game_id, max_ronde, gemiddelde_waarde)
+        if score is None:
+            return 1
+
+        with self._lock:
+            if game_id == MEMORY_GAME_ID:
+                lijsten = [self._scores.get((game_id, moeilijkheids_id), [])]
+            else:
+                lijsten = [lijst for (g, _), lijst in self._scores.items() if g == game_id]
+            beter = sum(bisect.bisect_left(lijst, score) for lijst in lijsten)
+
+        return beter + 1
+
+
+ranking_index = RankingIndex()
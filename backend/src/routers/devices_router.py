@@ -1,5 +1,11 @@
 import os
+import time
+from typing import Optional
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from backend.src.repositories.async_data_repository import AsyncDataRepository
+from backend.src.services.station import STANDAARD_STATION
+from backend.src.services.telemetrie_opslag import RESOLUTIES, SOORTEN, voorspel_batterij
 from models.models import UitschakelenRequest
 
 router = APIRouter(prefix="/devices", tags=["Apparaten"])
@@ -19,13 +25,75 @@ def set_shutdown_callback(callback):
     _shutdown_callback = callback
 
 @router.get("/status", summary="Get current device status")
-async def get_device_status():
+async def get_device_status(station: str = STANDAARD_STATION):
+    if station not in device_manager.stations:
+        return JSONResponse(status_code=404, content={"message": f"Onbekend station: {station}"})
     return {
-        "apparaten": device_manager.verkrijg_apparaten_status(),
+        "station": station,
+        "versie": device_manager.snapshot(station)["versie"],
+        "apparaten": device_manager.verkrijg_apparaten_status(station),
         "connected": device_manager._connected,
         "totaal_verwacht": 4
     }
 
+@router.post("/kalibreer", summary="Meet de MQTT latentie per kegel (ping/echo)")
+async def kalibreer_apparaten(station: str = STANDAARD_STATION):
+    if station not in device_manager.stations:
+        return JSONResponse(status_code=404, content={"message": f"Onbekend station: {station}"})
+    return {"kegels": await device_manager.kalibreer(station=station)}
+
+@router.get("/latentie", summary="Huidige latentie schatting per kegel")
+async def get_latentie():
+    return {"kegels": device_manager.latentie.stats() if device_manager.latentie else []}
+
+@router.get("/commandos", summary="Aflevering en latentie histogram van bevestigde commando's per kegel")
+async def get_commando_stats():
+    return {"kegels": device_manager.bevestiging.stats() if device_manager.bevestiging else []}
+
+@router.get("/wachtrijen", summary="Diepte en tellers van de MQTT wachtrijen naast het detectie pad")
+async def get_wachtrijen():
+    return {
+        "wachtrijen": device_manager.wachtrij_stats(),
+        "snapshots": device_manager.snapshot_stats(),
+        "telemetrie": device_manager.opslag.stats() if device_manager.opslag else None
+    }
+
+@router.get("/telemetrie", summary="Telemetrie per kegel: ruw of als rollup per minuut, uur of dag")
+async def get_telemetrie(soort: str = "batterij", resolutie: str = "1m", uren: float = 24, station: str = STANDAARD_STATION, kleur: Optional[str] = None):
+    if soort not in SOORTEN or (resolutie != "ruw" and resolutie not in RESOLUTIES):
+        return JSONResponse(status_code=400, content={"message": f"Soort uit {list(SOORTEN)}, resolutie uit {['ruw', *RESOLUTIES]}"})
+    if station not in device_manager.stations:
+        return JSONResponse(status_code=404, content={"message": f"Onbekend station: {station}"})
+    tot = time.time()
+    telemetrie = await AsyncDataRepository.get_telemetrie(
+        station, soort, RESOLUTIES.get(resolutie), tot - uren * 3600, tot, kleur.lower() if kleur else None
+    )
+    if telemetrie is None:
+        return JSONResponse(status_code=500, content={"message": "Telemetrie ophalen mislukt"})
+    return {"station": station, "soort": soort, "resolutie": resolutie, **telemetrie}
+
+@router.get("/telemetrie/batterij", summary="Batterijverbruik en geschatte resterende speeltijd per kegel")
+async def get_batterij_voorspelling(uren: float = 6, dag_uren: float = 10, station: str = STANDAARD_STATION):
+    if station not in device_manager.stations:
+        return JSONResponse(status_code=404, content={"message": f"Onbekend station: {station}"})
+    tot = time.time()
+    telemetrie = await AsyncDataRepository.get_telemetrie(station, "batterij", RESOLUTIES["1m"], tot - uren * 3600, tot)
+    metingen = telemetrie["metingen"] if telemetrie else []
+
+    kegels = []
+    for apparaat in device_manager.verkrijg_apparaten_status(station):
+        punten = [(m["tijdstip"], m["gemiddelde"]) for m in metingen if m["kleur"] == apparaat["kleur"]]
+        voorspelling = voorspel_batterij(punten, apparaat["batterij"])
+        resterend = voorspelling["resterende_uren"]
+        kegels.append({
+            "kleur": apparaat["kleur"],
+            "batterij": apparaat["batterij"],
+            **voorspelling,
+            # Zonder metingen geen uitspraak, zonder dalende trend haalt de kegel de dag
+            "haalt_dag": None if voorspelling["verbruik_per_uur"] is None else (resterend is None or resterend >= dag_uren)
+        })
+    return {"station": station, "uren": uren, "dag_uren": dag_uren, "kegels": kegels}
+
 @router.post("/uitschakelen", summary="Schakel alle apparaten uit")
 async def uitschakelen_apparaten(request: UitschakelenRequest):
     wachtwoord = os.getenv("PI_PASSWORD")
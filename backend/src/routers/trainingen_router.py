@@ -1,7 +1,9 @@
 from typing import Union
 from fastapi import APIRouter
-from backend.src.repositories.data_repository import DataRepository
-from backend.src.models.models import StatistiekenVoorColorSprint, StatistiekenVoorMemoryGame, StatistiekenVoorColorBattle, CorrecteRondeWaarde, TrainingVoorHistorie, ColorBattleCorrecteRonde
+from fastapi.responses import JSONResponse
+from backend.src.repositories.async_data_repository import AsyncDataRepository
+from backend.src.services.station import STANDAARD_STATION
+from backend.src.models.models import StatistiekenVoorColorSprint, StatistiekenVoorMemoryGame, StatistiekenVoorColorBattle, CorrecteRondeWaarde, TrainingVoorHistorie, ColorBattleCorrecteRonde, RondePlan, DetectieLogItem
 import logging
 
 router = APIRouter(
@@ -9,19 +11,33 @@ router = APIRouter(
     tags=["Trainingen"]
 )
 
+# Deze variabele wordt geïnjecteerd vanuit main.py
+game_managers = {}
+
+def set_game_managers(managers):
+    """Inject de game managers per station (laatst opgeslagen training)"""
+    global game_managers
+    game_managers = managers
+
 
 @router.get("/laatste_rondewaarden", response_model=Union[StatistiekenVoorColorSprint, StatistiekenVoorMemoryGame, StatistiekenVoorColorBattle])
-async def get_laatste_rondewaarden():
-    list_rondewaarden = DataRepository.get_last_rondewaarden_from_last_training()
+async def get_laatste_rondewaarden(station: str = STANDAARD_STATION):
+    game_manager = game_managers.get(station)
+    if game_manager is None:
+        return JSONResponse(status_code=404, content={"message": f"Onbekend station: {station}"})
+
+    # Laatst opgeslagen training van dit station, niet de laatste van de hele database
+    last_training_id = game_manager.laatste_trainings_id
+    if last_training_id is None:
+        return JSONResponse(status_code=404, content={"message": f"Nog geen training opgeslagen op station {station}"})
+
+    list_rondewaarden = await AsyncDataRepository.get_allerondewaarden_by_trainingsId(last_training_id)
 
     gemiddelde_tijd = list_rondewaarden and sum(float(item.waarde) for item in list_rondewaarden) / len(list_rondewaarden) or 0
     beste_tijd = list_rondewaarden and min(float(item.waarde) for item in list_rondewaarden) or 0
 
-    # Bepaal ID van de laatst toegevoegde training en vraag ranking op
-    last_training_id = DataRepository.get_last_training_id()
-
     logging.debug(f"Last training ID: {last_training_id}")
-    gebruikersnaam = DataRepository.get_gebruikersnaam_by_trainingid(last_training_id)
+    gebruikersnaam = await AsyncDataRepository.get_gebruikersnaam_by_trainingid(last_training_id)
     exactheid = len([item for item in list_rondewaarden if item.uitkomst.lower() == 'correct']) / len(list_rondewaarden) * 100 if list_rondewaarden else 0
 
     aantal_correct = len([item for item in list_rondewaarden if item.uitkomst.lower() == 'correct'])
@@ -33,11 +49,11 @@ async def get_laatste_rondewaarden():
     #ophalen welke rondes met hun rondenummers en waardes waar correct voor de grafiek
     correcte_rondewaarden = [item for item in list_rondewaarden if item.uitkomst.lower() == 'correct']
     # Hier kun je verdere verwerking van correcte_rondewaarden toevoegen, bijvoorbeeld voor een grafiek
-    correcte_rondewaarden_data = [CorrecteRondeWaarde(ronde_nummer=item.ronde_nummer, waarde=item.waarde) for item in correcte_rondewaarden]
+    correcte_rondewaarden_data = [CorrecteRondeWaarde(ronde_nummer=item.ronde_nummer, waarde=round(item.waarde, 2)) for item in correcte_rondewaarden]
 
-    game_id = DataRepository.get_gameid_by_trainingid(last_training_id) if last_training_id else None
+    game_id = await AsyncDataRepository.get_gameid_by_trainingid(last_training_id) if last_training_id else None
     if(game_id ==1 or game_id == 3 or game_id ==4):
-        ranking = DataRepository.get_ranking_for_onetraining(last_training_id)
+        ranking = await AsyncDataRepository.get_ranking_for_onetraining(last_training_id)
         return StatistiekenVoorColorSprint(
         game_id=game_id or 0,
         gebruikersnaam=gebruikersnaam or "",
@@ -51,7 +67,7 @@ async def get_laatste_rondewaarden():
         lijst_voor_grafiek=correcte_rondewaarden_data
     )
     if(game_id ==2):
-        totaal_aantal_rondes = DataRepository.get_totale_aantal_rondes_by_trainingid(last_training_id) if last_training_id else 0   
+        totaal_aantal_rondes = await AsyncDataRepository.get_totale_aantal_rondes_by_trainingid(last_training_id) if last_training_id else 0   
         exactheid_memory = aantal_correct / totaal_aantal_rondes * 100 if totaal_aantal_rondes > 0 else 0
         correcte_rondewaarden_memory = [item for item in list_rondewaarden if item.uitkomst.lower() == 'correct']
 
@@ -70,7 +86,7 @@ async def get_laatste_rondewaarden():
         #gemiddelde waarde is gwn het gemiddelde van de waardes van de correcte rondes (gedeeld door ronde_nummer)
         gemiddelde_waarde_memory = sum(item.waarde for item in correcte_rondewaarden_data_memory) / len(correcte_rondewaarden_data_memory) if correcte_rondewaarden_data_memory else 0
 
-        ranking = DataRepository.get_ranking_for_onetraining(last_training_id) or 0
+        ranking = await AsyncDataRepository.get_ranking_for_onetraining(last_training_id) or 0
 
 
         return StatistiekenVoorMemoryGame(
@@ -91,15 +107,15 @@ async def get_laatste_rondewaarden():
         totaal_rondes = len(list_rondewaarden) // 2 if list_rondewaarden else 0
         
         # Haal beide spelernamen op
-        speler1_naam, speler2_naam = DataRepository.get_colorbattle_spelernamen_by_trainingid(last_training_id)
+        speler1_naam, speler2_naam = await AsyncDataRepository.get_colorbattle_spelernamen_by_trainingid(last_training_id)
         if not speler1_naam:
             speler1_naam = gebruikersnaam or "Speler 1"
         if not speler2_naam:
             speler2_naam = "Speler 2"
         
-        # Split rondewaarden per speler (even indices = speler1, oneven = speler2)
-        speler1_waarden = [list_rondewaarden[i] for i in range(0, len(list_rondewaarden), 2)] if list_rondewaarden else []
-        speler2_waarden = [list_rondewaarden[i] for i in range(1, len(list_rondewaarden), 2)] if list_rondewaarden else []
+        # Split rondewaarden per speler
+        speler1_waarden = [item for item in list_rondewaarden if item.speler_nummer == 1]
+        speler2_waarden = [item for item in list_rondewaarden if item.speler_nummer == 2]
         
         # Bereken statistieken per speler
         speler1_correct = len([r for r in speler1_waarden if r.uitkomst.lower() == 'correct'])
@@ -129,13 +145,13 @@ async def get_laatste_rondewaarden():
                 if speler1_waarden[i].uitkomst == 'correct':
                     lijst_voor_grafiek.append(ColorBattleCorrecteRonde(
                         ronde_nummer=speler1_waarden[i].ronde_nummer,
-                        waarde=float(speler1_waarden[i].waarde),
+                        waarde=round(float(speler1_waarden[i].waarde), 2),
                         speler_naam=speler1_naam
                     ))
                 elif speler2_waarden[i].uitkomst == 'correct':
                     lijst_voor_grafiek.append(ColorBattleCorrecteRonde(
                         ronde_nummer=speler2_waarden[i].ronde_nummer,
-                        waarde=float(speler2_waarden[i].waarde),
+                        waarde=round(float(speler2_waarden[i].waarde), 2),
                         speler_naam=speler2_naam
                     ))
         
@@ -162,14 +178,27 @@ async def get_training_history(game_id: int, gebruikersnaam: str | None = None,
         except Exception:
             pass  # Gebruik originele datum als conversie mislukt
     
-    trainingen = DataRepository.get_trainingen_with_filters(game_id, datum, gebruikersnaam)
+    trainingen = await AsyncDataRepository.get_trainingen_with_filters(game_id, datum, gebruikersnaam)
     return trainingen
 
+@router.get("/{training_id}/rondeplan", response_model=RondePlan, summary="Haal de seed en opdrachten van een training op")
+async def get_training_rondeplan(training_id: int):
+    """Met de seed uit het plan kan de training opnieuw gespeeld worden (seed in de game instellingen)"""
+    plan = await AsyncDataRepository.get_ronde_plan(training_id)
+    if plan is None:
+        return JSONResponse(status_code=404, content={"message": "Geen rondeplan voor deze training"})
+    return plan
+
+@router.get("/{training_id}/detecties", response_model=list[DetectieLogItem], summary="Haal alle aanrakingen van een training op")
+async def get_training_detecties(training_id: int):
+    """Elke aanraking met ToF afstand en beoordeling, ook genegeerde (bv. valse detecties tussen rondes)"""
+    return await AsyncDataRepository.get_detectie_log(training_id)
+
 @router.get("/{training_id}/details", response_model=Union[StatistiekenVoorColorSprint, StatistiekenVoorMemoryGame, StatistiekenVoorColorBattle], summary="Haal de details op voor een specifieke training")
 async def get_training_details(training_id: int):
-    rondewaarden = DataRepository.get_allerondewaarden_by_trainingsId(training_id)
-    game_id = DataRepository.get_gameid_by_trainingid(training_id)
-    gebruikersnaam = DataRepository.get_gebruikersnaam_by_trainingid(training_id)
+    rondewaarden = await AsyncDataRepository.get_allerondewaarden_by_trainingsId(training_id)
+    game_id = await AsyncDataRepository.get_gameid_by_trainingid(training_id)
+    gebruikersnaam = await AsyncDataRepository.get_gebruikersnaam_by_trainingid(training_id)
 
     if(game_id==1 or game_id==3 or game_id == 4):
         return StatistiekenVoorColorSprint(
@@ -177,9 +206,9 @@ async def get_training_details(training_id: int):
         gebruikersnaam=gebruikersnaam or "",
         gemiddelde_waarde=round(sum(float(item.waarde) for item in rondewaarden) / len(rondewaarden), 2) if rondewaarden else 0,
         beste_waarde=round(min(float(item.waarde) for item in rondewaarden), 2) if rondewaarden else 0,
-        ranking=DataRepository.get_ranking_for_onetraining(training_id) or 0,
+        ranking=await AsyncDataRepository.get_ranking_for_onetraining(training_id) or 0,
         exactheid=round(len([item for item in rondewaarden if item.uitkomst == 'correct']) / len(rondewaarden) * 100, 0) if rondewaarden else 0,
-        lijst_voor_grafiek=[CorrecteRondeWaarde(ronde_nummer=item.ronde_nummer, waarde=item.waarde) for item in rondewaarden if item.uitkomst == 'correct'],
+        lijst_voor_grafiek=[CorrecteRondeWaarde(ronde_nummer=item.ronde_nummer, waarde=round(item.waarde, 2)) for item in rondewaarden if item.uitkomst == 'correct'],
         aantal_correct=len([item for item in rondewaarden if item.uitkomst == 'correct']),
         aantal_fout=len([item for item in rondewaarden if item.uitkomst == 'fout']),
         aantal_telaat=len([item for item in rondewaarden if item.uitkomst == 'te laat'])
@@ -188,34 +217,36 @@ async def get_training_details(training_id: int):
         return StatistiekenVoorMemoryGame(
         game_id=game_id or 0,
         gebruikersnaam=gebruikersnaam or "",
-        ranking=DataRepository.get_ranking_for_onetraining(training_id) or 0,
+        ranking=await AsyncDataRepository.get_ranking_for_onetraining(training_id) or 0,
         aantal_kleuren=len(rondewaarden),
         gemiddelde_waarde=round(sum(float(item.waarde) for item in rondewaarden) / len(rondewaarden), 2) if rondewaarden else 0,
         #bereken de exactheid voor memory game aan de hand van de voltooide rondes t.o.v. het totale aantal rondes
-        exactheid=round(len([item for item in rondewaarden if item.uitkomst == 'correct']) / DataRepository.get_totale_aantal_rondes_by_trainingid(training_id) * 100, 0) if rondewaarden else 0,
+        exactheid=round(len([item for item in rondewaarden if item.uitkomst == 'correct']) / await AsyncDataRepository.get_totale_aantal_rondes_by_trainingid(training_id) * 100, 0) if rondewaarden else 0,
         lijst_voor_grafiek=[CorrecteRondeWaarde(ronde_nummer=item.ronde_nummer, waarde=round(float(item.waarde) / item.ronde_nummer, 2)) for item in rondewaarden if item.uitkomst == 'correct'],
         aantal_correct=len([item for item in rondewaarden if item.uitkomst == 'correct']),
         aantal_fout=len([item for item in rondewaarden if item.uitkomst == 'fout']),
-        aantal_rondes_niet_gespeeld=DataRepository.get_totale_aantal_rondes_by_trainingid(training_id) - len(rondewaarden)
+        aantal_rondes_niet_gespeeld=await AsyncDataRepository.get_totale_aantal_rondes_by_trainingid(training_id) - len(rondewaarden)
         )
     
     if(game_id == 5):
+        speler1_naam, speler2_naam = await AsyncDataRepository.get_colorbattle_spelernamen_by_trainingid(training_id)
+        speler1_waarden = [item for item in rondewaarden if item.speler_nummer == 1]
+        speler2_waarden = [item for item in rondewaarden if item.speler_nummer == 2]
         return StatistiekenVoorColorBattle(
             game_id=game_id,
-            speler1_naam=DataRepository.get_colorbattle_spelernamen_by_trainingid(training_id)[0],
-            speler2_naam=DataRepository.get_colorbattle_spelernamen_by_trainingid(training_id)[1],
-            speler1_correct=len([item for item in rondewaarden[::2] if item.uitkomst == 'correct']),
-            speler2_correct=len([item for item in rondewaarden[1::2] if item.uitkomst == 'correct']),
-            speler1_fout=len([item for item in rondewaarden[::2] if item.uitkomst == 'te laat']),
-            speler2_fout=len([item for item in rondewaarden[1::2] if item.uitkomst == 'te laat']),
-            winnaar=DataRepository.get_colorbattle_winnaar_by_trainingid(training_id),
+            speler1_naam=speler1_naam,
+            speler2_naam=speler2_naam,
+            speler1_correct=len([item for item in speler1_waarden if item.uitkomst == 'correct']),
+            speler2_correct=len([item for item in speler2_waarden if item.uitkomst == 'correct']),
+            speler1_fout=len([item for item in speler1_waarden if item.uitkomst == 'te laat']),
+            speler2_fout=len([item for item in speler2_waarden if item.uitkomst == 'te laat']),
+            winnaar=await AsyncDataRepository.get_colorbattle_winnaar_by_trainingid(training_id),
             lijst_voor_grafiek=[
                 ColorBattleCorrecteRonde(
                     ronde_nummer=item.ronde_nummer,
-                    waarde=float(item.waarde),
-                    speler_naam=DataRepository.get_colorbattle_spelernamen_by_trainingid(training_id)[0] if index % 2 == 0 else DataRepository.get_colorbattle_spelernamen_by_trainingid(training_id)[1]
+                    waarde=round(float(item.waarde), 2),
+                    speler_naam=speler1_naam if item.speler_nummer == 1 else speler2_naam
                 )
-                for index, item in enumerate(rondewaarden) if item.uitkomst == 'correct'
+                for item in rondewaarden if item.uitkomst == 'correct'
             ]
-        )
-    
\ No newline at end of file
+        )
\ No newline at end of file
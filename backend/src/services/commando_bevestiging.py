@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import os
+from bisect import bisect_left
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+from backend.src.services.timing import nu_ns
+
+logger = logging.getLogger(__name__)
+
+# Wachttijd op een ack voor een commando opnieuw verstuurd wordt
+COMMANDO_TIMEOUT = float(os.getenv("COMMANDO_TIMEOUT", "0.08"))
+# Aantal keer dat een commando verstuurd wordt (eerste poging inbegrepen)
+COMMANDO_POGINGEN = int(os.getenv("COMMANDO_POGINGEN", "3"))
+# Bovengrenzen (ms) van de histogram buckets voor de afleverlatentie, laatste bucket = alles daarboven
+LATENTIE_BUCKETS_MS = (5, 10, 20, 50, 100, 200, 500)
+
+
+class CommandoBevestiging:
+    """Opvolging van bevestigde commando's naar de kegels
+
+    Een bevestigd commando wordt verstuurd als `<commando>#<seq>` op bm/<kleur>/cmd, de kegel voert het
+    één keer uit (ook bij herhalingen) en antwoordt met `<seq>` op bm/<kleur>/ack. De afleverlatentie
+    wordt gemeten vanaf de eerste poging, herhalingen tellen dus mee in de latentie.
+    """
+
+    def __init__(self):
+        self._volgnummers = count(1)
+        self._onderweg: Dict[Tuple[str, int], Tuple[asyncio.Future, int]] = {}  # (kleur, seq) -> (future, eerste_ns)
+        self._kegels: Dict[str, dict] = {}
+
+    def nieuw_commando(self, kleur: str, commando: str) -> Tuple[str, asyncio.Future]:
+        """Registreer een commando en geef de payload en de future voor de ack terug"""
+        seq = next(self._volgnummers)
+        future = asyncio.get_running_loop().create_future()
+        self._onderweg[(kleur, seq)] = (future, nu_ns())
+        self._kegel(kleur)["verstuurd"] += 1
+        future.add_done_callback(lambda _: self._onderweg.pop((kleur, seq), None))
+        return f"{commando}#{seq}", future
+
+    def noteer_herhaling(self, kleur: str):
+        self._kegel(kleur)["herhalingen"] += 1
+
+    def noteer_mislukt(self, kleur: str, future: asyncio.Future):
+        self._kegel(kleur)["mislukt"] += 1
+        if not future.done():
+            future.cancel()
+
+    def verwerk_ack(self, kleur: str, payload: str, tijdstip_ns: int) -> Optional[int]:
+        """Verwerk een ack en geef de afleverlatentie in ns terug (None voor onbekende of dubbele acks)"""
+        try:
+            seq = int(payload)
+        except ValueError:
+            return None
+
+        onderweg = self._onderweg.get((kleur, seq))
+        if onderweg is None:
+            return None
+        future, eerste_ns = onderweg
+        if future.done():
+            return None
+
+        latentie_ns = tijdstip_ns - eerste_ns
+        kegel = self._kegel(kleur)
+        kegel["bevestigd"] += 1
+        kegel["histogram"][bisect_left(LATENTIE_BUCKETS_MS, latentie_ns / 1_000_000)] += 1
+        kegel["max_ns"] = max(kegel["max_ns"], latentie_ns)
+        future.set_result(latentie_ns)
+        return latentie_ns
+
+    def stats(self) -> List[dict]:
+        grenzen = [f"<={grens}ms" for grens in LATENTIE_BUCKETS_MS] + [f">{LATENTIE_BUCKETS_MS[-1]}ms"]
+        return [
+            {
+                "kleur": kleur,
+                "verstuurd": kegel["verstuurd"],
+                "bevestigd": kegel["bevestigd"],
+                "herhalingen": kegel["herhalingen"],
+                "mislukt": kegel["mislukt"],
+                "max_ms": round(kegel["max_ns"] / 1_000_000, 2),
+                "histogram": dict(zip(grenzen, kegel["histogram"])),
+            }
+            for kleur, kegel in self._kegels.items()
+        ]
+
+    def _kegel(self, kleur: str) -> dict:
+        return self._kegels.setdefault(kleur, {
+            "verstuurd": 0,
+            "bevestigd": 0,
+            "herhalingen": 0,
+            "mislukt": 0,
+            "max_ns": 0,
+            "histogram": [0] * (len(LATENTIE_BUCKETS_MS) + 1),
+        })
@@ -0,0 +1,98 @@
+import asyncio
+from collections import deque
+from typing import Deque, List, Optional
+from backend.src.services.timing import nu_ns, NS_PER_SECONDE
+
+
+class DetectieKanaal:
+    """Wachtrij voor detecties van de kegels naar de lopende game
+
+    De MQTT callback levert detecties aan met `lever`, de game haalt ze één voor één op met `ontvang`.
+    Er wacht hoogstens één game tegelijk: een wachtende `ontvang` wordt rechtstreeks gewekt door een
+    nieuwe detectie, door `stop` of door zijn deadline, zonder extra tasks of polling.
+    """
+
+    def __init__(self):
+        self._wachtrij: Deque[dict] = deque()
+        self._wachter: Optional[asyncio.Future] = None
+        self._gestopt = False
+        # Logboek van alle geleverde detecties van de lopende game, pas bij het einde weggeschreven
+        self.ronde: Optional[int] = None
+        self.start_ns = nu_ns()
+        self._logboek: List[dict] = []
+
+    @property
+    def gestopt(self) -> bool:
+        return self._gestopt
+
+    def lever(self, gebeurtenis: dict):
+        """Callback voor MQTTDeviceManager.zet_detectie_callback"""
+        if self._gestopt:
+            return
+        gebeurtenis["ronde"] = self.ronde
+        self._logboek.append(gebeurtenis)
+        self._wachtrij.append(gebeurtenis)
+        self._wek()
+
+    def leeg(self):
+        """Vergeet detecties die nog niet opgehaald zijn (bv. aanrakingen van voor de ronde)"""
+        self._wachtrij.clear()
+
+    def neem_alle(self) -> List[dict]:
+        """Haal alle detecties op die al klaarstaan, zonder te wachten"""
+        gebeurtenissen = list(self._wachtrij)
+        self._wachtrij.clear()
+        return gebeurtenissen
+
+    def neem_logboek(self) -> List[dict]:
+        """Alle detecties sinds `start`, ook die door `leeg` niet bij de game aankwamen"""
+        logboek = self._logboek
+        self._logboek = []
+        return logboek
+
+    def start(self):
+        self._gestopt = False
+        self._wachtrij.clear()
+        self.ronde = None
+        self.start_ns = nu_ns()
+        self._logboek = []
+
+    def stop(self):
+        self._gestopt = True
+        self._wachtrij.clear()
+        self._wek()
+
+    async def ontvang(self, deadline_ns: Optional[int] = None) -> Optional[dict]:
+        """Volgende detectie in volgorde van aankomst
+
+        Args:
+            deadline_ns: tijdstip op de nu_ns() klok waarna niet meer gewacht wordt, None = geen limiet
+
+        Returns:
+            De detectie, of None bij stop (zie `gestopt`) of een verstreken deadline
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._gestopt:
+                return None
+            if self._wachtrij:
+                return self._wachtrij.popleft()
+
+            timer = None
+            if deadline_ns is not None:
+                resterend_ns = deadline_ns - nu_ns()
+                if resterend_ns <= 0:
+                    return None
+                timer = loop.call_later(resterend_ns / NS_PER_SECONDE, self._wek)
+
+            self._wachter = loop.create_future()
+            try:
+                await self._wachter
+            finally:
+                self._wachter = None
+                if timer is not None:
+                    timer.cancel()
+
+    def _wek(self):
+        if self._wachter is not None and not self._wachter.done():
+            self._wachter.set_result(None)
@@ -3,8 +3,9 @@ import datetime
 import logging
 from typing import Optional
 from backend.src.services.game_service import GameService
-from backend.src.repositories.data_repository import DataRepository
-from backend.src.models.models import Training, RondeWaarde
+from backend.src.services.ronde_plan import maak_ronde_plan
+from backend.src.repositories.async_data_repository import AsyncDataRepository
+from backend.src.models.models import TrainingResultaat, NieuweRondeWaarde, RondePlan
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,8 @@ class GameManager:
         self.game_service = game_service
         self.sio = sio
         self.current_task: Optional[asyncio.Task] = None
+        # Laatst opgeslagen training van dit station (resultatenscherm), blijft na een reset staan
+        self.laatste_trainings_id: Optional[int] = None
         
         # Game instellingen
         self.game_id: Optional[int] = None
@@ -23,6 +26,8 @@ class GameManager:
         self.rondes: Optional[int] = None
         self.kleuren: Optional[list] = None
         self.starttijd: Optional[datetime.datetime] = None
+        self.seed: Optional[int] = None
+        self.ronde_plan: Optional[RondePlan] = None
 
         # Color Battle specific settings
         self.speler1_naam: Optional[str] = None
@@ -37,6 +42,7 @@ class GameManager:
         self.ronde_id = instellingen.ronde_id
         self.rondes = instellingen.rondes
         self.kleuren = instellingen.kleuren
+        self.seed = instellingen.seed
         self.starttijd = datetime.datetime.now()
 
         logger.info(f"GameManager instellingen opgeslagen: game_id={self.game_id}, rondes={self.rondes}")
@@ -51,6 +57,7 @@ class GameManager:
         self.ronde_id = instellingen.ronde_id
         self.rondes = instellingen.rondes
         self.kleuren = instellingen.kleuren
+        self.seed = instellingen.seed
         self.starttijd = datetime.datetime.now()
 
         logger.info(f"GameManager Color Battle instellingen: speler1={self.speler1_naam}, speler2={self.speler2_naam}, rondes={self.rondes}")
@@ -65,6 +72,8 @@ class GameManager:
         self.rondes = None
         self.kleuren = None
         self.starttijd = None
+        self.seed = None
+        self.ronde_plan = None
         self.speler1_naam = None
         self.speler2_naam = None
         logger.info("GameManager instellingen gereset")
@@ -76,7 +85,7 @@ class GameManager:
             
             logger.info(f"Start colorgame met {self.rondes} rondes")
             rondes = await self.game_service.run_colorgame(
-                self.rondes, self.kleuren, self.snelheid
+                self.rondes, self.kleuren, self.snelheid, self.ronde_plan
             )
             
             await self._save_training_results(rondes, "waarde")
@@ -96,7 +105,7 @@ class GameManager:
             
             logger.info(f"Start memorygame met {self.rondes} rondes")
             rondes = await self.game_service.run_memorygame(
-                self.snelheid, self.rondes, self.kleuren
+                self.snelheid, self.rondes, self.kleuren, self.ronde_plan
             )
             
             await self._save_training_results(rondes, "reactietijd")
@@ -116,7 +125,7 @@ class GameManager:
             
             logger.info(f"Start numbergame met {self.rondes} rondes")
             rondes = await self.game_service.run_numbergame(
-                self.rondes, self.kleuren, self.snelheid
+                self.rondes, self.kleuren, self.snelheid, self.ronde_plan
             )
             
             await self._save_training_results(rondes, "waarde")
@@ -136,7 +145,7 @@ class GameManager:
 
             logger.info(f"Start falling color game met {self.rondes} rondes")
             rondes = await self.game_service.run_fallingcolorgame(
-                self.rondes, self.kleuren, self.snelheid
+                self.rondes, self.kleuren, self.snelheid, self.ronde_plan
             )
 
             await self._save_training_results(rondes, "waarde")
@@ -157,7 +166,7 @@ class GameManager:
             logger.info(f"Start Color Battle: {self.speler1_naam} vs {self.speler2_naam}, {self.rondes} rondes")
             resultaat = await self.game_service.run_colorbattle(
                 self.rondes, self.kleuren, self.snelheid,
-                self.speler1_naam, self.speler2_naam
+                self.speler1_naam, self.speler2_naam, self.ronde_plan
             )
 
             # Save training results for both players
@@ -171,77 +180,74 @@ class GameManager:
             self.current_task = None
             self.reset_instellingen()
     
-    async def _save_training_results(self, rondes: list, waarde_key: str):
-        """Sla trainingsresultaten op in de database"""
-        user_id = DataRepository.add_gebruiker(self.gebruikersnaam)
-        logger.info(f"Nieuwe gebruiker toegevoegd met ID: {user_id}")
-
-        training_id = DataRepository.add_training(
-            Training(
+    async def _save_training_results(self, rondes: list, waarde_key: str) -> int:
+        """Sla trainingsresultaten op in de database (één transactie), returnt het trainings_id"""
+        opgeslagen = await AsyncDataRepository.save_training_resultaat(
+            TrainingResultaat(
+                gebruikersnamen=[self.gebruikersnaam],
                 start_tijd=self.starttijd.isoformat(),
                 aantal_kleuren=len(self.kleuren),
-                gebruikers_id=user_id,
                 ronde_id=self.ronde_id,
                 moeilijkheids_id=self.moeilijkheids_id,
-                game_id=self.game_id
+                game_id=self.game_id,
+                ronde_plan=self.ronde_plan,
+                detecties=self.game_service.neem_detectie_log(),
+                rondewaarden=[
+                    NieuweRondeWaarde(
+                        ronde_nummer=ronde["rondenummer"],
+                        waarde=ronde[waarde_key],
+                        uitkomst=ronde.get("uitkomst") or ronde.get("status")
+                    )
+                    for ronde in rondes
+                ]
             )
         )
-        logger.info(f"Nieuwe training toegevoegd met ID: {training_id}")
-
-        for ronde in rondes:
-            DataRepository.add_ronde_waarde(
-                RondeWaarde(
-                    trainings_id=training_id,
-                    ronde_nummer=ronde["rondenummer"],
-                    waarde=ronde[waarde_key],
-                    uitkomst=ronde.get("uitkomst") or ronde.get("status")
-                )
-            )
 
-    async def _save_colorbattle_results(self, resultaat: dict):
-        """Sla Color Battle resultaten op voor beide spelers bij dezelfde training"""
-        rondes = resultaat["rondes"]
+        if opgeslagen is None:
+            raise RuntimeError("Training kon niet opgeslagen worden")
+        self.laatste_trainings_id = opgeslagen["trainings_id"]
+        logger.info(f"Nieuwe training toegevoegd met ID: {opgeslagen['trainings_id']} (gebruiker ID: {opgeslagen['gebruikers_ids'][0]})")
+        return self.laatste_trainings_id
 
-        # Add both players
-        user1_id = DataRepository.add_gebruiker(self.speler1_naam)
-        user2_id = DataRepository.add_gebruiker(self.speler2_naam)
-        logger.info(f"Spelers toegevoegd: {self.speler1_naam} (ID: {user1_id}), {self.speler2_naam} (ID: {user2_id})")
+    async def _save_colorbattle_results(self, resultaat: dict) -> int:
+        """Sla Color Battle resultaten op voor beide spelers bij dezelfde training (één transactie), returnt het trainings_id"""
+        rondewaarden = []
+        for ronde in resultaat["rondes"]:
+            # Speler 1's ronde, daarna speler 2's ronde
+            rondewaarden.append(NieuweRondeWaarde(
+                ronde_nummer=ronde["rondenummer"],
+                waarde=ronde["speler1_tijd"],
+                uitkomst=ronde["speler1_uitkomst"],
+                speler_nummer=1
+            ))
+            rondewaarden.append(NieuweRondeWaarde(
+                ronde_nummer=ronde["rondenummer"],
+                waarde=ronde["speler2_tijd"],
+                uitkomst=ronde["speler2_uitkomst"],
+                speler_nummer=2
+            ))
 
-        # Create ONE shared training for both players (use speler1 as primary)
-        shared_training_id = DataRepository.add_training(
-            Training(
+        # Eén gedeelde training voor beide spelers (speler1 als primaire gebruiker)
+        opgeslagen = await AsyncDataRepository.save_training_resultaat(
+            TrainingResultaat(
+                gebruikersnamen=[self.speler1_naam, self.speler2_naam],
                 start_tijd=self.starttijd.isoformat(),
                 aantal_kleuren=len(self.kleuren),
-                gebruikers_id=user1_id,
                 ronde_id=self.ronde_id,
                 moeilijkheids_id=self.moeilijkheids_id,
-                game_id=self.game_id
+                game_id=self.game_id,
+                rondewaarden=rondewaarden,
+                ronde_plan=self.ronde_plan,
+                detecties=self.game_service.neem_detectie_log()
             )
         )
-        logger.info(f"Gedeelde training aangemaakt met ID: {shared_training_id}")
 
-        # Save both players' rounds to the same training
-        for ronde in rondes:
-            # Speler 1's ronde
-            DataRepository.add_ronde_waarde(
-                RondeWaarde(
-                    trainings_id=shared_training_id,
-                    ronde_nummer=ronde["rondenummer"],
-                    waarde=ronde["speler1_tijd"],
-                    uitkomst=ronde["speler1_uitkomst"]
-                )
-            )
-            # Speler 2's ronde
-            DataRepository.add_ronde_waarde(
-                RondeWaarde(
-                    trainings_id=shared_training_id,
-                    ronde_nummer=ronde["rondenummer"],
-                    waarde=ronde["speler2_tijd"],
-                    uitkomst=ronde["speler2_uitkomst"]
-                )
-            )
-        
-        logger.info(f"Beide spelers opgeslagen bij training {shared_training_id}")
+        if opgeslagen is None:
+            raise RuntimeError("Color Battle training kon niet opgeslagen worden")
+        self.laatste_trainings_id = opgeslagen["trainings_id"]
+        user1_id, user2_id = opgeslagen["gebruikers_ids"]
+        logger.info(f"Spelers opgeslagen: {self.speler1_naam} (ID: {user1_id}), {self.speler2_naam} (ID: {user2_id}) bij training {opgeslagen['trainings_id']}")
+        return self.laatste_trainings_id
     
     def is_game_running(self) -> bool:
         """Check of er een game actief is"""
@@ -286,6 +292,10 @@ class GameManager:
                 "message": "Game instellingen zijn niet compleet. Stel eerst de game in."
             }
         
+        # Alle opdrachten vooraf, de game loops wachten enkel nog op I/O
+        self.ronde_plan = maak_ronde_plan(game_id, self.rondes, self.kleuren, self.seed)
+        logger.info(f"Rondeplan voor game {game_id} met seed {self.ronde_plan.seed}")
+
         if game_id == 1:
             self.current_task = asyncio.create_task(self.start_colorgame())
         elif game_id == 2:
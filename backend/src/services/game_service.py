@@ -1,99 +1,98 @@
 import asyncio
-import random
-import time
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from backend.src.models.models import RondePlan, DetectieLogItem
+from backend.src.services.detectie_kanaal import DetectieKanaal
+from backend.src.services.ronde_plan import maak_ronde_plan, nummer_naar_kleur
+from backend.src.services.station import STANDAARD_STATION
+from backend.src.services.timing import NS_PER_SECONDE, nu_ns, seconden_naar_ns, ns_naar_seconden, ns_naar_ms, server_tijden, weergave, tijdstip_van, reactietijd_ns
 
 logger = logging.getLogger(__name__)
 
+# Na de maximale tijd nog zo lang wachten op berichten die na latentie correctie toch op tijd waren
+DEADLINE_MARGE_NS = seconden_naar_ns(0.5)
+# Tijd tussen het tonen van de opdracht en de start van de reactietijd
+VOORBEREIDING_NS = seconden_naar_ns(0.2)
+
 class GameService:
     def __init__(self, device_manager, sio, hardware_delay: float = 0.07):
         self.device_manager = device_manager
         self.sio = sio
         self.hardware_delay = hardware_delay
+        self.hardware_delay_ns = seconden_naar_ns(hardware_delay)
         self.stop_event = asyncio.Event()
+        self.kanaal = DetectieKanaal()
     
-    async def run_colorgame(self, aantal_rondes: int, kleuren: List[str], snelheid: float) -> List[Dict]:
+    async def run_colorgame(self, aantal_rondes: int, kleuren: List[str], snelheid: float, plan: Optional[RondePlan] = None) -> List[Dict]:
         """Voert het colorgame uit en returnt de rondes"""
+        plan = plan or maak_ronde_plan(1, aantal_rondes, kleuren)
         colorgame_rondes = []
         max_tijd = float(snelheid)
+        max_tijd_ns = seconden_naar_ns(max_tijd)
         
-        detectie_event = asyncio.Event()
-        detected_color = {}
-        
-        def on_detectie(gebeurtenis):
-            detected_color.clear()
-            detected_color.update(gebeurtenis)
-            detectie_event.set()
-        
-        self.device_manager.zet_detectie_callback(on_detectie)
+        self.device_manager.zet_detectie_callback(self.kanaal.lever)
         await self.device_manager.start_alle()
         
         for ronde in range(1, aantal_rondes + 1):
             if self.stop_event.is_set():
                 logger.info("Game gestopt door gebruiker")
                 break
+            self.kanaal.ronde = ronde
             
-            gekozen_kleur = random.choice(kleuren).upper()
+            gekozen_kleur = plan.kleuren[ronde - 1]
             
+            start_ns = nu_ns() + VOORBEREIDING_NS
             await self.sio.emit('gekozen_kleur', {
                 'rondenummer': ronde,
                 'maxronden': aantal_rondes,
-                'kleur': gekozen_kleur
+                'kleur': gekozen_kleur,
+                **server_tijden(start_ns, start_ns + max_tijd_ns),
             })
             logger.info(f"Round {ronde}: Chosen color = {gekozen_kleur}")
             
-            await asyncio.sleep(0.2)
+            await self._wacht_tot(start_ns)
+            # Aanrakingen van voor de start van de ronde tellen niet, die tijdens het (bevestigd) activeren wel
+            self.kanaal.leeg()
             await self.device_manager.set_correct_kegel(gekozen_kleur)
-            
-            detectie_event.clear()
-            detected_color.clear()
-            starttijd = time.time()
+            start_ns = self._reactie_start(start_ns)
             
             try:
-                detectie_task = asyncio.create_task(detectie_event.wait())
-                stop_task = asyncio.create_task(self.stop_event.wait())
-                
-                done, pending = await asyncio.wait(
-                    [detectie_task, stop_task],
-                    return_when=asyncio.FIRST_COMPLETED
-                )
+                gebeurtenis = await self.kanaal.ontvang(start_ns + max_tijd_ns + DEADLINE_MARGE_NS)
                 
-                for task in pending:
-                    task.cancel()
-                
-                if stop_task in done:
+                if self.kanaal.gestopt:
                     logger.info("Game gestopt tijdens wachten op detectie")
                     break
                 
-                if detectie_task in done:
-                    reactietijd = round(time.time() - starttijd, 2) - self.hardware_delay
-                    detected_kleur = detected_color.get("kleur", "").lower()
+                if gebeurtenis is not None:
+                    reactie_ns = reactietijd_ns(start_ns, tijdstip_van(gebeurtenis), self._correctie_ns(gebeurtenis))
+                    detected_kleur = gebeurtenis.get("kleur", "").lower()
                     
-                    if (max_tijd - reactietijd) < 0:
-                        reactietijd = max_tijd
+                    if reactie_ns > max_tijd_ns:
+                        reactie_ns = max_tijd_ns
                         status = "te laat"
-                        logger.info(f"Too late! Reaction time: {reactietijd}s")
+                        logger.info(f"Too late! Reaction time: {weergave(reactie_ns)}s")
                     elif detected_kleur == gekozen_kleur.lower():
                         status = "correct"
-                        logger.info(f"Correct! Reaction time: {reactietijd}s")
+                        logger.info(f"Correct! Reaction time: {weergave(reactie_ns)}s")
                     else:
                         status = "fout"
-                        reactietijd += max_tijd
+                        reactie_ns += max_tijd_ns
                         logger.info(f"Wrong color! Detected: {detected_kleur}, Expected: {gekozen_kleur}")
+                    gebeurtenis["beoordeling"] = status
                 else:
-                    reactietijd = max_tijd
+                    reactie_ns = max_tijd_ns
                     status = "te laat"
                     logger.info(f"Too late! Timeout after {max_tijd}s")
                     
             except Exception as e:
                 logger.error(f"Error in colorgame ronde: {e}")
-                reactietijd = max_tijd
+                reactie_ns = max_tijd_ns
                 status = "fout"
             
             colorgame_rondes.append({
                 "rondenummer": ronde,
-                "waarde": reactietijd,
+                "waarde": ns_naar_seconden(reactie_ns),
+                "waarde_ns": reactie_ns,
                 "uitkomst": status,
             })
             
@@ -105,28 +104,20 @@ class GameService:
         
         return colorgame_rondes
     
-    async def run_memorygame(self, snelheid: float, aantal_rondes: int, kleuren: List[str]) -> List[Dict]:
+    async def run_memorygame(self, snelheid: float, aantal_rondes: int, kleuren: List[str], plan: Optional[RondePlan] = None) -> List[Dict]:
         """Voert het memorygame uit en returnt de rondes"""
-        geheugen_lijst = []
+        plan = plan or maak_ronde_plan(2, aantal_rondes, kleuren)
         rondes_memory = []
 
-        detectie_event = asyncio.Event()
-        detected_color = {}
-
-        def on_detectie(gebeurtenis):
-            detected_color.clear()
-            detected_color.update(gebeurtenis)
-            detectie_event.set()
-
-        self.device_manager.zet_detectie_callback(on_detectie)
+        self.device_manager.zet_detectie_callback(self.kanaal.lever)
 
         for ronde in range(1, aantal_rondes + 1):
             if self.stop_event.is_set():
                 logger.info("Game gestopt door gebruiker")
                 break
+            self.kanaal.ronde = ronde
                 
-            nieuwe_kleur = random.choice(kleuren)
-            geheugen_lijst.append(nieuwe_kleur)
+            geheugen_lijst = plan.kleuren[:ronde]
             await self.sio.emit('ronde_start', {'rondenummer': ronde, 'maxronden': aantal_rondes})
 
             await asyncio.sleep(3)
@@ -140,7 +131,8 @@ class GameService:
             await self.sio.emit('kleuren_getoond', {'aantal': len(geheugen_lijst)})
             await self.device_manager.start_alle()
 
-            starttijd = time.time()
+            start_ns = None
+            eind_ns = None
             status = "correct"
 
             for verwachte_kleur in geheugen_lijst:
@@ -149,38 +141,28 @@ class GameService:
                     status = "gestopt"
                     break
                 
-                detectie_event.clear()
-                detected_color.clear()
+                self.kanaal.leeg()
 
                 await self.device_manager.set_correct_kegel(verwachte_kleur)
+                if start_ns is None:
+                    # De tijd loopt vanaf het activeren van de eerste kegel
+                    start_ns = nu_ns()
 
                 try:
-                    detectie_task = asyncio.create_task(detectie_event.wait())
-                    stop_task = asyncio.create_task(self.stop_event.wait())
-                    
-                    done, pending = await asyncio.wait(
-                        [detectie_task, stop_task],
-                        return_when=asyncio.FIRST_COMPLETED
-                    )
-                    
-                    # Properly cancel and await pending tasks
-                    for task in pending:
-                        task.cancel()
-                        try:
-                            await task
-                        except asyncio.CancelledError:
-                            pass
+                    gebeurtenis = await self.kanaal.ontvang()
                     
                     await self.device_manager.reset_correct_kegel(verwachte_kleur)
                     
-                    if stop_task in done:
+                    if self.kanaal.gestopt:
                         logger.info("Game gestopt tijdens wachten op aanraking")
                         status = "gestopt"
                         break
                     
-                    if detectie_task in done:
-                        detected_kleur = detected_color.get("kleur", "").lower()
+                    if gebeurtenis is not None:
+                        detected_kleur = gebeurtenis.get("kleur", "").lower()
+                        eind_ns = tijdstip_van(gebeurtenis)
                         
+                        gebeurtenis["beoordeling"] = "correct" if detected_kleur == verwachte_kleur.lower() else "fout"
                         if detected_kleur != verwachte_kleur.lower():
                             await self.sio.emit('fout_kleur', {'status': 'game over'})
                             status = "fout"
@@ -200,15 +182,16 @@ class GameService:
                     status = "fout"
                     break
 
-            eindtijd = time.time()
-            reactietijd = round(eindtijd - starttijd, 2)
+            # Eindtijd = ontvangst van de laatste aanraking (of nu bij stop/timeout)
+            reactie_ns = (eind_ns or nu_ns()) - start_ns if start_ns is not None else 0
             await self.sio.emit('ronde_einde', {'ronde': ronde, 'status': status})
             logger.info(f"Ronde {ronde} klaar: {status}")
             await self.device_manager.stop_alle()
 
             rondes_memory.append({
                 'rondenummer': ronde,
-                'reactietijd': reactietijd,
+                'reactietijd': ns_naar_seconden(reactie_ns),
+                'reactietijd_ns': reactie_ns,
                 'status': status
             })
 
@@ -220,31 +203,18 @@ class GameService:
         logger.info("Einde memory game")
         return rondes_memory
     
-    async def run_numbergame(self, aantal_rondes: int, kleuren: List[str], snelheid: float) -> List[Dict]:
+    async def run_numbergame(self, aantal_rondes: int, kleuren: List[str], snelheid: float, plan: Optional[RondePlan] = None) -> List[Dict]:
         """Voert het numbergame uit en returnt de rondes"""
         numbergame_rondes = []
         max_tijd = float(snelheid)
+        max_tijd_ns = seconden_naar_ns(max_tijd)
         
-        # Shuffle de gekozen kleuren en maak een random mapping
-        beschikbare_kleuren = kleuren.copy()
-        random.shuffle(beschikbare_kleuren)
-        
-        # Maak mapping van kleuren naar nummers (1, 2, 3, ...)
-        kleur_naar_nummer = {}
-        for index, kleur in enumerate(beschikbare_kleuren):
-            kleur_naar_nummer[kleur] = index + 1
-        
-        max_nummer = len(beschikbare_kleuren)
-        
-        detectie_event = asyncio.Event()
-        detected_color = {}
+        # Random mapping van kleuren naar nummers (1, 2, 3, ...) uit het rondeplan
+        plan = plan or maak_ronde_plan(3, aantal_rondes, kleuren)
+        kleur_naar_nummer = plan.nummer_mapping
+        kleur_van_nummer = nummer_naar_kleur(plan)
         
-        def on_detectie(gebeurtenis):
-            detected_color.clear()
-            detected_color.update(gebeurtenis)
-            detectie_event.set()
-        
-        self.device_manager.zet_detectie_callback(on_detectie)
+        self.device_manager.zet_detectie_callback(self.kanaal.lever)
         
         # Stuur de random mapping naar de frontend
         await self.sio.emit('nummer_mapping', {
@@ -264,80 +234,63 @@ class GameService:
             if self.stop_event.is_set():
                 logger.info("Game gestopt door gebruiker")
                 break
+            self.kanaal.ronde = ronde
             
-            # Kies een random nummer tussen 1 en het aantal gekozen kleuren
-            gekozen_nummer = random.randint(1, max_nummer)
-            
-            # Vind de bijbehorende kleur
-            verwachte_kleur = None
-            for kleur, nummer in kleur_naar_nummer.items():
-                if nummer == gekozen_nummer:
-                    verwachte_kleur = kleur
-                    break
+            gekozen_nummer = plan.nummers[ronde - 1]
+            verwachte_kleur = kleur_van_nummer[gekozen_nummer]
             
+            start_ns = nu_ns() + VOORBEREIDING_NS
             await self.sio.emit('gekozen_nummer', {
                 'rondenummer': ronde,
                 'maxronden': aantal_rondes,
-                'nummer': gekozen_nummer
+                'nummer': gekozen_nummer,
+                **server_tijden(start_ns, start_ns + max_tijd_ns),
             })
             logger.info(f"Round {ronde}: Chosen number = {gekozen_nummer}, Expected color = {verwachte_kleur}")
             
-            await asyncio.sleep(0.2)
+            await self._wacht_tot(start_ns)
+            # Aanrakingen van voor de start van de ronde tellen niet, die tijdens het (bevestigd) activeren wel
+            self.kanaal.leeg()
             await self.device_manager.set_correct_kegel(verwachte_kleur)
-            
-            detectie_event.clear()
-            detected_color.clear()
-            starttijd = time.time()
+            start_ns = self._reactie_start(start_ns)
             
             try:
-                detectie_task = asyncio.create_task(detectie_event.wait())
-                stop_task = asyncio.create_task(self.stop_event.wait())
+                gebeurtenis = await self.kanaal.ontvang(start_ns + max_tijd_ns + DEADLINE_MARGE_NS)
                 
-                done, pending = await asyncio.wait(
-                    [detectie_task, stop_task],
-                    return_when=asyncio.FIRST_COMPLETED
-                )
-                
-                # Properly cancel and await pending tasks
-                for task in pending:
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-                
-                if stop_task in done:
+                if self.kanaal.gestopt:
                     logger.info("Game gestopt tijdens wachten op detectie")
                     break
                 
-                if detectie_task in done:
-                    reactietijd = round(time.time() - starttijd, 2) - self.hardware_delay
-                    detected_kleur = detected_color.get("kleur", "").lower()
+                if gebeurtenis is not None:
+                    reactie_ns = reactietijd_ns(start_ns, tijdstip_van(gebeurtenis), self._correctie_ns(gebeurtenis))
+                    detected_kleur = gebeurtenis.get("kleur", "").lower()
                     
-                    if (max_tijd - reactietijd) < 0:
-                        reactietijd = max_tijd
+                    if reactie_ns > max_tijd_ns:
+                        reactie_ns = max_tijd_ns
                         status = "te laat"
-                        logger.info(f"Too late! Reaction time: {reactietijd}s")
+                        logger.info(f"Too late! Reaction time: {weergave(reactie_ns)}s")
                     elif detected_kleur == verwachte_kleur.lower():
                         status = "correct"
-                        logger.info(f"Correct! Reaction time: {reactietijd}s")
+                        logger.info(f"Correct! Reaction time: {weergave(reactie_ns)}s")
                     else:
                         status = "fout"
-                        reactietijd += max_tijd
+                        reactie_ns += max_tijd_ns
                         logger.info(f"Wrong color! Detected: {detected_kleur}, Expected: {verwachte_kleur}")
+                    gebeurtenis["beoordeling"] = status
                 else:
-                    reactietijd = max_tijd
+                    reactie_ns = max_tijd_ns
                     status = "te laat"
                     logger.info(f"Too late! Timeout after {max_tijd}s")
                     
             except Exception as e:
                 logger.error(f"Error in numbergame ronde: {e}")
-                reactietijd = max_tijd
+                reactie_ns = max_tijd_ns
                 status = "fout"
             
             numbergame_rondes.append({
                 "rondenummer": ronde,
-                "waarde": reactietijd,
+                "waarde": ns_naar_seconden(reactie_ns),
+                "waarde_ns": reactie_ns,
                 "uitkomst": status,
             })
             
@@ -349,107 +302,97 @@ class GameService:
         
         return numbergame_rondes
     
-    async def run_fallingcolorgame(self, aantal_rondes: int, kleuren: List[str], snelheid: float) -> List[Dict]:
+    async def run_fallingcolorgame(self, aantal_rondes: int, kleuren: List[str], snelheid: float, plan: Optional[RondePlan] = None) -> List[Dict]:
         """Voert het falling color game uit waarbij kleuren van 100% naar 0% vallen"""
+        plan = plan or maak_ronde_plan(4, aantal_rondes, kleuren)
         fallingcolor_rondes = []
         val_tijd = float(snelheid)  # Tijd om van 100% naar 0% te vallen
-        update_interval = 0.05  # Update percentage elke 50ms
-        
-        detectie_event = asyncio.Event()
-        detected_color = {}
-        
-        def on_detectie(gebeurtenis):
-            detected_color.clear()
-            detected_color.update(gebeurtenis)
-            detectie_event.set()
+        val_tijd_ns = seconden_naar_ns(val_tijd)
         
-        self.device_manager.zet_detectie_callback(on_detectie)
+        self.device_manager.zet_detectie_callback(self.kanaal.lever)
         await self.device_manager.start_alle()
         
         for ronde in range(1, aantal_rondes + 1):
             if self.stop_event.is_set():
                 logger.info("Game gestopt door gebruiker")
                 break
+            self.kanaal.ronde = ronde
             
-            gekozen_kleur = random.choice(kleuren).upper()
+            gekozen_kleur = plan.kleuren[ronde - 1]
             
+            # De frontend animeert de val zelf van start_ms tot deadline_ms (monotone serverklok)
+            start_ns = nu_ns() + VOORBEREIDING_NS
+            deadline_ns = start_ns + val_tijd_ns
             await self.sio.emit('vallende_kleur_start', {
                 'rondenummer': ronde,
                 'maxronden': aantal_rondes,
                 'kleur': gekozen_kleur,
-                'val_tijd': val_tijd
+                'val_tijd': val_tijd,
+                **server_tijden(start_ns, deadline_ns),
             })
             logger.info(f"Round {ronde}: Falling color = {gekozen_kleur}, Fall time = {val_tijd}s")
             
-            await asyncio.sleep(0.2)
+            await self._wacht_tot(start_ns)
+            self.kanaal.leeg()
             await self.device_manager.set_correct_kegel(gekozen_kleur)
+            start_ns = self._reactie_start(start_ns)
+            deadline_ns = start_ns + val_tijd_ns
             
-            detectie_event.clear()
-            detected_color.clear()
-            starttijd = time.time()
-            correct_touched = False
+            reactie_ns = val_tijd_ns
             status = "te laat"  # Default status als tijd op is
             
             try:
-                # Start falling loop
-                while True:
-                    elapsed = time.time() - starttijd
-                    
-                    if elapsed >= val_tijd:
-                        # Tijd is op, kleur op 100%, speler is dood
-                        percentage = 100
-                        await self.sio.emit('vallende_kleur_percentage', {
-                            'percentage': percentage,
-                            'rondenummer': ronde
-                        })
-                        status = "te laat"
-                        await self.sio.emit('fout_kleur', {'status': 'game over - te laat'})
-                        logger.info(f"Game Over! Kleur bereikte 100%")
-                        break
-                    
-                    # Bereken percentage (0% -> 100%)
-                    percentage = min(100, (elapsed / val_tijd * 100))
+                # Geen updates tijdens de val: wacht op een detectie of op de deadline. Net als bij de
+                # andere games wacht de server DEADLINE_MARGE_NS langer, zodat een aanraking voor de
+                # deadline die vertraagd binnenkomt nog telt. Te laat is enkel een reactietijd na de val.
+                gebeurtenis = await self.kanaal.ontvang(deadline_ns + DEADLINE_MARGE_NS)
+                if gebeurtenis is not None and not self.kanaal.gestopt:
+                    reactie_ns = reactietijd_ns(start_ns, tijdstip_van(gebeurtenis), self._correctie_ns(gebeurtenis))
+                    if reactie_ns > val_tijd_ns:
+                        gebeurtenis["beoordeling"] = "te laat"
+                        gebeurtenis = None
+                if self.kanaal.gestopt:
+                    logger.info("Game gestopt tijdens falling color")
+                    status = "gestopt"
+                elif gebeurtenis is None:
+                    # Tijd is op, kleur op 100%, speler is dood
+                    await self.sio.emit('vallende_kleur_percentage', {
+                        'percentage': 100,
+                        'rondenummer': ronde
+                    })
+                    await self.sio.emit('fout_kleur', {'status': 'game over - te laat'})
+                    logger.info(f"Game Over! Kleur bereikte 100%")
+                else:
+                    detected_kleur = gebeurtenis.get("kleur", "").lower()
+                    percentage = min(100, reactie_ns / val_tijd_ns * 100)
                     
+                    # Bevries de animatie op de plaats van de aanraking
                     await self.sio.emit('vallende_kleur_percentage', {
                         'percentage': round(percentage, 1),
                         'rondenummer': ronde
                     })
                     
-                    # Check of er een detectie is
-                    if detectie_event.is_set():
-                        reactietijd = round(elapsed, 2) - self.hardware_delay
-                        detected_kleur = detected_color.get("kleur", "").lower()
-                        
-                        if detected_kleur == gekozen_kleur.lower():
-                            status = "correct"
-                            correct_touched = True
-                            logger.info(f"Correct! Reaction time: {reactietijd}s at {percentage:.1f}%")
-                            break
-                        else:
-                            status = "fout"
-                            await self.sio.emit('fout_kleur', {'status': 'game over - foute kleur'})
-                            logger.info(f"Wrong color! Detected: {detected_kleur}, Expected: {gekozen_kleur}")
-                            break
-                    
-                    # Check of game gestopt is
-                    if self.stop_event.is_set():
-                        logger.info("Game gestopt tijdens falling color")
-                        status = "gestopt"
-                        break
-                    
-                    await asyncio.sleep(update_interval)
+                    if detected_kleur == gekozen_kleur.lower():
+                        status = "correct"
+                        logger.info(f"Correct! Reaction time: {weergave(reactie_ns)}s at {percentage:.1f}%")
+                    else:
+                        status = "fout"
+                        await self.sio.emit('fout_kleur', {'status': 'game over - foute kleur'})
+                        logger.info(f"Wrong color! Detected: {detected_kleur}, Expected: {gekozen_kleur}")
+                    gebeurtenis["beoordeling"] = status
                 
             except Exception as e:
                 logger.error(f"Error in fallingcolorgame ronde: {e}")
                 status = "fout"
             
-            # Bereken reactietijd voor opslag
-            eindtijd = time.time()
-            reactietijd = round(eindtijd - starttijd, 2) - self.hardware_delay
+            # Enkel een correcte aanraking telt, anders wordt de volledige valtijd opgeslagen
+            if status != "correct":
+                reactie_ns = val_tijd_ns
             
             fallingcolor_rondes.append({
                 "rondenummer": ronde,
-                "waarde": reactietijd if status == "correct" else val_tijd,
+                "waarde": ns_naar_seconden(reactie_ns),
+                "waarde_ns": reactie_ns,
                 "uitkomst": status,
             })
             
@@ -466,10 +409,12 @@ class GameService:
         
         return fallingcolor_rondes
     
-    async def run_colorbattle(self,aantal_rondes: int,kleuren: List[str],snelheid: float,speler1_naam: str,speler2_naam: str) -> Dict:
+    async def run_colorbattle(self,aantal_rondes: int,kleuren: List[str],snelheid: float,speler1_naam: str,speler2_naam: str,plan: Optional[RondePlan] = None) -> Dict:
         """Voert het Color Battle game uit met 2 spelers"""
+        plan = plan or maak_ronde_plan(5, aantal_rondes, kleuren)
         rondes_resultaten = []
         max_tijd = float(snelheid)
+        max_tijd_ns = seconden_naar_ns(max_tijd)
 
         # Track scores
         speler1_correct = 0
@@ -477,18 +422,7 @@ class GameService:
         speler1_totaal_tijd = 0.0
         speler2_totaal_tijd = 0.0
 
-        # Detection state for handling 2 touches per round
-        detecties = []
-        detectie_event = asyncio.Event()
-
-        def on_detectie(gebeurtenis):
-            detecties.append({
-                "kleur": gebeurtenis.get("kleur", "").lower(),
-                "tijd": time.time()
-            })
-            detectie_event.set()  # Signal that a new detection arrived
-
-        self.device_manager.zet_detectie_callback(on_detectie)
+        self.device_manager.zet_detectie_callback(self.kanaal.lever)
         await self.device_manager.start_alle()
 
         # Emit game start with player names
@@ -502,118 +436,70 @@ class GameService:
             if self.stop_event.is_set():
                 logger.info("Game gestopt door gebruiker")
                 break
+            self.kanaal.ronde = ronde
 
-            # Pick 2 different colors for each player
-            beschikbare_kleuren = [k.lower() for k in kleuren]
-            random.shuffle(beschikbare_kleuren)
-            speler1_kleur = beschikbare_kleuren[0].upper()
-            speler2_kleur = beschikbare_kleuren[1].upper()
+            # 2 verschillende kleuren per ronde, vooraf gekozen in het rondeplan
+            speler1_kleur, speler2_kleur = plan.kleurparen[ronde - 1]
+
+            start_ns = nu_ns() + VOORBEREIDING_NS
 
             # Emit round start with colors
             await self.sio.emit('colorbattle_ronde', {
                 'rondenummer': ronde,
                 'maxronden': aantal_rondes,
                 'speler1_kleur': speler1_kleur,
-                'speler2_kleur': speler2_kleur
+                'speler2_kleur': speler2_kleur,
+                **server_tijden(start_ns, start_ns + max_tijd_ns),
             })
             logger.info(f"Round {ronde}: Player1={speler1_kleur}, Player2={speler2_kleur}")
 
-            await asyncio.sleep(0.2)
-
-            # Set both cones as "correct" for detection
-            await self.device_manager.set_correct_kegel(speler1_kleur)
-            await self.device_manager.set_correct_kegel(speler2_kleur)
-
-            # Reset detection state
-            detecties.clear()
-            detectie_event.clear()
-            starttijd = time.time()
-
-            # Initialize round results
-            speler1_tijd = max_tijd
-            speler2_tijd = max_tijd
-            speler1_uitkomst = "te laat"
-            speler2_uitkomst = "te laat"
-            speler1_touch_tijd = None
-            speler2_touch_tijd = None
+            # Beide kegels tegelijk op "correct" zodat ze op hetzelfde moment oplichten
+            await self._wacht_tot(start_ns)
+            # Aanrakingen van voor de start van de ronde tellen niet, die tijdens het (bevestigd) activeren wel
+            self.kanaal.leeg()
+            aangekondigd_ns = start_ns
+            await self.device_manager.set_correct_kegels([speler1_kleur, speler2_kleur])
+            start_ns = self._reactie_start(start_ns)
+
+            spelers = {
+                1: {"kleur": speler1_kleur.lower(), "touch_ns": None, "tijd": max_tijd, "uitkomst": "te laat"},
+                2: {"kleur": speler2_kleur.lower(), "touch_ns": None, "tijd": max_tijd, "uitkomst": "te laat"},
+            }
 
             try:
-                # Wait until both players have results, or timeout/stop
-                while speler1_touch_tijd is None or speler2_touch_tijd is None:
-                    if self.stop_event.is_set():
+                # Wacht tot beide spelers een resultaat hebben, of stop/timeout
+                while spelers[1]["touch_ns"] is None or spelers[2]["touch_ns"] is None:
+                    det = await self.kanaal.ontvang(start_ns + max_tijd_ns + DEADLINE_MARGE_NS)
+                    if self.kanaal.gestopt:
                         logger.info("Game gestopt tijdens wachten op detectie")
                         break
+                    if det is None:
+                        logger.info(f"Timeout na {max_tijd}s")
+                        break
 
-                    elapsed = time.time() - starttijd
-
-                    # Check for new detection
-                    remaining = max_tijd - elapsed
-                    try:
-                        await asyncio.wait_for(
-                            detectie_event.wait(),
-                            timeout=min(0.1, remaining)
-                        )
-                        # Clear event so we wait for the next detection
-                        detectie_event.clear()
-                    except asyncio.TimeoutError:
-                        pass
-
-                    # Process any detections we have
+                    # Detecties die samen binnenkwamen worden beoordeeld in volgorde van aanraking,
+                    # niet van aankomst: kegels met meer latentie mogen een snellere speler niet benadelen.
                     # Note: Hardware has 500ms cooldown per cone, so no software bounce filter needed
-                    for det in detecties:
-                        det_kleur = det["kleur"]
-                        det_tijd = det["tijd"] - starttijd - self.hardware_delay
-
-                        # Speler 1's kleur aangeraakt
-                        if det_kleur == speler1_kleur.lower():
-                            if speler1_touch_tijd is None:
-                                # Speler 1 raakt zijn eigen kleur aan = correct
-                                speler1_touch_tijd = det_tijd
-                                speler1_tijd = round(max(0, det_tijd), 2)
-                                speler1_uitkomst = "correct"
-                                logger.info(f"Player1 touched {det_kleur} (correct) at {speler1_tijd}s")
-                            elif speler2_touch_tijd is None:
-                                # Speler 2 raakt speler 1's kleur aan = fout
-                                speler2_touch_tijd = det_tijd
-                                speler2_tijd = round(max_tijd + max(0, det_tijd), 2)
-                                speler2_uitkomst = "te laat"
-                                logger.info(f"Player2 touched {det_kleur} (wrong) at {det_tijd:.2f}s")
-
-                        # Speler 2's kleur aangeraakt
-                        elif det_kleur == speler2_kleur.lower():
-                            if speler2_touch_tijd is None:
-                                # Speler 2 raakt zijn eigen kleur aan = correct
-                                speler2_touch_tijd = det_tijd
-                                speler2_tijd = round(max(0, det_tijd), 2)
-                                speler2_uitkomst = "correct"
-                                logger.info(f"Player2 touched {det_kleur} (correct) at {speler2_tijd}s")
-                            elif speler1_touch_tijd is None:
-                                # Speler 1 raakt speler 2's kleur aan = fout
-                                speler1_touch_tijd = det_tijd
-                                speler1_tijd = round(max_tijd + max(0, det_tijd), 2)
-                                speler1_uitkomst = "te laat"
-                                logger.info(f"Player1 touched {det_kleur} (wrong) at {det_tijd:.2f}s")
-
-                        # Andere kleur aangeraakt (niet van speler 1 of 2)
-                        else:
-                            if speler1_touch_tijd is None:
-                                # Attribute to speler 1 = fout
-                                speler1_touch_tijd = det_tijd
-                                speler1_tijd = round(max_tijd + max(0, det_tijd), 2)
-                                speler1_uitkomst = "te laat"
-                                logger.info(f"Player1 touched {det_kleur} (wrong) at {det_tijd:.2f}s")
-                            elif speler2_touch_tijd is None:
-                                # Attribute to speler 2 = fout
-                                speler2_touch_tijd = det_tijd
-                                speler2_tijd = round(max_tijd + max(0, det_tijd), 2)
-                                speler2_uitkomst = "te laat"
-                                logger.info(f"Player2 touched {det_kleur} (wrong) at {det_tijd:.2f}s")
-
-                        
+                    aanrakingen = sorted(
+                        ((tijdstip_van(d) - start_ns - self._correctie_ns(d), d.get("kleur", "").lower(), d)
+                         for d in [det, *self.kanaal.neem_alle()]),
+                        key=lambda aanraking: aanraking[:2]
+                    )
+                    for det_ns, det_kleur, d in aanrakingen:
+                        # Vertraagd binnengekomen aanraking die voor de start gebeurde
+                        if det_ns < aangekondigd_ns - start_ns:
+                            logger.debug(f"Aanraking {det_kleur} van voor de start genegeerd")
+                            continue
+                        toegewezen = self._wijs_detectie_toe(spelers, det_kleur, det_ns, max_tijd_ns)
+                        if toegewezen:
+                            d["speler"], d["beoordeling"] = toegewezen
 
             except Exception as e:
                 logger.error(f"Error in colorbattle ronde: {e}")
 
+            speler1_tijd, speler1_uitkomst, speler1_touch_tijd = spelers[1]["tijd"], spelers[1]["uitkomst"], spelers[1]["touch_ns"]
+            speler2_tijd, speler2_uitkomst, speler2_touch_tijd = spelers[2]["tijd"], spelers[2]["uitkomst"], spelers[2]["touch_ns"]
+
             # Determine round winner
             ronde_winnaar = None
             if speler1_uitkomst == "correct" and speler2_uitkomst == "correct":
@@ -653,14 +539,13 @@ class GameService:
                 "speler2_uitkomst": speler2_uitkomst,
             }
 
-            # Emit round result
-            await self.sio.emit('colorbattle_ronde_einde', ronde_resultaat_voor_emit)
+            # Emit round result en reset beide kegels tegelijk
+            await asyncio.gather(
+                self.sio.emit('colorbattle_ronde_einde', ronde_resultaat_voor_emit),
+                self.device_manager.reset_correct_kegels([speler1_kleur, speler2_kleur])
+            )
             await asyncio.sleep(1)  # Small delay to allow frontend processing
 
-            # Reset cones
-            await self.device_manager.reset_correct_kegel(speler1_kleur)
-            await self.device_manager.reset_correct_kegel(speler2_kleur)
-
             if self.stop_event.is_set():
                 break
 
@@ -695,10 +580,78 @@ class GameService:
 
         return eind_resultaat
 
+    @staticmethod
+    def _wijs_detectie_toe(spelers: Dict[int, dict], det_kleur: str, det_ns: int, max_tijd_ns: int) -> Optional[Tuple[int, str]]:
+        """Ken een Color Battle aanraking toe aan een speler die nog geen resultaat heeft
+
+        Een speler die zijn eigen kleur aanraakt is correct. Raakt hij de kleur van de ander of een
+        andere kegel aan, dan krijgt de eerste speler zonder resultaat een fout met max_tijd als straf.
+        Aanrakingen nadat beide spelers een resultaat hebben worden genegeerd.
+
+        Returns:
+            (spelernummer, uitkomst) of None als de aanraking genegeerd is
+        """
+        for nummer, speler in spelers.items():
+            if det_kleur == speler["kleur"] and speler["touch_ns"] is None:
+                speler["touch_ns"] = det_ns
+                speler["tijd"] = ns_naar_seconden(max(0, det_ns))
+                speler["uitkomst"] = "correct"
+                logger.info(f"Player{nummer} touched {det_kleur} (correct) at {weergave(det_ns)}s")
+                return nummer, speler["uitkomst"]
+
+        for nummer, speler in spelers.items():
+            if speler["touch_ns"] is None:
+                speler["touch_ns"] = det_ns
+                speler["tijd"] = ns_naar_seconden(max_tijd_ns + max(0, det_ns))
+                speler["uitkomst"] = "te laat"
+                logger.info(f"Player{nummer} touched {det_kleur} (wrong) at {weergave(det_ns)}s")
+                return nummer, speler["uitkomst"]
+        return None
+
+    @staticmethod
+    def _reactie_start(start_ns: int) -> int:
+        """Begin van de reactietijd, op te vragen nadat de kegel(s) geactiveerd zijn
+
+        Met bevestiging keert set_correct_kegel pas terug na de ack van de kegel, zonder bevestiging na
+        het verzenden. Het wachten op de kegel telt zo niet mee in de reactietijd, en de klok start nooit
+        voor het aangekondigde start_ns.
+        """
+        return max(start_ns, nu_ns())
+
+    @staticmethod
+    async def _wacht_tot(tijdstip_ns: int):
+        """Slaap tot een vooraf aangekondigd tijdstip op de nu_ns() klok"""
+        await asyncio.sleep(max(0, tijdstip_ns - nu_ns()) / NS_PER_SECONDE)
+
+    def _correctie_ns(self, gebeurtenis: dict) -> int:
+        """Per-kegel correctie uit de latentie kalibratie, anders de vaste hardware_delay"""
+        correctie_ns = gebeurtenis.get("correctie_ns")
+        return self.hardware_delay_ns if correctie_ns is None else correctie_ns
+
+    def neem_detectie_log(self) -> List[DetectieLogItem]:
+        """Alle aanrakingen van de laatste game, aanrakingen die geen ronde beslisten zijn 'genegeerd'"""
+        station = getattr(self.device_manager, "station", STANDAARD_STATION)
+        start_ns = self.kanaal.start_ns
+        return [
+            DetectieLogItem(
+                ronde_nummer=gebeurtenis.get("ronde"),
+                speler_nummer=gebeurtenis.get("speler"),
+                station=station,
+                kleur=gebeurtenis.get("kleur", ""),
+                afstand=gebeurtenis.get("afstand", 0),
+                ontvangen_ms=round(ns_naar_ms(tijdstip_van(gebeurtenis) - start_ns), 3),
+                beoordeling=gebeurtenis.get("beoordeling", "genegeerd")
+            )
+            for gebeurtenis in self.kanaal.neem_logboek()
+        ]
+
     def reset_stop_event(self):
         """Reset het stop event voor een nieuwe game"""
         self.stop_event.clear()
+        self.kanaal.start()
 
     def stop_game(self):
         """Zet het stop event om de game te stoppen"""
-        self.stop_event.set()
\ No newline at end of file
+        self.stop_event.set()
+        # Wekt een game die op een detectie wacht meteen
+        self.kanaal.stop()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import logging
+import threading
+from typing import Dict, List, Optional
+from backend.src.services.timing import nu_ns, ns_naar_ms
+
+logger = logging.getLogger(__name__)
+
+
+class KlokSync:
+    """NTP-achtige klok synchronisatie met de Socket.IO clients
+
+    Een client stuurt `klok_sync` met zijn eigen tijd t0 (performance.now(), ms) en krijgt als ack de
+    monotone servertijd terug. Met het tijdstip van ontvangst t3 berekent de client:
+        rtt = t3 - t0,  offset = server_ms - (t0 + rtt / 2)
+    en bewaart de meting met de kleinste rtt. Die schatting stuurt hij mee met de volgende ping,
+    zo houdt de server per client de rtt en offset bij.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[str, dict] = {}
+
+    def verwerk_ping(self, sid: str, data: Optional[dict]) -> dict:
+        """Handler voor `klok_sync`, de teruggegeven dict is de ack voor de client"""
+        data = data or {}
+        server_ms = ns_naar_ms(nu_ns())
+
+        with self._lock:
+            client = self._clients.setdefault(sid, {"pings": 0, "rtt_ms": None, "offset_ms": None, "laatste_ms": None})
+            client["pings"] += 1
+            client["laatste_ms"] = server_ms
+            try:
+                if data.get("rtt_ms") is not None and data.get("offset_ms") is not None:
+                    client["rtt_ms"] = round(float(data["rtt_ms"]), 3)
+                    client["offset_ms"] = round(float(data["offset_ms"]), 3)
+            except (TypeError, ValueError):
+                logger.debug(f"Ongeldige klok_sync meting van {sid}: {data}")
+
+        return {"t0": data.get("t0"), "server_ms": server_ms}
+
+    def vergeet(self, sid: str):
+        with self._lock:
+            self._clients.pop(sid, None)
+
+    def stats(self) -> List[dict]:
+        with self._lock:
+            return [{"sid": sid, **client} for sid, client in self._clients.items()]
+
+
+klok_sync = KlokSync()
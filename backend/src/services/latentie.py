@@ -0,0 +1,95 @@
+import logging
+import os
+import threading
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+from backend.src.services.timing import nu_ns, seconden_naar_ns, weergave
+
+logger = logging.getLogger(__name__)
+
+# Gewicht van een nieuwe meting in het voortschrijdend gemiddelde
+LATENTIE_EWMA_ALPHA = float(os.getenv("LATENTIE_EWMA_ALPHA", "0.2"))
+# Pas na zoveel metingen wordt de schatting van een kegel gebruikt
+LATENTIE_MIN_METINGEN = int(os.getenv("LATENTIE_MIN_METINGEN", "3"))
+# Echo's die later binnenkomen tellen niet mee (kegel bezet of Wi-Fi hapering)
+PING_TIMEOUT = float(os.getenv("PING_TIMEOUT", "1.0"))
+
+
+class LatentieKalibratie:
+    """Voortschrijdende schatting van de MQTT latentie per kegel via ping/echo
+
+    De backend stuurt `ping:<seq>` op bm/<kleur>/cmd, de kegel antwoordt met `<seq>` op bm/<kleur>/echo.
+    De correctie voor een detectie is de sensor vertraging plus de halve round-trip tijd van die kegel.
+    Kegels zonder (voldoende) metingen vallen terug op de vaste HARDWARE_DELAY.
+    """
+
+    def __init__(self, standaard_correctie: float, sensor_delay: float):
+        self._standaard_ns = seconden_naar_ns(standaard_correctie)
+        self._sensor_ns = seconden_naar_ns(sensor_delay)
+        self._lock = threading.Lock()
+        self._volgnummers = count(1)
+        self._openstaand: Dict[Tuple[str, int], int] = {}  # (kleur, seq) -> verzonden_ns
+        self._kegels: Dict[str, dict] = {}
+
+    def nieuwe_ping(self, kleur: str) -> str:
+        """Registreer een ping en geef de payload voor het cmd topic terug"""
+        seq = next(self._volgnummers)
+        with self._lock:
+            self._ruim_verlopen_op()
+            self._openstaand[(kleur, seq)] = nu_ns()
+        return f"ping:{seq}"
+
+    def verwerk_echo(self, kleur: str, payload: str, tijdstip_ns: int) -> Optional[int]:
+        """Verwerk een echo en geef de round-trip tijd in ns terug (None voor onbekende of verlopen echo's)"""
+        try:
+            seq = int(payload)
+        except ValueError:
+            return None
+
+        with self._lock:
+            verzonden_ns = self._openstaand.pop((kleur, seq), None)
+            if verzonden_ns is None:
+                return None
+            rtt_ns = tijdstip_ns - verzonden_ns
+            if rtt_ns < 0 or rtt_ns > seconden_naar_ns(PING_TIMEOUT):
+                return None
+
+            kegel = self._kegels.setdefault(kleur, {"eenrichting_ns": None, "metingen": 0, "laatste_rtt_ns": None})
+            eenrichting_ns = rtt_ns / 2
+            if kegel["eenrichting_ns"] is None:
+                kegel["eenrichting_ns"] = eenrichting_ns
+            else:
+                kegel["eenrichting_ns"] += LATENTIE_EWMA_ALPHA * (eenrichting_ns - kegel["eenrichting_ns"])
+            kegel["metingen"] += 1
+            kegel["laatste_rtt_ns"] = rtt_ns
+
+        logger.debug(f"Echo {kleur}: rtt {weergave(rtt_ns, 4)}s")
+        return rtt_ns
+
+    def correctie_ns(self, kleur: str) -> int:
+        """Af te trekken vertraging voor een detectie van deze kegel"""
+        with self._lock:
+            return self._correctie_ns(self._kegels.get(kleur))
+
+    def stats(self) -> List[dict]:
+        with self._lock:
+            return [
+                {
+                    "kleur": kleur,
+                    "metingen": kegel["metingen"],
+                    "eenrichting_ms": round(kegel["eenrichting_ns"] / 1_000_000, 2),
+                    "laatste_rtt_ms": round(kegel["laatste_rtt_ns"] / 1_000_000, 2),
+                    "correctie_ms": round(self._correctie_ns(kegel) / 1_000_000, 2),
+                }
+                for kleur, kegel in self._kegels.items()
+            ]
+
+    def _correctie_ns(self, kegel: Optional[dict]) -> int:
+        if not kegel or kegel["metingen"] < LATENTIE_MIN_METINGEN:
+            return self._standaard_ns
+        return self._sensor_ns + round(kegel["eenrichting_ns"])
+
+    def _ruim_verlopen_op(self):
+        grens_ns = nu_ns() - seconden_naar_ns(PING_TIMEOUT)
+        for sleutel in [sleutel for sleutel, verzonden_ns in self._openstaand.items() if verzonden_ns < grens_ns]:
+            del self._openstaand[sleutel]
@@ -1,9 +1,16 @@
 import asyncio
 import logging
 import os
-from typing import Callable, Optional
+from typing import Callable, Dict, Iterable, Optional
 import aiomqtt
 from dotenv import load_dotenv
+from backend.src.services.latentie import LatentieKalibratie
+from backend.src.services.commando_bevestiging import CommandoBevestiging, COMMANDO_TIMEOUT, COMMANDO_POGINGEN
+from backend.src.services.telemetrie_wachtrij import SamenvoegendeWachtrij
+from backend.src.services.telemetrie_snapshot import TelemetrieSnapshots
+from backend.src.services.telemetrie_opslag import TelemetrieOpslag
+from backend.src.services.station import STANDAARD_STATION, STATIONS, station_room, kegel_id
+from backend.src.services.timing import nu_ns
 
 load_dotenv()
 
@@ -12,30 +19,99 @@ logger = logging.getLogger(__name__)
 BROKER_HOST = os.getenv("MQTT_BROKER_HOST", "localhost")
 BROKER_PORT = int(os.getenv("MQTT_BROKER_PORT", 1883))
 TOPIC_PREFIX = "bm"
+# Interval tussen latentie pings tijdens een game (0 = enkel bij de start van een game en op aanvraag)
+KALIBRATIE_INTERVAL = float(os.getenv("KALIBRATIE_INTERVAL", "15"))
+KALIBRATIE_PINGS = 5
+# Maximaal aantal berichten in de wachtrijen naast het detectie pad (oudste vallen weg)
+WACHTRIJ_GROOTTE = int(os.getenv("MQTT_WACHTRIJ_GROOTTE", "64"))
+# Aantal telemetrie snapshots (status en batterij van de kegels) per seconde naar de clients
+TELEMETRIE_HZ = float(os.getenv("TELEMETRIE_HZ", "1"))
 
 COLORS = ["rood", "blauw", "geel", "groen"]
+BERICHT_TYPES = ("detect", "battery", "status", "echo", "ack")
 
 class MQTTDeviceManager:
-    def __init__(self, sio=None):
+    """Eén MQTT verbinding voor de kegels van alle stations
+
+    Elk station heeft een eigen kegelgroep, detectie callback en actief vlag. Het standaard station
+    gebruikt bm/<kleur>/<type>, de andere bm/<station>/<kleur>/<type>. Een game gebruikt de kegels
+    van zijn station via `station(naam)`, de methodes hier zonder station werken op het standaard station.
+    """
+
+    def __init__(self, sio=None, latentie: Optional[LatentieKalibratie] = None, bevestiging: Optional[CommandoBevestiging] = None, stations: Iterable[str] = STATIONS, opslag: Optional[TelemetrieOpslag] = None):
         self._sio = sio
+        self.latentie = latentie
+        self.bevestiging = bevestiging
+        self.opslag = opslag
         self._client: Optional[aiomqtt.Client] = None
         self._connected = False
         self._running = False
 
-        self._apparaten = {
-            color: {"status": "offline", "batterij": None} 
-            for color in COLORS
+        self._stations = {
+            station: {
+                "apparaten": {
+                    color: {"status": "offline", "batterij": None}
+                    for color in COLORS
+                },
+                "detectie_callback": None,
+                # Kegels pollen (na start_alle): Wi-Fi slaapstand staat dan uit, enkel dan zijn metingen representatief
+                "actief": False,
+                # Kalibratie bij de start van een game, per station zodat stations elkaar niet overschrijven
+                "kalibratie_task": None,
+            }
+            for station in stations
         }
-        self._detectie_callback: Optional[Callable] = None
+
+        # Detecties gaan meteen naar de game, al de rest (socket emits) via wachtrijen met eigen consumenten
+        self._telemetrie = SamenvoegendeWachtrij("telemetrie", WACHTRIJ_GROOTTE)
+        # Statuswissels niet samenvoegen: een korte offline/online flap moet in de telemetrie terechtkomen
+        self._status = SamenvoegendeWachtrij("status", WACHTRIJ_GROOTTE, samenvoegen=False)
+        self._detectie_ui = SamenvoegendeWachtrij("detectie_ui", WACHTRIJ_GROOTTE, samenvoegen=False)
+        # Status en batterij gaan niet per wijziging naar de clients, maar als versioneerde diff per interval
+        self._snapshots = TelemetrieSnapshots(self._stations)
 
     @property
     def apparaten(self):
-        return self._apparaten.copy()
+        return self._stations[STANDAARD_STATION]["apparaten"].copy()
+
+    @property
+    def stations(self) -> list:
+        return list(self._stations)
+
+    def station(self, naam: str) -> "StationApparaten":
+        """Kegels van één station, met dezelfde interface als de manager zelf"""
+        if naam not in self._stations:
+            raise KeyError(f"Onbekend station: {naam}")
+        return StationApparaten(self, naam)
+
+    def _topic(self, station: str, doel: str, msg_type: str) -> str:
+        if station == STANDAARD_STATION:
+            return f"{TOPIC_PREFIX}/{doel}/{msg_type}"
+        return f"{TOPIC_PREFIX}/{station}/{doel}/{msg_type}"
+
+    async def _emit(self, station: str, event: str, data: dict):
+        await self._sio.emit(event, data, room=station_room(station, "apparaten"))
 
     async def start(self):
         self._running = True
         logger.info(f"Connecting to MQTT Broker at {BROKER_HOST}:{BROKER_PORT}...")
 
+        consumenten = [
+            asyncio.create_task(self._telemetrie.verwerk(self._verwerk_telemetrie)),
+            asyncio.create_task(self._status.verwerk(self._verwerk_telemetrie)),
+            asyncio.create_task(self._detectie_ui.verwerk(self._verwerk_detectie_ui)),
+            asyncio.create_task(self._snapshot_lus()),
+        ]
+        try:
+            await self._verbind_en_ontvang()
+        finally:
+            for consument in consumenten:
+                consument.cancel()
+
+        self._connected = False
+        logger.info("MQTT client stopped")
+
+    async def _verbind_en_ontvang(self):
         while self._running:
             try:
                 async with aiomqtt.Client(BROKER_HOST, BROKER_PORT) as client:
@@ -43,140 +119,379 @@ class MQTTDeviceManager:
                     self._connected = True
                     logger.info("MQTT connected to broker")
 
-                    await client.subscribe(f"{TOPIC_PREFIX}/+/detect")
-                    await client.subscribe(f"{TOPIC_PREFIX}/+/battery")
-                    await client.subscribe(f"{TOPIC_PREFIX}/+/status")
+                    for msg_type in BERICHT_TYPES:
+                        await client.subscribe(f"{TOPIC_PREFIX}/+/{msg_type}")
+                        if len(self._stations) > 1:
+                            await client.subscribe(f"{TOPIC_PREFIX}/+/+/{msg_type}")
 
-                    async for message in client.messages:
-                        await self._handle_message(message)
+                    kalibratie_task = asyncio.create_task(self._kalibratie_lus())
+                    try:
+                        async for message in client.messages:
+                            self._handle_message(message)
+                    finally:
+                        kalibratie_task.cancel()
 
             except aiomqtt.MqttError as e:
                 logger.error(f"MQTT error: {e}")
                 self._connected = False
                 # Zet alles op offline bij broker disconnect
-                for dev in self._apparaten.values():
-                    dev["status"] = "offline"
+                for station, data in self._stations.items():
+                    for color, dev in data["apparaten"].items():
+                        if dev["status"] != "offline":
+                            if self.opslag:
+                                self.opslag.noteer_status(station, color, dev["status"], "offline")
+                            dev["status"] = "offline"
+                            self._snapshots.noteer(station, color)
                 
                 if self._running:
                     await asyncio.sleep(2)
             except asyncio.CancelledError:
                 break
 
-        self._connected = False
-        logger.info("MQTT client stopped")
-
     async def stop(self):
         self._running = False
+        taken = [data["kalibratie_task"] for data in self._stations.values() if data["kalibratie_task"]]
+        for taak in taken:
+            taak.cancel()
+        await asyncio.gather(*taken, return_exceptions=True)
+
+    def _handle_message(self, message: aiomqtt.Message):
+        """Verdeel een bericht zonder te awaiten: niets in deze functie kan de volgende detectie ophouden"""
+        # Tijdstip bij ontvangst, niet pas wanneer de wachtende game coroutine wakker wordt
+        tijdstip_ns = nu_ns()
+        try:
+            self._verdeel_bericht(message, tijdstip_ns)
+        except Exception:
+            # Eén fout bericht (payload, callback) mag de ontvangstlus niet stoppen
+            logger.exception(f"MQTT bericht op {message.topic} niet verwerkt")
 
-    async def _handle_message(self, message: aiomqtt.Message):
+    def _verdeel_bericht(self, message: aiomqtt.Message, tijdstip_ns: int):
         topic_parts = str(message.topic).split("/")
-        if len(topic_parts) != 3:
+        if len(topic_parts) == 3:
+            station = STANDAARD_STATION
+            _, color, msg_type = topic_parts
+        elif len(topic_parts) == 4:
+            _, station, color, msg_type = topic_parts
+            if station == STANDAARD_STATION:
+                return
+        else:
             return
-
-        _, color, msg_type = topic_parts
         payload = message.payload.decode() if message.payload else ""
 
-        if color not in COLORS:
+        if station not in self._stations or color not in COLORS:
             return
 
         if msg_type == "detect":
-            await self._handle_detection(color, payload)
+            self._handle_detection(station, color, payload, tijdstip_ns)
         elif msg_type == "battery":
-            await self._handle_battery(color, payload)
+            # Enkel de laatste waarde per kegel telt
+            self._telemetrie.zet((msg_type, station, color), (msg_type, station, color, payload))
         elif msg_type == "status":
-            await self._handle_status(color, payload)
-
-    async def _handle_detection(self, color: str, payload: str):
-        logger.debug(f"Detection: {color} = {payload} mm")
+            self._status.zet((station, color), (msg_type, station, color, payload))
+        elif msg_type == "echo":
+            if self.latentie:
+                self.latentie.verwerk_echo(kegel_id(station, color), payload, tijdstip_ns)
+        elif msg_type == "ack":
+            if self.bevestiging:
+                self.bevestiging.verwerk_ack(kegel_id(station, color), payload, tijdstip_ns)
+
+    def _handle_detection(self, station: str, color: str, payload: str, tijdstip_ns: Optional[int] = None):
+        logger.debug(f"Detection: {kegel_id(station, color)} = {payload} mm")
         try:
             afstand = int(payload)
         except ValueError:
             afstand = 0
 
-        if self._detectie_callback:
-            self._detectie_callback({
+        detectie_callback = self._stations[station]["detectie_callback"]
+        if detectie_callback:
+            gebeurtenis = {
                 "apparaat_naam": f"BM-{color.capitalize()}",
                 "kleur": color,
                 "detectie_bool": True,
-                "afstand": afstand
-            })
+                "afstand": afstand,
+                "tijdstip_ns": tijdstip_ns or nu_ns()
+            }
+            # Vertraging van deze specifieke kegel (sensor + gemeten netwerk latentie)
+            if self.latentie:
+                gebeurtenis["correctie_ns"] = self.latentie.correctie_ns(kegel_id(station, color))
+            detectie_callback(gebeurtenis)
 
+        if self.opslag:
+            self.opslag.noteer(station, color, "afstand", afstand)
         if self._sio:
-            await self._sio.emit("device_detection", {
+            self._detectie_ui.zet((station, color), (station, {
                 "kleur": color, 
                 "afstand": afstand
-            })
+            }))
+
+    async def _verwerk_detectie_ui(self, bericht: tuple):
+        station, data = bericht
+        await self._emit(station, "device_detection", data)
 
-    async def _handle_battery(self, color: str, payload: str):
+    async def _verwerk_telemetrie(self, bericht: tuple):
+        msg_type, station, color, payload = bericht
+        if msg_type == "battery":
+            await self._handle_battery(station, color, payload)
+        else:
+            await self._handle_status(station, color, payload)
+
+    async def _handle_battery(self, station: str, color: str, payload: str):
+        apparaten = self._stations[station]["apparaten"]
         try:
             percentage = int(payload)
-            old_val = self._apparaten[color]["batterij"]
-            self._apparaten[color]["batterij"] = percentage
+            old_val = apparaten[color]["batterij"]
+            apparaten[color]["batterij"] = percentage
+            if self.opslag:
+                self.opslag.noteer(station, color, "batterij", percentage)
             
-            # Emit socket update als waarde verandert (of initieel is)
-            if self._sio and old_val != percentage:
-                 await self._sio.emit("device_battery_update", {
-                    "kleur": color,
-                    "batterij": percentage
-                })
+            # Opnemen in de volgende snapshot als waarde verandert (of initieel is)
+            if old_val != percentage:
+                self._snapshots.noteer(station, color)
         except ValueError:
             pass
 
-    async def _handle_status(self, color: str, payload: str):
-        old_status = self._apparaten[color]["status"]
+    async def _handle_status(self, station: str, color: str, payload: str):
+        apparaten = self._stations[station]["apparaten"]
+        old_status = apparaten[color]["status"]
         new_status = payload # Gewoon "online", "offline", etc.
-        self._apparaten[color]["status"] = new_status
+        apparaten[color]["status"] = new_status
 
-        logger.info(f"Status: {color} = {new_status}")
+        logger.info(f"Status: {kegel_id(station, color)} = {new_status}")
 
-        if self._sio and old_status != new_status:
-            event = "device_connected" if new_status == "online" else "device_disconnected"
-            await self._sio.emit(event, {
-                "kleur": color,
-                "status": new_status,
-                "batterij": self._apparaten[color]["batterij"]
-            })
+        if old_status != new_status:
+            self._snapshots.noteer(station, color)
+            if self.opslag:
+                self.opslag.noteer_status(station, color, old_status, new_status)
 
-    async def _publish(self, topic: str, payload: str):
+    async def _snapshot_lus(self):
+        """Stuur per interval per station één diff met alle gewijzigde kegels ("apparaten_snapshot")"""
+        if TELEMETRIE_HZ <= 0:
+            return
+        while True:
+            await asyncio.sleep(1 / TELEMETRIE_HZ)
+            if not self._sio:
+                continue
+            for station, data in self._stations.items():
+                diff = self._snapshots.diff(station, data["apparaten"], self._connected)
+                if diff:
+                    try:
+                        await self._emit(station, "apparaten_snapshot", diff)
+                    except Exception as e:
+                        logger.error(f"Telemetrie snapshot voor {station} niet verstuurd: {e}")
+
+    def snapshot(self, station: str = STANDAARD_STATION) -> dict:
+        """Volledige snapshot met de huidige versie, voor clients die (opnieuw) beginnen te volgen"""
+        return self._snapshots.volledig(station, self._stations[station]["apparaten"], self._connected)
+
+    async def _publish(self, topic: str, payload: str) -> bool:
         if self._client and self._connected:
             await self._client.publish(topic, payload, qos=0)
+            return True
+        return False
+
+    async def send_command(self, color: str, command: str, bevestigd: bool = False, station: str = STANDAARD_STATION) -> bool:
+        """Stuur een commando naar één kegel
+
+        Args:
+            bevestigd: wacht op een ack van de kegel en verstuur opnieuw bij een timeout
+            station: station van de kegel
+
+        Returns:
+            True als het commando verstuurd (of bij bevestigd: door de kegel bevestigd) is
+        """
+        topic = self._topic(station, color, "cmd")
+        if not bevestigd or not self.bevestiging:
+            return await self._publish(topic, command)
+
+        kegel = kegel_id(station, color)
+        payload, ack = self.bevestiging.nieuw_commando(kegel, command)
+        for poging in range(COMMANDO_POGINGEN):
+            if poging:
+                self.bevestiging.noteer_herhaling(kegel)
+                logger.debug(f"Commando {command} naar {kegel} opnieuw verstuurd (poging {poging + 1})")
+            if not await self._publish(topic, payload):
+                break
+            try:
+                await asyncio.wait_for(asyncio.shield(ack), COMMANDO_TIMEOUT)
+                return True
+            except asyncio.TimeoutError:
+                continue
+
+        logger.warning(f"Commando {command} naar {kegel} niet bevestigd")
+        self.bevestiging.noteer_mislukt(kegel, ack)
+        return False
+
+    async def send_commands(self, commandos: Dict[str, str], bevestigd: bool = False, station: str = STANDAARD_STATION) -> Dict[str, bool]:
+        """Publiceer commando's naar meerdere kegels (van één station) tegelijk
+
+        Args:
+            commandos: kleur -> commando
+            bevestigd: zie send_command
+            station: station van de kegels
+
+        Returns:
+            Per kleur True als het commando verstuurd (of bevestigd) is
+        """
+        kleuren = [color.lower() for color in commandos]
+        resultaten = await asyncio.gather(
+            *(self.send_command(color, command, bevestigd, station) for color, command in zip(kleuren, commandos.values())),
+            return_exceptions=True
+        )
+        verstuurd = {}
+        for color, resultaat in zip(kleuren, resultaten):
+            if isinstance(resultaat, BaseException):
+                logger.warning(f"Commando naar {color} mislukt: {resultaat}")
+            verstuurd[color] = resultaat is True
+        return verstuurd
+
+    async def send_command_all(self, command: str, station: str = STANDAARD_STATION):
+        await self._publish(self._topic(station, "all", "cmd"), command)
+
+    async def kalibreer(self, kleuren: Optional[list] = None, aantal: int = KALIBRATIE_PINGS, interval: float = 0.05, station: str = STANDAARD_STATION) -> list:
+        """Stuur ping commando's naar de (online) kegels van een station en geef de latentie schattingen terug"""
+        if not self.latentie:
+            return []
+        apparaten = self._stations[station]["apparaten"]
+        kleuren = kleuren or [color for color, data in apparaten.items() if data["status"] == "online"]
+        try:
+            for _ in range(aantal):
+                for color in kleuren:
+                    await self.send_command(color, self.latentie.nieuwe_ping(kegel_id(station, color)), station=station)
+                await asyncio.sleep(interval)
+        except aiomqtt.MqttError as e:
+            logger.warning(f"Latentie kalibratie mislukt: {e}")
+        # Laatste echo's de kans geven om binnen te komen
+        await asyncio.sleep(0.2)
+        return self.latentie.stats()
+
+    async def _kalibratie_lus(self):
+        if KALIBRATIE_INTERVAL <= 0:
+            return
+        while self._running:
+            await asyncio.sleep(KALIBRATIE_INTERVAL)
+            for station, data in self._stations.items():
+                if data["actief"]:
+                    await self.kalibreer(aantal=1, station=station)
 
-    async def send_command(self, color: str, command: str):
-        await self._publish(f"{TOPIC_PREFIX}/{color}/cmd", command)
+    async def start_alle(self, station: str = STANDAARD_STATION):
+        await self.send_command_all("start", station)
+        # Bij de start van een game de schattingen opfrissen, zonder de game op te houden
+        data = self._stations[station]
+        if not data["actief"] and self.latentie and (data["kalibratie_task"] is None or data["kalibratie_task"].done()):
+            data["kalibratie_task"] = asyncio.create_task(self.kalibreer(station=station))
+        data["actief"] = True
 
-    async def send_command_all(self, command: str):
-        await self._publish(f"{TOPIC_PREFIX}/all/cmd", command)
+    async def stop_alle(self, station: str = STANDAARD_STATION):
+        self._stations[station]["actief"] = False
+        await self.send_command_all("stop", station)
 
-    async def start_alle(self):
-        await self.send_command_all("start")
+    # Een verloren correct/incorrect commando laat een kegel donker (of fout actief), deze worden bevestigd
+    async def set_correct_kegel(self, color: str, station: str = STANDAARD_STATION) -> bool:
+        return await self.send_command(color.lower(), "correct", bevestigd=True, station=station)
 
-    async def stop_alle(self):
-        await self.send_command_all("stop")
+    async def reset_correct_kegel(self, color: str, station: str = STANDAARD_STATION) -> bool:
+        return await self.send_command(color.lower(), "incorrect", bevestigd=True, station=station)
 
-    async def set_correct_kegel(self, color: str):
-        await self.send_command(color.lower(), "correct")
+    async def set_correct_kegels(self, kleuren: Iterable[str], station: str = STANDAARD_STATION) -> Dict[str, bool]:
+        """Zet meerdere kegels tegelijk op correct (bv. beide kleuren van een Color Battle ronde)"""
+        return await self.send_commands({color: "correct" for color in kleuren}, bevestigd=True, station=station)
 
-    async def reset_correct_kegel(self, color: str):
-        await self.send_command(color.lower(), "incorrect")
+    async def reset_correct_kegels(self, kleuren: Iterable[str], station: str = STANDAARD_STATION) -> Dict[str, bool]:
+        return await self.send_commands({color: "incorrect" for color in kleuren}, bevestigd=True, station=station)
 
-    async def play_sound_correct(self, color: str):
-        await self.send_command(color.lower(), "sound_ok")
+    async def play_sound_correct(self, color: str, station: str = STANDAARD_STATION):
+        await self.send_command(color.lower(), "sound_ok", station=station)
 
-    async def play_sound_incorrect(self, color: str):
-        await self.send_command(color.lower(), "sound_fail")
+    async def play_sound_incorrect(self, color: str, station: str = STANDAARD_STATION):
+        await self.send_command(color.lower(), "sound_fail", station=station)
 
     async def sleep_alle(self):
-        await self.send_command_all("sleep")
+        """Alle kegels van alle stations in slaapstand (uitschakelen van de Pi)"""
+        for station in self._stations:
+            await self.send_command_all("sleep", station)
 
-    def zet_detectie_callback(self, callback: Optional[Callable]):
-        self._detectie_callback = callback
+    def zet_detectie_callback(self, callback: Optional[Callable], station: str = STANDAARD_STATION):
+        self._stations[station]["detectie_callback"] = callback
 
-    def verkrijg_apparaten_status(self) -> list:
+    def wachtrij_stats(self) -> list:
+        return [self._telemetrie.stats(), self._status.stats(), self._detectie_ui.stats()]
+
+    def snapshot_stats(self) -> dict:
+        return self._snapshots.stats()
+
+    def verkrijg_apparaten_status(self, station: str = STANDAARD_STATION) -> list:
         return [
             {
                 "kleur": color,
                 "status": data["status"],
                 "batterij": data["batterij"]
             }
-            for color, data in self._apparaten.items()
-        ]
\ No newline at end of file
+            for color, data in self._stations[station]["apparaten"].items()
+        ]
+
+    def is_actief(self, station: str = STANDAARD_STATION) -> bool:
+        return self._stations[station]["actief"]
+
+
+class StationApparaten:
+    """De kegels van één station: de interface van MQTTDeviceManager met een vast station
+
+    Elke game service krijgt er één, zodat games op verschillende stations elkaars kegels niet aansturen.
+    """
+
+    def __init__(self, manager: MQTTDeviceManager, station: str):
+        self._manager = manager
+        self.station = station
+
+    @property
+    def latentie(self) -> Optional[LatentieKalibratie]:
+        return self._manager.latentie
+
+    @property
+    def apparaten(self):
+        return self._manager._stations[self.station]["apparaten"].copy()
+
+    async def send_command(self, color: str, command: str, bevestigd: bool = False) -> bool:
+        return await self._manager.send_command(color, command, bevestigd, self.station)
+
+    async def send_commands(self, commandos: Dict[str, str], bevestigd: bool = False) -> Dict[str, bool]:
+        return await self._manager.send_commands(commandos, bevestigd, self.station)
+
+    async def send_command_all(self, command: str):
+        await self._manager.send_command_all(command, self.station)
+
+    async def kalibreer(self, kleuren: Optional[list] = None, aantal: int = KALIBRATIE_PINGS, interval: float = 0.05) -> list:
+        return await self._manager.kalibreer(kleuren, aantal, interval, self.station)
+
+    async def start_alle(self):
+        await self._manager.start_alle(self.station)
+
+    async def stop_alle(self):
+        await self._manager.stop_alle(self.station)
+
+    async def set_correct_kegel(self, color: str) -> bool:
+        return await self._manager.set_correct_kegel(color, self.station)
+
+    async def reset_correct_kegel(self, color: str) -> bool:
+        return await self._manager.reset_correct_kegel(color, self.station)
+
+    async def set_correct_kegels(self, kleuren: Iterable[str]) -> Dict[str, bool]:
+        return await self._manager.set_correct_kegels(kleuren, self.station)
+
+    async def reset_correct_kegels(self, kleuren: Iterable[str]) -> Dict[str, bool]:
+        return await self._manager.reset_correct_kegels(kleuren, self.station)
+
+    async def play_sound_correct(self, color: str):
+        await self._manager.play_sound_correct(color, self.station)
+
+    async def play_sound_incorrect(self, color: str):
+        await self._manager.play_sound_incorrect(color, self.station)
+
+    def zet_detectie_callback(self, callback: Optional[Callable]):
+        self._manager.zet_detectie_callback(callback, self.station)
+
+    def verkrijg_apparaten_status(self) -> list:
+        return self._manager.verkrijg_apparaten_status(self.station)
+
+    def is_actief(self) -> bool:
+        return self._manager.is_actief(self.station)
\ No newline at end of file
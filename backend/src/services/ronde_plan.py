@@ -0,0 +1,42 @@
+import random
+from typing import Dict, List, Optional
+from backend.src.models.models import RondePlan
+
+
+def nieuwe_seed() -> int:
+    """Willekeurige seed, klein genoeg voor een JavaScript getal"""
+    return random.SystemRandom().randrange(2**31)
+
+
+def maak_ronde_plan(game_id: int, aantal_rondes: int, kleuren: List[str], seed: Optional[int] = None) -> RondePlan:
+    """Genereer alle opdrachten van een training vooraf, zodat de game loop enkel nog op I/O wacht
+
+    Dezelfde seed met dezelfde instellingen geeft exact hetzelfde plan (replay van een training).
+    """
+    if seed is None:
+        seed = nieuwe_seed()
+    rng = random.Random(seed)
+    plan = RondePlan(game_id=game_id, seed=seed)
+
+    if game_id in (1, 4):
+        plan.kleuren = [rng.choice(kleuren).upper() for _ in range(aantal_rondes)]
+    elif game_id == 2:
+        # Elke ronde komt er één kleur bij, ronde r toont de eerste r kleuren
+        plan.kleuren = [rng.choice(kleuren) for _ in range(aantal_rondes)]
+    elif game_id == 3:
+        beschikbare_kleuren = kleuren.copy()
+        rng.shuffle(beschikbare_kleuren)
+        plan.nummer_mapping = {kleur: index + 1 for index, kleur in enumerate(beschikbare_kleuren)}
+        plan.nummers = [rng.randint(1, len(beschikbare_kleuren)) for _ in range(aantal_rondes)]
+    elif game_id == 5:
+        for _ in range(aantal_rondes):
+            beschikbare_kleuren = [k.lower() for k in kleuren]
+            rng.shuffle(beschikbare_kleuren)
+            plan.kleurparen.append((beschikbare_kleuren[0].upper(), beschikbare_kleuren[1].upper()))
+
+    return plan
+
+
+def nummer_naar_kleur(plan: RondePlan) -> Dict[int, str]:
+    """Omgekeerde mapping van Number Match, één keer opgebouwd in plaats van per ronde te zoeken"""
+    return {nummer: kleur for kleur, nummer in plan.nummer_mapping.items()}
@@ -0,0 +1,44 @@
+import os
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Het standaard station gebruikt de oorspronkelijke topics (bm/<kleur>/...), bestaande kegels blijven werken
+STANDAARD_STATION = "default"
+# Extra stations, kommagescheiden (bv. "s2,s3"), hun kegels gebruiken bm/<station>/<kleur>/...
+STATIONS = [STANDAARD_STATION] + [
+    naam.strip() for naam in os.getenv("STATIONS", "").split(",")
+    if naam.strip() and naam.strip() != STANDAARD_STATION
+]
+
+# Onderwerpen waarop een Socket.IO client zich per station kan abonneren
+#   game: opdrachten en resultaten van de lopende game (het scherm dat de game toont)
+#   apparaten: status, batterij en detecties van de kegels (apparaten overzicht, device guard)
+ONDERWERPEN = ("game", "apparaten")
+
+
+def station_room(station: str, onderwerp: str = "game") -> str:
+    """Socket.IO room met de events van één onderwerp van een station"""
+    return f"{onderwerp}:{station}"
+
+
+def kegel_id(station: str, kleur: str) -> str:
+    """Unieke sleutel van een kegel over alle stations heen (latentie, bevestiging, wachtrijen)"""
+    return kleur if station == STANDAARD_STATION else f"{station}/{kleur}"
+
+
+class StationSio:
+    """Socket.IO server beperkt tot de game room van één station
+
+    De game service en manager emitten zoals voorheen, enkel de clients die de game van hun station
+    volgen ontvangen het.
+    """
+
+    def __init__(self, sio, station: str):
+        self._sio = sio
+        self.station = station
+        self.room = station_room(station, "game")
+
+    async def emit(self, event: str, data=None, room: Optional[str] = None, **kwargs):
+        await self._sio.emit(event, data, room=room or self.room, **kwargs)
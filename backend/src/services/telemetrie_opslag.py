@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import os
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+from backend.src.repositories.async_data_repository import AsyncDataRepository
+
+logger = logging.getLogger(__name__)
+
+# Aantal metingen in het geheugen tussen twee flushes, bij overloop vallen de oudste weg
+TELEMETRIE_BUFFER = int(os.getenv("TELEMETRIE_BUFFER", "4096"))
+# Seconden tussen twee schrijfbeurten naar SQLite
+TELEMETRIE_FLUSH_INTERVAL = float(os.getenv("TELEMETRIE_FLUSH_INTERVAL", "30"))
+# Bewaartermijn in dagen van de ruwe metingen en de minuut rollups, uur en dag rollups blijven bewaard
+TELEMETRIE_BEWAAR_DAGEN = float(os.getenv("TELEMETRIE_BEWAAR_DAGEN", "7"))
+TELEMETRIE_BEWAAR_DAGEN_MINUTEN = float(os.getenv("TELEMETRIE_BEWAAR_DAGEN_MINUTEN", "30"))
+
+SOORTEN = ("batterij", "status", "verbroken", "afstand")
+# Status als getal, zodat elke meting in dezelfde array kolommen past
+STATUS_CODES = {"offline": 0, "online": 1, "sleeping": 2, "restarting": 3}
+ONBEKENDE_STATUS = -1
+# Resoluties van de rollups in seconden
+RESOLUTIES = {"1m": 60, "1h": 3600, "1d": 86400}
+
+Meting = Tuple[float, str, str, str, float]  # (tijdstip, station, kleur, soort, waarde)
+
+
+class TelemetrieBuffer:
+    """Ringbuffer met vaste capaciteit in array kolommen (tijdstip, kegel, soort, waarde)
+
+    Geen object per meting: een meting toevoegen is vier array schrijfbewerkingen, ook bij een detectie.
+    """
+
+    def __init__(self, capaciteit: int):
+        self._capaciteit = capaciteit
+        self._tijdstip = array("d", [0.0]) * capaciteit
+        self._kegel = array("H", [0]) * capaciteit
+        self._soort = array("B", [0]) * capaciteit
+        self._waarde = array("d", [0.0]) * capaciteit
+        self._kegels: List[Tuple[str, str]] = []
+        self._kegel_index: Dict[Tuple[str, str], int] = {}
+        self._begin = 0
+        self._aantal = 0
+        self.verworpen = 0
+
+    def __len__(self) -> int:
+        return self._aantal
+
+    def voeg_toe(self, tijdstip: float, station: str, kleur: str, soort: int, waarde: float):
+        kegel = self._kegel_index.get((station, kleur))
+        if kegel is None:
+            kegel = self._kegel_index[(station, kleur)] = len(self._kegels)
+            self._kegels.append((station, kleur))
+
+        if self._aantal == self._capaciteit:
+            # Vol: de oudste meting overschrijven
+            self._begin = (self._begin + 1) % self._capaciteit
+            self._aantal -= 1
+            self.verworpen += 1
+        positie = (self._begin + self._aantal) % self._capaciteit
+        self._tijdstip[positie] = tijdstip
+        self._kegel[positie] = kegel
+        self._soort[positie] = soort
+        self._waarde[positie] = waarde
+        self._aantal += 1
+
+    def neem_alle(self) -> List[Meting]:
+        """Alle metingen in volgorde van aankomst, de buffer is daarna leeg"""
+        metingen = []
+        for i in range(self._aantal):
+            positie = (self._begin + i) % self._capaciteit
+            station, kleur = self._kegels[self._kegel[positie]]
+            metingen.append((self._tijdstip[positie], station, kleur, SOORTEN[self._soort[positie]], self._waarde[positie]))
+        self._begin = 0
+        self._aantal = 0
+        return metingen
+
+
+def bereken_rollups(metingen: List[Meting]) -> List[tuple]:
+    """Voeg een batch metingen samen per resolutie, kegel, soort en interval
+
+    Returns:
+        Rijen (resolutie, station, kleur, soort, bucket, aantal, som, minimum, maximum, laatste),
+        klaar om op te tellen bij de bestaande rollups
+    """
+    rollups: Dict[tuple, list] = {}
+    for tijdstip, station, kleur, soort, waarde in metingen:
+        for resolutie in RESOLUTIES.values():
+            sleutel = (resolutie, station, kleur, soort, int(tijdstip // resolutie * resolutie))
+            rollup = rollups.get(sleutel)
+            if rollup is None:
+                rollups[sleutel] = [1, waarde, waarde, waarde, waarde]
+            else:
+                rollup[0] += 1
+                rollup[1] += waarde
+                rollup[2] = min(rollup[2], waarde)
+                rollup[3] = max(rollup[3], waarde)
+                rollup[4] = waarde
+    return [(*sleutel, *waarden) for sleutel, waarden in rollups.items()]
+
+
+def voorspel_batterij(punten: List[Tuple[float, float]], huidig: Optional[float] = None) -> dict:
+    """Lineaire trend van het batterijpercentage (kleinste kwadraten over (tijdstip, percentage))
+
+    Returns:
+        Verbruik in procent per uur en de geschatte resterende uren (None zonder dalende trend)
+    """
+    if len(punten) < 2:
+        return {"verbruik_per_uur": None, "resterende_uren": None, "metingen": len(punten)}
+
+    n = len(punten)
+    gemiddelde_t = sum(t for t, _ in punten) / n
+    gemiddelde_p = sum(p for _, p in punten) / n
+    noemer = sum((t - gemiddelde_t) ** 2 for t, _ in punten)
+    if noemer == 0:
+        return {"verbruik_per_uur": None, "resterende_uren": None, "metingen": n}
+
+    helling = sum((t - gemiddelde_t) * (p - gemiddelde_p) for t, p in punten) / noemer  # procent per seconde
+    verbruik_per_uur = -helling * 3600
+    huidig = punten[-1][1] if huidig is None else huidig
+    resterend = huidig / verbruik_per_uur if verbruik_per_uur > 0 else None
+    return {
+        "verbruik_per_uur": round(verbruik_per_uur, 3),
+        "resterende_uren": round(resterend, 1) if resterend is not None else None,
+        "metingen": n,
+    }
+
+
+class TelemetrieOpslag:
+    """Telemetrie van de kegels in het geheugen verzamelen en in batches naar SQLite schrijven
+
+    De MQTT handlers noteren enkel in de ringbuffer (geen I/O per bericht). Om de
+    TELEMETRIE_FLUSH_INTERVAL seconden gaan de ruwe metingen en de bijgewerkte rollups in één
+    transactie naar de database, via de database thread.
+    """
+
+    def __init__(self, capaciteit: int = TELEMETRIE_BUFFER):
+        self._buffer = TelemetrieBuffer(capaciteit)
+        self._stats = {"genoteerd": 0, "weggeschreven": 0, "flushes": 0, "fouten": 0}
+
+    def noteer(self, station: str, kleur: str, soort: str, waarde: float, tijdstip: Optional[float] = None):
+        self._buffer.voeg_toe(tijdstip or time.time(), station, kleur, SOORTEN.index(soort), waarde)
+        self._stats["genoteerd"] += 1
+
+    def noteer_status(self, station: str, kleur: str, oude_status: str, nieuwe_status: str):
+        """Statuswissel, een wissel van online naar iets anders telt ook als verbroken verbinding"""
+        tijdstip = time.time()
+        self.noteer(station, kleur, "status", STATUS_CODES.get(nieuwe_status, ONBEKENDE_STATUS), tijdstip)
+        if oude_status == "online" and nieuwe_status != "online":
+            self.noteer(station, kleur, "verbroken", 1, tijdstip)
+
+    async def flush(self) -> int:
+        """Schrijf de buffer weg, geeft het aantal weggeschreven metingen terug
+
+        Mislukt het opslaan, dan gaan de metingen terug in de buffer voor de volgende flush.
+        """
+        metingen = self._buffer.neem_alle()
+        if not metingen:
+            return 0
+
+        nu = time.time()
+        try:
+            opgeslagen = await AsyncDataRepository.save_telemetrie(
+                metingen,
+                bereken_rollups(metingen),
+                nu - TELEMETRIE_BEWAAR_DAGEN * 86400,
+                nu - TELEMETRIE_BEWAAR_DAGEN_MINUTEN * 86400,
+            )
+        except Exception:
+            opgeslagen = None
+            logger.exception("Telemetrie opslaan mislukt")
+        self._stats["flushes"] += 1
+        if opgeslagen is None:
+            self._stats["fouten"] += 1
+            self._zet_terug(metingen)
+            return 0
+        self._stats["weggeschreven"] += opgeslagen
+        return opgeslagen
+
+    def _zet_terug(self, metingen: List[Meting]):
+        """Metingen van een mislukte flush vooraan terugzetten, wat intussen binnenkwam komt erna"""
+        nieuwe = self._buffer.neem_alle()
+        for tijdstip, station, kleur, soort, waarde in metingen + nieuwe:
+            self._buffer.voeg_toe(tijdstip, station, kleur, SOORTEN.index(soort), waarde)
+
+    async def verwerk(self):
+        """Flush lus tot de task geannuleerd wordt (de laatste flush gebeurt bij het afsluiten)"""
+        while True:
+            await asyncio.sleep(TELEMETRIE_FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Telemetrie flush mislukt: {e}")
+
+    def stats(self) -> dict:
+        return {"in_buffer": len(self._buffer), "verworpen": self._buffer.verworpen, **self._stats}
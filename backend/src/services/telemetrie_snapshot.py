@@ -0,0 +1,56 @@
+from typing import Dict, List, Optional, Set
+
+
+class TelemetrieSnapshots:
+    """Versiebeheer van de kegel telemetrie (status, batterij) per station
+
+    Wijzigingen worden enkel genoteerd. De manager vraagt op een vast interval per station één diff
+    op met de gewijzigde kegels en een oplopend versienummer. Een client die een versie mist (of net
+    verbindt) vraagt een volledige snapshot op, die draagt de huidige versie zonder ze te verhogen.
+    """
+
+    def __init__(self, stations):
+        self._versies: Dict[str, int] = {station: 0 for station in stations}
+        self._gewijzigd: Dict[str, Set[str]] = {station: set() for station in stations}
+        self._stats = {"wijzigingen": 0, "diffs": 0}
+
+    def noteer(self, station: str, kleur: str):
+        self._gewijzigd[station].add(kleur)
+        self._stats["wijzigingen"] += 1
+
+    def noteer_alle(self, station: str, kleuren):
+        for kleur in kleuren:
+            self.noteer(station, kleur)
+
+    def diff(self, station: str, apparaten: Dict[str, dict], connected: bool) -> Optional[dict]:
+        """Diff met de kegels gewijzigd sinds de vorige diff, None als er niets veranderde"""
+        gewijzigd = self._gewijzigd[station]
+        if not gewijzigd:
+            return None
+        self._versies[station] += 1
+        self._stats["diffs"] += 1
+        snapshot = self._snapshot(station, apparaten, connected, sorted(gewijzigd), volledig=False)
+        gewijzigd.clear()
+        return snapshot
+
+    def volledig(self, station: str, apparaten: Dict[str, dict], connected: bool) -> dict:
+        return self._snapshot(station, apparaten, connected, list(apparaten), volledig=True)
+
+    def stats(self) -> dict:
+        return {"versies": dict(self._versies), **self._stats}
+
+    def _snapshot(self, station: str, apparaten: Dict[str, dict], connected: bool, kleuren: List[str], volledig: bool) -> dict:
+        return {
+            "station": station,
+            "versie": self._versies[station],
+            "volledig": volledig,
+            "connected": connected,
+            "apparaten": [
+                {
+                    "kleur": kleur,
+                    "status": apparaten[kleur]["status"],
+                    "batterij": apparaten[kleur]["batterij"]
+                }
+                for kleur in kleuren
+            ]
+        }
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SamenvoegendeWachtrij:
+    """Begrensde wachtrij waarin een nieuw bericht met dezelfde sleutel het oude vervangt
+
+    Voor de batterij telemetrie telt enkel de laatste waarde per kegel. Is de wachtrij vol, dan
+    valt het oudste bericht weg, zodat een trage consument nooit de MQTT loop ophoudt.
+    Zonder samenvoegen (`samenvoegen=False`) krijgt elk bericht een eigen sleutel.
+    """
+
+    def __init__(self, naam: str, max_grootte: int, samenvoegen: bool = True):
+        self.naam = naam
+        self._max_grootte = max_grootte
+        self._samenvoegen = samenvoegen
+        self._berichten: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._volgnummer = 0
+        self._wachter = asyncio.Event()
+        self._stats = {"ontvangen": 0, "verwerkt": 0, "samengevoegd": 0, "verworpen": 0, "fouten": 0, "max_diepte": 0}
+
+    def zet(self, sleutel: Hashable, bericht: Any):
+        """Niet-blokkerend toevoegen vanuit de MQTT loop"""
+        self._stats["ontvangen"] += 1
+        if not self._samenvoegen:
+            self._volgnummer += 1
+            sleutel = (sleutel, self._volgnummer)
+
+        if sleutel in self._berichten:
+            # Vervang de waarde maar behoud de plaats: de kegel schuift niet achteraan
+            self._berichten[sleutel] = bericht
+            self._stats["samengevoegd"] += 1
+        else:
+            if len(self._berichten) >= self._max_grootte:
+                self._berichten.popitem(last=False)
+                self._stats["verworpen"] += 1
+            self._berichten[sleutel] = bericht
+            self._stats["max_diepte"] = max(self._stats["max_diepte"], len(self._berichten))
+        self._wachter.set()
+
+    async def haal(self) -> Tuple[Hashable, Any]:
+        while not self._berichten:
+            self._wachter.clear()
+            await self._wachter.wait()
+        return self._berichten.popitem(last=False)
+
+    async def verwerk(self, handler: Callable[[Any], Awaitable[None]]):
+        """Consument: verwerk berichten één voor één tot de task geannuleerd wordt"""
+        while True:
+            _, bericht = await self.haal()
+            try:
+                await handler(bericht)
+            except Exception as e:
+                self._stats["fouten"] += 1
+                logger.error(f"Fout bij verwerken van {self.naam} bericht: {e}")
+            self._stats["verwerkt"] += 1
+
+    def stats(self) -> dict:
+        return {"naam": self.naam, "diepte": len(self._berichten), "max_grootte": self._max_grootte, **self._stats}
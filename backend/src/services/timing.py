@@ -0,0 +1,46 @@
+import time
+
+NS_PER_SECONDE = 1_000_000_000
+
+
+def nu_ns() -> int:
+    """Monotone klok in nanoseconden, niet beïnvloed door NTP-correcties van de systeemklok"""
+    return time.perf_counter_ns()
+
+
+def seconden_naar_ns(seconden: float) -> int:
+    return round(seconden * NS_PER_SECONDE)
+
+
+def ns_naar_seconden(ns: int) -> float:
+    """Onafgeronde seconden, zo worden reactietijden opgeslagen"""
+    return ns / NS_PER_SECONDE
+
+
+def ns_naar_ms(ns: int) -> float:
+    """Milliseconden voor de frontend: JavaScript getallen zijn niet exact boven 2^53 ns"""
+    return ns / 1_000_000
+
+
+def server_tijden(start_ns: int, deadline_ns: int) -> dict:
+    """Velden voor een socket event waarmee de UI start en deadline op de eigen klok kan plannen"""
+    return {
+        "server_ms": ns_naar_ms(nu_ns()),
+        "start_ms": ns_naar_ms(start_ns),
+        "deadline_ms": ns_naar_ms(deadline_ns),
+    }
+
+
+def weergave(ns: int, decimalen: int = 2) -> float:
+    """Seconden afgerond voor weergave (logs, socket events), nooit voor opslag"""
+    return round(ns / NS_PER_SECONDE, decimalen)
+
+
+def tijdstip_van(gebeurtenis: dict) -> int:
+    """Tijdstip waarop de MQTT client de detectie ontving, of nu als het ontbreekt"""
+    return gebeurtenis.get("tijdstip_ns") or nu_ns()
+
+
+def reactietijd_ns(start_ns: int, tijdstip_ns: int, correctie_ns: int = 0) -> int:
+    """Reactietijd tussen start en detectie, gecorrigeerd voor de hardware vertraging"""
+    return max(0, tijdstip_ns - start_ns - correctie_ns)
@@ -0,0 +1,57 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# backend.src.* imports werken vanaf de root van de repository, zoals bij `uvicorn backend.src.main:app`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.scripts.init_db import create_database
+from backend.src.database import ConnectionPool, Database
+from backend.src.migrations import migreer_database
+from backend.src.repositories.gebruiker_cache import gebruiker_cache
+from backend.src.repositories.leaderboard_cache import leaderboard_cache
+from backend.src.repositories.ranking_index import ranking_index
+
+
+@pytest.fixture
+def baseline_db(tmp_path, monkeypatch):
+    """Pad naar een lege database met het oorspronkelijke schema van scripts/init_db.py (versie 0)"""
+    monkeypatch.chdir(tmp_path)
+    create_database()
+    return str(tmp_path / "brainmove.db")
+
+
+@pytest.fixture
+def basis_db(baseline_db):
+    """Oorspronkelijk schema met games, moeilijkheden en rondes zoals de applicatie ze verwacht"""
+    db = sqlite3.connect(baseline_db)
+    for game_id in range(1, 6):
+        db.execute(
+            "INSERT INTO Games (GameId, GameBeschrijving, GameNaam, Eenheid, Tag) VALUES (?, ?, ?, ?, ?)",
+            (game_id, "test", f"Game {game_id}", "s", "test")
+        )
+        for moeilijkheid, snelheid in (("Gemakkelijk", 10), ("Gemiddeld", 5), ("Moeilijk", 3)):
+            db.execute("INSERT INTO Moeilijkheden (Moeilijkheid, Snelheid, GameId) VALUES (?, ?, ?)", (moeilijkheid, snelheid, game_id))
+        for nummer in (5, 10, 15):
+            db.execute("INSERT INTO Rondes (Nummer, GameId) VALUES (?, ?)", (nummer, game_id))
+    db.commit()
+    db.close()
+    return baseline_db
+
+
+@pytest.fixture
+def database(basis_db, monkeypatch):
+    """Gemigreerde database achter Database/DataRepository, met lege in-process caches"""
+    pool = ConnectionPool(basis_db)
+    monkeypatch.setattr(Database, "_pool", pool)
+    migreer_database()
+    gebruiker_cache.leeg()
+    ranking_index.invalideer()
+    leaderboard_cache.invalideer_alles()
+    yield basis_db
+    gebruiker_cache.leeg()
+    ranking_index.invalideer()
+    leaderboard_cache.invalideer_alles()
+    pool.sluit_alle()
@@ -0,0 +1,97 @@
+import asyncio
+
+from backend.src.services.commando_bevestiging import COMMANDO_POGINGEN, CommandoBevestiging
+from backend.src.services.mqtt_client import MQTTDeviceManager
+from backend.src.services.timing import nu_ns
+
+
+def _manager(ack_bij_poging=None, publish_lukt=True):
+    """Device manager zonder broker: publish noteert enkel, een kegel antwoordt eventueel bij een bepaalde poging"""
+    manager = MQTTDeviceManager(bevestiging=CommandoBevestiging())
+    verstuurd = []
+
+    async def publish(topic, payload):
+        verstuurd.append((topic, payload))
+        if ack_bij_poging == len(verstuurd):
+            seq = payload.split("#")[1]
+            asyncio.get_running_loop().call_soon(manager.bevestiging.verwerk_ack, "rood", seq, nu_ns())
+        return publish_lukt
+
+    manager._publish = publish
+    return manager, verstuurd
+
+
+def test_ack_bij_eerste_poging():
+    async def scenario():
+        manager, verstuurd = _manager(ack_bij_poging=1)
+        return await manager.send_command("rood", "correct", bevestigd=True), verstuurd, manager.bevestiging.stats()
+
+    gelukt, verstuurd, stats = asyncio.run(scenario())
+    assert gelukt
+    assert verstuurd == [("bm/rood/cmd", "correct#1")]
+    assert stats[0]["bevestigd"] == 1 and stats[0]["herhalingen"] == 0
+
+
+def test_herhaling_met_hetzelfde_volgnummer():
+    async def scenario():
+        manager, verstuurd = _manager(ack_bij_poging=2)
+        return await manager.send_command("rood", "correct", bevestigd=True), verstuurd, manager.bevestiging.stats()
+
+    gelukt, verstuurd, stats = asyncio.run(scenario())
+    assert gelukt
+    # De kegel voert een herhaling niet opnieuw uit: zelfde payload, zelfde volgnummer
+    assert [payload for _, payload in verstuurd] == ["correct#1", "correct#1"]
+    assert stats[0]["herhalingen"] == 1 and stats[0]["bevestigd"] == 1
+
+
+def test_geen_ack_na_alle_pogingen():
+    async def scenario():
+        manager, verstuurd = _manager()
+        gelukt = await manager.send_command("rood", "correct", bevestigd=True)
+        # Een late ack na het opgeven telt niet meer
+        late_ack = manager.bevestiging.verwerk_ack("rood", "1", nu_ns())
+        return gelukt, verstuurd, late_ack, manager.bevestiging.stats()
+
+    gelukt, verstuurd, late_ack, stats = asyncio.run(scenario())
+    assert not gelukt
+    assert len(verstuurd) == COMMANDO_POGINGEN
+    assert late_ack is None
+    assert stats[0]["mislukt"] == 1 and stats[0]["herhalingen"] == COMMANDO_POGINGEN - 1
+
+
+def test_geen_herhaling_als_publish_mislukt():
+    async def scenario():
+        manager, verstuurd = _manager(publish_lukt=False)
+        return await manager.send_command("rood", "correct", bevestigd=True), verstuurd
+
+    gelukt, verstuurd = asyncio.run(scenario())
+    assert not gelukt
+    assert len(verstuurd) == 1
+
+
+def test_onbevestigd_commando_zonder_volgnummer():
+    async def scenario():
+        manager, verstuurd = _manager()
+        return await manager.send_command("rood", "correct"), verstuurd
+
+    gelukt, verstuurd = asyncio.run(scenario())
+    assert gelukt
+    assert verstuurd == [("bm/rood/cmd", "correct")]
+
+
+def test_dubbele_en_ongeldige_acks():
+    async def scenario():
+        bevestiging = CommandoBevestiging()
+        payload, ack = bevestiging.nieuw_commando("blauw", "incorrect")
+        seq = payload.split("#")[1]
+        eerste = bevestiging.verwerk_ack("blauw", seq, nu_ns())
+        dubbel = bevestiging.verwerk_ack("blauw", seq, nu_ns())
+        ongeldig = bevestiging.verwerk_ack("blauw", "geen getal", nu_ns())
+        andere_kegel = bevestiging.verwerk_ack("rood", seq, nu_ns())
+        return ack.result(), eerste, dubbel, ongeldig, andere_kegel, bevestiging.stats()
+
+    resultaat, eerste, dubbel, ongeldig, andere_kegel, stats = asyncio.run(scenario())
+    assert resultaat == eerste >= 0
+    assert dubbel is None and ongeldig is None and andere_kegel is None
+    assert stats[0]["bevestigd"] == 1
+    assert sum(stats[0]["histogram"].values()) == 1
@@ -0,0 +1,14 @@
+from backend.src.database import Database
+
+
+def test_execute_sql_geeft_id_enkel_bij_insert(database):
+    Database.execute_sql("CREATE TABLE Proef (Id INTEGER PRIMARY KEY, Naam TEXT)")
+    eerste = Database.execute_sql("INSERT INTO Proef (Naam) VALUES (?)", ("a",))
+    tweede = Database.execute_sql("INSERT INTO Proef (Naam) VALUES (?)", ("b",))
+
+    assert (eerste, tweede) == (1, 2)
+    # Op dezelfde connectie blijft lastrowid op 2 staan: UPDATE/DELETE tellen gewijzigde rijen
+    assert Database.execute_sql("DELETE FROM Proef WHERE Naam = ?", ("onbekend",)) == 0
+    assert Database.execute_sql("UPDATE Proef SET Naam = ?", ("c",)) == 2
+    assert Database.execute_sql("INSERT OR IGNORE INTO Proef (Id, Naam) VALUES (?, ?)", (1, "d")) == 0
+    assert Database.execute_sql("DELETE FROM Proef") == 2
@@ -0,0 +1,75 @@
+import asyncio
+
+from backend.src.services.detectie_kanaal import DetectieKanaal
+from backend.src.services.timing import nu_ns, seconden_naar_ns
+
+
+def test_detecties_in_volgorde_van_aankomst():
+    async def scenario():
+        kanaal = DetectieKanaal()
+        kanaal.lever({"kleur": "rood"})
+        kanaal.lever({"kleur": "blauw"})
+        return [await kanaal.ontvang(), await kanaal.ontvang(nu_ns())]
+
+    assert [d["kleur"] for d in asyncio.run(scenario())] == ["rood", "blauw"]
+
+
+def test_deadline_zonder_detectie():
+    async def scenario():
+        kanaal = DetectieKanaal()
+        start_ns = nu_ns()
+        gebeurtenis = await kanaal.ontvang(start_ns + seconden_naar_ns(0.05))
+        return gebeurtenis, nu_ns() - start_ns
+
+    gebeurtenis, gewacht_ns = asyncio.run(scenario())
+    assert gebeurtenis is None
+    assert gewacht_ns >= seconden_naar_ns(0.05)
+    assert gewacht_ns < seconden_naar_ns(0.5)
+
+
+def test_verstreken_deadline_wacht_niet():
+    async def scenario():
+        kanaal = DetectieKanaal()
+        return await asyncio.wait_for(kanaal.ontvang(nu_ns() - 1), 0.1)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_detectie_wekt_voor_de_deadline():
+    async def scenario():
+        kanaal = DetectieKanaal()
+        asyncio.get_running_loop().call_later(0.02, kanaal.lever, {"kleur": "geel"})
+        start_ns = nu_ns()
+        gebeurtenis = await kanaal.ontvang(start_ns + seconden_naar_ns(5))
+        return gebeurtenis, nu_ns() - start_ns
+
+    gebeurtenis, gewacht_ns = asyncio.run(scenario())
+    assert gebeurtenis["kleur"] == "geel"
+    assert gewacht_ns < seconden_naar_ns(1)
+
+
+def test_stop_wekt_en_weigert_nieuwe_detecties():
+    async def scenario():
+        kanaal = DetectieKanaal()
+        asyncio.get_running_loop().call_later(0.02, kanaal.stop)
+        gebeurtenis = await kanaal.ontvang()
+        kanaal.lever({"kleur": "groen"})
+        return kanaal, gebeurtenis
+
+    kanaal, gebeurtenis = asyncio.run(scenario())
+    assert gebeurtenis is None
+    assert kanaal.gestopt
+    assert kanaal.neem_alle() == []
+
+
+def test_leeg_vergeet_wachtrij_maar_niet_logboek():
+    kanaal = DetectieKanaal()
+    kanaal.start()
+    kanaal.lever({"kleur": "rood"})
+    kanaal.leeg()
+    kanaal.ronde = 1
+    kanaal.lever({"kleur": "blauw"})
+
+    assert [d["kleur"] for d in kanaal.neem_alle()] == ["blauw"]
+    assert [(d["kleur"], d["ronde"]) for d in kanaal.neem_logboek()] == [("rood", None), ("blauw", 1)]
+    assert kanaal.neem_logboek() == []
@@ -0,0 +1,27 @@
+from backend.src.models.models import DetectieLogItem, NieuweRondeWaarde, TrainingResultaat
+from backend.src.repositories.data_repository import DataRepository
+
+
+def test_detectie_log_per_training(database):
+    detecties = [
+        DetectieLogItem(ronde_nummer=None, station="default", kleur="geel", afstand=580, ontvangen_ms=12.5, beoordeling="genegeerd"),
+        DetectieLogItem(ronde_nummer=1, station="default", kleur="rood", afstand=120, ontvangen_ms=840.25, beoordeling="correct"),
+        DetectieLogItem(ronde_nummer=2, station="default", kleur="blauw", afstand=95, ontvangen_ms=1610.0, beoordeling="fout"),
+    ]
+    opgeslagen = DataRepository.save_training_resultaat(TrainingResultaat(
+        gebruikersnamen=["Anna"],
+        start_tijd="2026-01-10T10:00:00.000000",
+        aantal_kleuren=4,
+        ronde_id=1,
+        moeilijkheids_id=1,
+        game_id=1,
+        rondewaarden=[
+            NieuweRondeWaarde(ronde_nummer=1, waarde=0.62, uitkomst="correct"),
+            NieuweRondeWaarde(ronde_nummer=2, waarde=1.8, uitkomst="fout"),
+        ],
+        detecties=detecties,
+    ))
+
+    # In volgorde van ontvangst, ook de aanrakingen die geen ronde beslisten
+    assert DataRepository.get_detectie_log(opgeslagen["trainings_id"]) == detecties
+    assert DataRepository.get_detectie_log(opgeslagen["trainings_id"] + 1) == []
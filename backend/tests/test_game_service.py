@@ -0,0 +1,117 @@
+import asyncio
+
+from backend.src.services.game_service import GameService
+from backend.src.services.timing import nu_ns, seconden_naar_ns
+
+
+class StilleSio:
+    async def emit(self, *args, **kwargs):
+        pass
+
+
+class NepKegels:
+    """Device manager zonder MQTT: de kegel bevestigt na ack_vertraging, de speler raakt aan na reactie
+
+    aanraking_tijdstip verschuift het tijdstip van de aanraking ten opzichte van het binnenkomen
+    (een negatieve waarde = een aanraking die vertraagd binnenkomt).
+    """
+
+    def __init__(self, ack_vertraging: float, reactie: float, aanraking_tijdstip: float = 0.0):
+        self.ack_vertraging = ack_vertraging
+        self.reactie = reactie
+        self.aanraking_tijdstip = aanraking_tijdstip
+        self.callback = None
+
+    def zet_detectie_callback(self, callback):
+        self.callback = callback
+
+    async def start_alle(self):
+        pass
+
+    async def stop_alle(self):
+        pass
+
+    async def set_correct_kegel(self, kleur: str) -> bool:
+        await asyncio.sleep(self.ack_vertraging)
+        asyncio.get_running_loop().call_later(self.reactie, self._raak_aan, kleur)
+        return True
+
+    async def reset_correct_kegel(self, kleur: str) -> bool:
+        return True
+
+    def _raak_aan(self, kleur: str):
+        if self.callback:
+            self.callback({
+                "kleur": kleur.lower(),
+                "afstand": 100,
+                "tijdstip_ns": nu_ns() + seconden_naar_ns(self.aanraking_tijdstip),
+                "correctie_ns": 0,
+            })
+
+
+def test_reactietijd_start_bij_de_ack():
+    kegels = NepKegels(ack_vertraging=0.15, reactie=0.05)
+    game = GameService(kegels, StilleSio())
+
+    rondes = asyncio.run(game.run_colorgame(1, ["rood"], 1.0))
+
+    assert rondes[0]["uitkomst"] == "correct"
+    # Het wachten op de ack (0.15 s) telt niet mee in de reactietijd
+    assert 0.04 <= rondes[0]["waarde"] < 0.15
+
+
+def test_falling_colors_vertraagde_aanraking_voor_de_deadline():
+    # Aanraking na 0.9 s van een val van 1 s, pas 0.3 s later ontvangen
+    kegels = NepKegels(ack_vertraging=0.0, reactie=1.2, aanraking_tijdstip=-0.3)
+    game = GameService(kegels, StilleSio())
+
+    rondes = asyncio.run(game.run_fallingcolorgame(1, ["rood"], 1.0))
+
+    assert rondes[0]["uitkomst"] == "correct"
+    assert 0.85 <= rondes[0]["waarde"] < 1.0
+
+
+def test_falling_colors_aanraking_na_de_val():
+    kegels = NepKegels(ack_vertraging=0.0, reactie=1.2)
+    game = GameService(kegels, StilleSio())
+
+    rondes = asyncio.run(game.run_fallingcolorgame(2, ["rood"], 1.0))
+
+    # Game over na de eerste ronde, de volledige valtijd telt
+    assert [ronde["uitkomst"] for ronde in rondes] == ["te laat"]
+    assert rondes[0]["waarde"] == 1.0
+    assert [d.beoordeling for d in game.neem_detectie_log()] == ["te laat"]
+
+
+class VroegeAanrakingSio(StilleSio):
+    """Raakt de kleur van speler 1 aan zodra de ronde getoond wordt, tijdens de voorbereiding"""
+
+    def __init__(self, kegels: NepKegels):
+        self.kegels = kegels
+
+    async def emit(self, event, data=None, **kwargs):
+        if event == "colorbattle_ronde":
+            self.kegels._raak_aan(data["speler1_kleur"])
+
+
+class NepBattleKegels(NepKegels):
+    async def set_correct_kegels(self, kleuren) -> dict:
+        await asyncio.sleep(self.ack_vertraging)
+        for kleur in kleuren:
+            asyncio.get_running_loop().call_later(self.reactie, self._raak_aan, kleur)
+        return {kleur: True for kleur in kleuren}
+
+    async def reset_correct_kegels(self, kleuren) -> dict:
+        return {kleur: True for kleur in kleuren}
+
+
+def test_colorbattle_aanraking_tijdens_voorbereiding_telt_niet():
+    kegels = NepBattleKegels(ack_vertraging=0.0, reactie=0.1)
+    game = GameService(kegels, VroegeAanrakingSio(kegels))
+
+    resultaat = asyncio.run(game.run_colorbattle(1, ["rood", "blauw", "geel", "groen"], 1.0, "Anna", "Bob"))
+
+    ronde = resultaat["rondes"][0]
+    assert ronde["speler1_uitkomst"] == ronde["speler2_uitkomst"] == "correct"
+    # De aanraking tijdens de voorbereiding is geen reactie van 0.00 s
+    assert 0.09 <= ronde["speler1_tijd"] < 0.5
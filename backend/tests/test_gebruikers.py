@@ -0,0 +1,45 @@
+from backend.src.database import Database
+from backend.src.models.models import NieuweRondeWaarde, TrainingResultaat
+from backend.src.repositories.data_repository import DataRepository
+from backend.src.repositories.gebruiker_cache import gebruiker_cache, is_plaatshouder
+
+
+def _training(*namen):
+    return TrainingResultaat(
+        gebruikersnamen=list(namen),
+        start_tijd="2026-01-10T10:00:00.000000",
+        aantal_kleuren=4,
+        ronde_id=1,
+        moeilijkheids_id=1,
+        game_id=1,
+        rondewaarden=[NieuweRondeWaarde(ronde_nummer=1, waarde=0.5, uitkomst="correct")],
+    )
+
+
+def _naam(gebruikers_id):
+    return Database.get_one_row("SELECT Gebruikersnaam FROM Gebruikers WHERE GebruikersId = ?", (gebruikers_id,))["Gebruikersnaam"]
+
+
+def test_zelfde_naam_zelfde_gebruiker(database):
+    eerste = DataRepository.add_gebruiker("  Anna ")
+    gebruiker_cache.leeg()
+    assert DataRepository.add_gebruiker("ANNA") == eerste
+    assert DataRepository.save_training_resultaat(_training("anna"))["gebruikers_ids"] == [eerste]
+    # De naam wordt getrimd opgeslagen
+    assert _naam(eerste) == "Anna"
+
+
+def test_anonieme_spelers_krijgen_elk_een_gebruiker(database):
+    eerste = DataRepository.save_training_resultaat(_training("Speler"))["gebruikers_ids"]
+    tweede = DataRepository.save_training_resultaat(_training(" speler "))["gebruikers_ids"]
+    battle = DataRepository.save_training_resultaat(_training("Speler 1", "Speler 2"))["gebruikers_ids"]
+
+    assert len(set(eerste + tweede + battle)) == 4
+    assert _naam(tweede[0]) == "speler"
+    assert gebruiker_cache.haal_op("Speler") is None
+
+
+def test_plaatshouders():
+    assert is_plaatshouder(" SPELER 2 ")
+    assert not is_plaatshouder("Speler 3")
+    assert not is_plaatshouder("Spelertje")
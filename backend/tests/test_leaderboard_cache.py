@@ -0,0 +1,71 @@
+from backend.src.repositories.leaderboard_cache import LeaderboardCache
+
+
+def _sleutel(game_id, moeilijkheids_id=1):
+    return ("leaderboard", game_id, moeilijkheids_id, None, 10)
+
+
+def test_hit_berekent_niet_opnieuw():
+    cache = LeaderboardCache(max_grootte=4)
+    berekeningen = []
+
+    def bereken():
+        berekeningen.append(1)
+        return ["rij"]
+
+    assert cache.haal_op(_sleutel(1), bereken) == ["rij"]
+    assert cache.haal_op(_sleutel(1), bereken) == ["rij"]
+    assert len(berekeningen) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_verwijdert_minst_recent_gebruikte():
+    cache = LeaderboardCache(max_grootte=2)
+    cache.haal_op(_sleutel(1), lambda: "een")
+    cache.haal_op(_sleutel(2), lambda: "twee")
+    # Een hit maakt sleutel 1 het meest recent gebruikt, sleutel 2 valt weg
+    cache.haal_op(_sleutel(1), lambda: "niet berekend")
+    cache.haal_op(_sleutel(3), lambda: "drie")
+
+    assert cache.haal_op(_sleutel(1), lambda: "opnieuw") == "een"
+    assert cache.haal_op(_sleutel(2), lambda: "opnieuw") == "opnieuw"
+    assert cache.stats()["grootte"] == 2
+    assert cache.stats()["verwijderd_lru"] == 2
+
+
+def test_invalideer_game_laat_andere_games_staan():
+    cache = LeaderboardCache()
+    cache.haal_op(_sleutel(1, 1), lambda: "game 1a")
+    cache.haal_op(_sleutel(1, 2), lambda: "game 1b")
+    cache.haal_op(_sleutel(2), lambda: "game 2")
+
+    cache.invalideer_game(1)
+
+    assert cache.haal_op(_sleutel(1, 1), lambda: "nieuw") == "nieuw"
+    assert cache.haal_op(_sleutel(1, 2), lambda: "nieuw") == "nieuw"
+    assert cache.haal_op(_sleutel(2), lambda: "nieuw") == "game 2"
+
+
+def test_invalidatie_tijdens_berekenen_wordt_niet_bewaard():
+    cache = LeaderboardCache()
+
+    def bereken_met_invalidatie():
+        # Een training van deze game wordt opgeslagen terwijl het leaderboard berekend wordt
+        cache.invalideer_game(1)
+        return "verouderd"
+
+    assert cache.haal_op(_sleutel(1), bereken_met_invalidatie) == "verouderd"
+    assert cache.haal_op(_sleutel(1), lambda: "actueel") == "actueel"
+    assert cache.haal_op(_sleutel(1), lambda: "niet berekend") == "actueel"
+
+
+def test_invalideer_alles():
+    cache = LeaderboardCache()
+    cache.haal_op(_sleutel(1), lambda: "game 1")
+    cache.haal_op(_sleutel(2), lambda: "game 2")
+
+    cache.invalideer_alles()
+
+    assert cache.stats()["grootte"] == 0
+    assert cache.stats()["invalidaties"] == 1
@@ -0,0 +1,109 @@
+import sqlite3
+
+from backend.src.migrations import MIGRATIES, schema_versie, voer_migraties_uit
+
+
+def _verbind(pad: str) -> sqlite3.Connection:
+    db = sqlite3.connect(pad)
+    db.row_factory = sqlite3.Row
+    return db
+
+
+def _voeg_training_toe(db, game_id: int, namen, waarden):
+    """Training zoals de oorspronkelijke code ze opsloeg: één nieuwe gebruiker per speler, waarden als tekst"""
+    gebruikers_ids = [
+        db.execute("INSERT INTO Gebruikers (Gebruikersnaam) VALUES (?)", (naam,)).lastrowid
+        for naam in namen
+    ]
+    trainings_id = db.execute(
+        "INSERT INTO Trainingen (Start, AantalKleuren, GebruikersId, RondeId, MoeilijkheidsId, GameId) VALUES (?, ?, ?, ?, ?, ?)",
+        ("2026-01-10T10:00:00.000000", 4, gebruikers_ids[0], (game_id - 1) * 3 + 1, (game_id - 1) * 3 + 1, game_id)
+    ).lastrowid
+    for ronde, waarde in enumerate(waarden, start=1):
+        db.execute(
+            "INSERT INTO RondeWaarden (TrainingsId, RondeNummer, Waarde, Uitkomst) VALUES (?, ?, ?, ?)",
+            (trainings_id, ronde, str(waarde), "correct")
+        )
+    return trainings_id
+
+
+def _tabellen(db):
+    return {row["name"] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def _indexen(db):
+    return {row["name"] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_migraties_op_basisschema(basis_db):
+    db = _verbind(basis_db)
+    _voeg_training_toe(db, 1, ["Anna"], [0.5, 0.7])
+    _voeg_training_toe(db, 1, ["anna "], [0.4])
+    battle = _voeg_training_toe(db, 5, ["Bob", "Cees"], [0.3, 0.6, 0.4, 0.8])
+    db.commit()
+
+    assert voer_migraties_uit(db) == [nummer for nummer, _, _ in MIGRATIES]
+    assert schema_versie(db) == MIGRATIES[-1][0]
+
+    assert {"TrainingStats", "TrainingDeelnemers", "RondePlannen", "TelemetrieMetingen", "TelemetrieRollups", "DetectieLog"} <= _tabellen(db)
+    assert {"idx_rondewaarden_training", "idx_trainingen_game_moeilijkheid", "idx_gebruikers_naam"} <= _indexen(db)
+
+    # Migratie 1: waarden als REAL
+    assert {row["t"] for row in db.execute("SELECT DISTINCT typeof(Waarde) AS t FROM RondeWaarden")} == {"real"}
+
+    # Migraties 3 en 4: Color Battle rondes om beurten van speler 1 en speler 2
+    deelnemers = db.execute(
+        "SELECT g.Gebruikersnaam FROM TrainingDeelnemers d JOIN Gebruikers g USING (GebruikersId) WHERE d.TrainingsId = ? ORDER BY d.SpelerNummer",
+        (battle,)
+    ).fetchall()
+    assert [row["Gebruikersnaam"] for row in deelnemers] == ["Bob", "Cees"]
+    spelers = db.execute("SELECT SpelerNummer FROM RondeWaarden WHERE TrainingsId = ? ORDER BY RondeWaardeId", (battle,)).fetchall()
+    assert [row["SpelerNummer"] for row in spelers] == [1, 2, 1, 2]
+
+    # Migratie 5: dubbele gebruikers samengevoegd, naam getrimd
+    anna = db.execute("SELECT GebruikersId, Gebruikersnaam FROM Gebruikers WHERE LOWER(Gebruikersnaam) = 'anna'").fetchall()
+    assert [row["Gebruikersnaam"] for row in anna] == ["Anna"]
+    assert db.execute("SELECT COUNT(*) FROM Trainingen WHERE GebruikersId = ?", (anna[0]["GebruikersId"],)).fetchone()[0] == 2
+    db.close()
+
+
+def test_migraties_zijn_idempotent(baseline_db):
+    db = _verbind(baseline_db)
+    assert voer_migraties_uit(db)
+    assert voer_migraties_uit(db) == []
+    assert schema_versie(db) == MIGRATIES[-1][0]
+    db.close()
+
+
+def test_anonieme_spelers_blijven_apart(basis_db):
+    db = _verbind(basis_db)
+    for _ in range(3):
+        _voeg_training_toe(db, 1, ["Speler"], [1.0])
+    _voeg_training_toe(db, 5, ["Speler 1", "Speler 2"], [0.3, 0.6])
+    _voeg_training_toe(db, 5, [" speler 1", "Speler 2"], [0.4, 0.5])
+    # Beide spelers met dezelfde standaardnaam
+    dubbel = _voeg_training_toe(db, 5, ["Speler", "Speler"], [0.7, 0.8])
+    db.execute("UPDATE Gebruikers SET LaatstBewerkt = '2025-06-01 12:00:00' WHERE GebruikersId = 1")
+    db.commit()
+
+    voer_migraties_uit(db)
+
+    per_training = db.execute("""
+        SELECT COUNT(DISTINCT GebruikersId) AS gebruikers, COUNT(*) AS trainingen FROM Trainingen
+    """).fetchone()
+    assert per_training["gebruikers"] == per_training["trainingen"] == 6
+    # Dezelfde standaardnaam mag meermaals voorkomen
+    assert db.execute("SELECT COUNT(*) FROM Gebruikers WHERE Gebruikersnaam = 'Speler 2'").fetchone()[0] == 2
+    assert db.execute("SELECT COUNT(*) FROM Gebruikers WHERE Gebruikersnaam != TRIM(Gebruikersnaam)").fetchone()[0] == 0
+    deelnemers = db.execute("SELECT GebruikersId FROM TrainingDeelnemers WHERE TrainingsId = ?", (dubbel,)).fetchall()
+    assert len({row["GebruikersId"] for row in deelnemers}) == 2
+    # Anonieme spelers blijven ongewijzigd
+    assert db.execute("SELECT LaatstBewerkt FROM Gebruikers WHERE GebruikersId = 1").fetchone()[0] == "2025-06-01 12:00:00"
+    db.close()
+
+
+def test_zonder_basistabellen_geen_migraties(tmp_path):
+    db = _verbind(str(tmp_path / "leeg.db"))
+    assert voer_migraties_uit(db) == []
+    assert schema_versie(db) == 0
+    db.close()
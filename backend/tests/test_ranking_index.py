@@ -0,0 +1,109 @@
+import random
+
+from backend.src.database import Database
+from backend.src.models.models import NieuweRondeWaarde, TrainingResultaat
+from backend.src.repositories.data_repository import DataRepository
+from backend.src.repositories.ranking_index import MEMORY_GAME_ID, RankingIndex, ranking_index
+
+
+def _plaats_via_sql(trainings_id: int) -> int:
+    """Plaats zoals de oorspronkelijke COUNT(*) queries ze berekenden"""
+    training = Database.get_one_row("SELECT GameId, MoeilijkheidsId FROM Trainingen WHERE TrainingsId = ?", (trainings_id,))
+    if training["GameId"] == MEMORY_GAME_ID:
+        stats = Database.get_one_row(
+            "SELECT MAX(RondeNummer) AS max_ronde, AVG(Waarde) AS avg_waarde FROM RondeWaarden WHERE TrainingsId = ?",
+            (trainings_id,)
+        )
+        beter = Database.get_one_row("""
+            SELECT COUNT(*) AS cnt FROM (
+                SELECT MAX(rv.RondeNummer) AS max_ronde, AVG(rv.Waarde) AS avg_waarde
+                FROM Trainingen t
+                JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
+                WHERE t.GameId = ? AND t.MoeilijkheidsId = ?
+                GROUP BY t.TrainingsId
+            ) WHERE max_ronde > ? OR (max_ronde = ? AND avg_waarde < ?)
+        """, (training["GameId"], training["MoeilijkheidsId"], stats["max_ronde"], stats["max_ronde"], stats["avg_waarde"]))
+    else:
+        stats = Database.get_one_row("SELECT AVG(Waarde) AS avg_w FROM RondeWaarden WHERE TrainingsId = ?", (trainings_id,))
+        beter = Database.get_one_row("""
+            SELECT COUNT(*) AS cnt FROM (
+                SELECT AVG(rv.Waarde) AS avg_w
+                FROM Trainingen t
+                JOIN RondeWaarden rv ON t.TrainingsId = rv.TrainingsId
+                WHERE t.GameId = ?
+                GROUP BY t.TrainingsId
+            ) WHERE avg_w < ?
+        """, (training["GameId"], stats["avg_w"]))
+    return beter["cnt"] + 1
+
+
+def _sla_willekeurige_trainingen_op(aantal: int, rng: random.Random) -> list:
+    trainings_ids = []
+    for _ in range(aantal):
+        game_id = rng.randint(1, 4)
+        moeilijkheids_id = (game_id - 1) * 3 + rng.randint(1, 3)
+        rondes = [
+            # Eén decimaal zodat er gelijke scores voorkomen
+            NieuweRondeWaarde(ronde_nummer=nummer, waarde=round(rng.uniform(0.3, 1.5), 1), uitkomst="correct")
+            for nummer in range(1, rng.randint(2, 6))
+        ]
+        resultaat = DataRepository.save_training_resultaat(TrainingResultaat(
+            gebruikersnamen=[rng.choice(["Anna", "Bob", "Cees"])],
+            start_tijd="2026-01-10T10:00:00.000000",
+            aantal_kleuren=4,
+            ronde_id=(game_id - 1) * 3 + 1,
+            moeilijkheids_id=moeilijkheids_id,
+            game_id=game_id,
+            rondewaarden=rondes,
+        ))
+        trainings_ids.append(resultaat["trainings_id"])
+    return trainings_ids
+
+
+def test_plaats_telt_strikt_betere_scores():
+    index = RankingIndex()
+    index.laad([
+        {"GameId": 1, "MoeilijkheidsId": 1, "MaxRonde": 5, "GemiddeldeWaarde": 0.5},
+        {"GameId": 1, "MoeilijkheidsId": 2, "MaxRonde": 5, "GemiddeldeWaarde": 0.7},
+        {"GameId": 1, "MoeilijkheidsId": 3, "MaxRonde": 5, "GemiddeldeWaarde": 0.7},
+        {"GameId": MEMORY_GAME_ID, "MoeilijkheidsId": 4, "MaxRonde": 6, "GemiddeldeWaarde": 2.0},
+        {"GameId": MEMORY_GAME_ID, "MoeilijkheidsId": 4, "MaxRonde": 4, "GemiddeldeWaarde": 1.0},
+        {"GameId": MEMORY_GAME_ID, "MoeilijkheidsId": 5, "MaxRonde": 9, "GemiddeldeWaarde": 1.0},
+    ])
+
+    # Andere games: over alle moeilijkheden heen, gelijke scores delen de plaats
+    assert index.plaats(1, 1, 5, 0.4) == 1
+    assert index.plaats(1, 1, 5, 0.7) == 2
+    assert index.plaats(1, 1, 5, 0.8) == 4
+    # Memory: hoogste ronde eerst, dan gemiddelde, enkel binnen dezelfde moeilijkheid
+    assert index.plaats(MEMORY_GAME_ID, 4, 6, 1.5) == 1
+    assert index.plaats(MEMORY_GAME_ID, 4, 5, 0.1) == 2
+    assert index.plaats(MEMORY_GAME_ID, 4, 4, 1.0) == 2
+
+
+def test_voeg_toe_enkel_na_laden():
+    index = RankingIndex()
+    index.voeg_toe(1, 1, 3, 0.5)
+    assert not index.geladen
+
+    index.laad([])
+    index.voeg_toe(1, 1, 3, 0.5)
+    assert index.plaats(1, 1, 3, 0.6) == 2
+
+    index.invalideer()
+    assert not index.geladen
+
+
+def test_ranking_gelijk_aan_sql_count(database):
+    rng = random.Random(6)
+    assert DataRepository.laad_ranking_index()
+
+    # Trainingen die na het laden opgeslagen worden komen via voeg_toe (insort) in de index
+    trainings_ids = _sla_willekeurige_trainingen_op(80, rng)
+    for trainings_id in trainings_ids:
+        assert DataRepository.get_ranking_for_onetraining(trainings_id) == _plaats_via_sql(trainings_id)
+
+    # Opnieuw laden vanuit TrainingStats geeft dezelfde plaatsen
+    ranking_index.invalideer()
+    for trainings_id in trainings_ids:
+        assert DataRepository.get_ranking_for_onetraining(trainings_id) == _plaats_via_sql(trainings_id)
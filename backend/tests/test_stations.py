@@ -0,0 +1,83 @@
+import asyncio
+
+from backend.src.models.models import Instellingen
+from backend.src.routers import trainingen_router
+from backend.src.services.game_manager import GameManager
+from backend.src.services.game_service import GameService
+from backend.src.services.latentie import LatentieKalibratie
+from backend.src.services.mqtt_client import MQTTDeviceManager
+from backend.src.services.station import STANDAARD_STATION, kegel_id
+
+
+def test_kegel_id_per_station():
+    assert kegel_id(STANDAARD_STATION, "rood") == "rood"
+    assert kegel_id("s2", "rood") == "s2/rood"
+
+
+def test_kalibratie_per_station_en_geannuleerd_bij_stop():
+    async def scenario():
+        manager = MQTTDeviceManager(latentie=LatentieKalibratie(0.05, 0.035), stations=[STANDAARD_STATION, "s2"])
+
+        async def publish(topic, payload):
+            return True
+
+        manager._publish = publish
+        for station in manager.stations:
+            for apparaat in manager._stations[station]["apparaten"].values():
+                apparaat["status"] = "online"
+
+        await manager.start_alle(STANDAARD_STATION)
+        await manager.start_alle("s2")
+        taken = [manager._stations[station]["kalibratie_task"] for station in manager.stations]
+        lopend = [not taak.done() for taak in taken]
+        await manager.stop()
+        return taken, lopend
+
+    taken, lopend = asyncio.run(scenario())
+    # Een game op s2 overschrijft de kalibratie van het standaard station niet
+    assert taken[0] is not taken[1]
+    assert lopend == [True, True]
+    assert all(taak.cancelled() for taak in taken)
+
+
+class StilleSio:
+    async def emit(self, *args, **kwargs):
+        pass
+
+
+def _manager_met_instellingen(gebruikersnaam: str) -> GameManager:
+    manager = GameManager(GameService(device_manager=None, sio=StilleSio()), StilleSio())
+    manager.set_instellingen(Instellingen(
+        game_id=1, gebruikersnaam=gebruikersnaam, moeilijkheids_id=1, snelheid=1,
+        ronde_id=1, rondes=2, kleuren=["rood", "blauw"]
+    ))
+    return manager
+
+
+def test_resultaten_van_het_eigen_station(database, monkeypatch):
+    managers = {STANDAARD_STATION: _manager_met_instellingen("Anna"), "s2": _manager_met_instellingen("Bob")}
+    monkeypatch.setattr(trainingen_router, "game_managers", managers)
+
+    async def scenario():
+        await managers[STANDAARD_STATION]._save_training_results(
+            [{"rondenummer": 1, "waarde": 0.4, "uitkomst": "correct"}, {"rondenummer": 2, "waarde": 0.6, "uitkomst": "correct"}], "waarde"
+        )
+        # s2 slaat later op: de nieuwste training in de database is van s2
+        await managers["s2"]._save_training_results([{"rondenummer": 1, "waarde": 0.9, "uitkomst": "fout"}], "waarde")
+        return (
+            await trainingen_router.get_laatste_rondewaarden(STANDAARD_STATION),
+            await trainingen_router.get_laatste_rondewaarden("s2"),
+            await trainingen_router.get_laatste_rondewaarden("onbekend"),
+        )
+
+    standaard, s2, onbekend = asyncio.run(scenario())
+    assert (standaard.gebruikersnaam, standaard.aantal_correct, standaard.gemiddelde_waarde) == ("Anna", 2, 0.5)
+    assert (s2.gebruikersnaam, s2.aantal_fout) == ("Bob", 1)
+    assert onbekend.status_code == 404
+    assert managers["s2"].laatste_trainings_id > managers[STANDAARD_STATION].laatste_trainings_id
+
+
+def test_geen_resultaten_zonder_opgeslagen_training(database, monkeypatch):
+    monkeypatch.setattr(trainingen_router, "game_managers", {STANDAARD_STATION: _manager_met_instellingen("Anna")})
+
+    assert asyncio.run(trainingen_router.get_laatste_rondewaarden()).status_code == 404
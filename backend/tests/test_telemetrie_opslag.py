@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.src.repositories.async_data_repository import AsyncDataRepository
+from backend.src.repositories.data_repository import DataRepository
+from backend.src.services.telemetrie_opslag import (
+    RESOLUTIES,
+    TelemetrieBuffer,
+    TelemetrieOpslag,
+    bereken_rollups,
+    voorspel_batterij,
+)
+
+
+def test_buffer_verwerpt_oudste_bij_overloop():
+    buffer = TelemetrieBuffer(3)
+    for i in range(5):
+        buffer.voeg_toe(1000.0 + i, "default", "rood", 0, 90 - i)
+
+    assert [meting[0] for meting in buffer.neem_alle()] == [1002.0, 1003.0, 1004.0]
+    assert buffer.verworpen == 2
+    assert len(buffer) == 0
+
+
+def test_rollups_per_resolutie_en_interval():
+    metingen = [
+        (120.0, "default", "rood", "batterij", 80.0),
+        (150.0, "default", "rood", "batterij", 78.0),
+        (185.0, "default", "rood", "batterij", 77.0),
+        (130.0, "default", "blauw", "batterij", 60.0),
+    ]
+    rollups = {rij[:5]: rij[5:] for rij in bereken_rollups(metingen)}
+
+    # (aantal, som, minimum, maximum, laatste)
+    assert rollups[(60, "default", "rood", "batterij", 120)] == (2, 158.0, 78.0, 80.0, 78.0)
+    assert rollups[(60, "default", "rood", "batterij", 180)] == (1, 77.0, 77.0, 77.0, 77.0)
+    assert rollups[(3600, "default", "rood", "batterij", 0)] == (3, 235.0, 77.0, 80.0, 77.0)
+    assert rollups[(86400, "default", "blauw", "batterij", 0)] == (1, 60.0, 60.0, 60.0, 60.0)
+    assert len(rollups) == 2 + 1 + 1 + 3
+
+
+def test_voorspelling_lineaire_trend():
+    # 10 procent per uur, elke minuut een meting
+    punten = [(minuut * 60.0, 90 - minuut / 6) for minuut in range(120)]
+    voorspelling = voorspel_batterij(punten)
+
+    assert voorspelling["verbruik_per_uur"] == pytest.approx(10, abs=0.01)
+    assert voorspelling["resterende_uren"] == pytest.approx(punten[-1][1] / 10, abs=0.1)
+    assert voorspelling["metingen"] == 120
+    assert voorspel_batterij(punten, huidig=50)["resterende_uren"] == 5.0
+
+
+def test_voorspelling_zonder_dalende_trend():
+    assert voorspel_batterij([(0.0, 80.0)])["verbruik_per_uur"] is None
+    assert voorspel_batterij([(0.0, 80.0), (0.0, 79.0)])["verbruik_per_uur"] is None
+    opladen = voorspel_batterij([(0.0, 50.0), (3600.0, 60.0)])
+    assert opladen["verbruik_per_uur"] == -10.0
+    assert opladen["resterende_uren"] is None
+
+
+def test_flush_en_recentste_metingen(database):
+    async def scenario():
+        opslag = TelemetrieOpslag()
+        begin = time.time() - 3 * 3600
+        for minuut in range(180):
+            opslag.noteer("default", "rood", "batterij", 90 - minuut / 6, begin + minuut * 60)
+        weggeschreven = await opslag.flush()
+        ruw = await AsyncDataRepository.get_telemetrie("default", "batterij", None, 0, time.time(), limiet=10)
+        per_minuut = await AsyncDataRepository.get_telemetrie("default", "batterij", RESOLUTIES["1m"], 0, time.time())
+        return weggeschreven, ruw, per_minuut
+
+    weggeschreven, ruw, per_minuut = asyncio.run(scenario())
+    assert weggeschreven == 180
+    # Bij afkappen blijven de recentste metingen over, oplopend gesorteerd
+    assert ruw["afgekapt"]
+    assert [round(meting["waarde"], 2) for meting in ruw["metingen"]] == [round(90 - minuut / 6, 2) for minuut in range(170, 180)]
+    assert not per_minuut["afgekapt"]
+    assert len(per_minuut["metingen"]) == 180
+
+
+def test_mislukte_flush_houdt_metingen_bij(database, monkeypatch):
+    mislukt = {"actief": True}
+
+    async def save_telemetrie(*args):
+        return None if mislukt["actief"] else DataRepository.save_telemetrie(*args)
+
+    monkeypatch.setattr(AsyncDataRepository, "save_telemetrie", save_telemetrie)
+
+    async def scenario():
+        opslag = TelemetrieOpslag()
+        opslag.noteer("default", "rood", "batterij", 80, 1000.0)
+        eerste = await opslag.flush()
+        stats = opslag.stats()
+        mislukt["actief"] = False
+        return eerste, stats, await opslag.flush()
+
+    eerste, stats, tweede = asyncio.run(scenario())
+    assert eerste == 0
+    assert stats["in_buffer"] == 1 and stats["fouten"] == 1
+    assert tweede == 1
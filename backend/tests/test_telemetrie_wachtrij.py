@@ -0,0 +1,98 @@
+import asyncio
+import logging
+
+from backend.src.services.mqtt_client import MQTTDeviceManager
+from backend.src.services.telemetrie_wachtrij import SamenvoegendeWachtrij
+
+
+class Bericht:
+    def __init__(self, topic: str, payload: bytes):
+        self.topic = topic
+        self.payload = payload
+
+
+def _haal_alle(wachtrij: SamenvoegendeWachtrij) -> list:
+    async def haal():
+        berichten = []
+        while wachtrij.stats()["diepte"]:
+            berichten.append((await wachtrij.haal())[1])
+        return berichten
+    return asyncio.run(haal())
+
+
+def test_samenvoegen_behoudt_plaats_met_laatste_waarde():
+    wachtrij = SamenvoegendeWachtrij("test", 10)
+    wachtrij.zet("rood", 80)
+    wachtrij.zet("blauw", 70)
+    wachtrij.zet("rood", 79)
+
+    assert _haal_alle(wachtrij) == [79, 70]
+    assert wachtrij.stats()["samengevoegd"] == 1
+
+
+def test_vol_verwerpt_oudste():
+    wachtrij = SamenvoegendeWachtrij("test", 2)
+    for kleur in ("rood", "blauw", "geel"):
+        wachtrij.zet(kleur, kleur)
+
+    assert _haal_alle(wachtrij) == ["blauw", "geel"]
+    assert wachtrij.stats()["verworpen"] == 1
+    assert wachtrij.stats()["max_diepte"] == 2
+
+
+def test_zonder_samenvoegen_elk_bericht():
+    wachtrij = SamenvoegendeWachtrij("test", 10, samenvoegen=False)
+    wachtrij.zet("rood", "offline")
+    wachtrij.zet("rood", "online")
+
+    assert _haal_alle(wachtrij) == ["offline", "online"]
+
+
+def test_verwerk_gaat_door_na_fout():
+    async def scenario():
+        wachtrij = SamenvoegendeWachtrij("test", 10, samenvoegen=False)
+        verwerkt = []
+
+        async def handler(bericht):
+            if bericht == "fout":
+                raise ValueError(bericht)
+            verwerkt.append(bericht)
+
+        consument = asyncio.create_task(wachtrij.verwerk(handler))
+        for bericht in ("eerste", "fout", "laatste"):
+            wachtrij.zet(None, bericht)
+        while wachtrij.stats()["verwerkt"] < 3:
+            await asyncio.sleep(0)
+        consument.cancel()
+        return verwerkt, wachtrij.stats()
+
+    verwerkt, stats = asyncio.run(scenario())
+    assert verwerkt == ["eerste", "laatste"]
+    assert stats["fouten"] == 1
+
+
+def test_status_flaps_niet_samengevoegd_batterij_wel():
+    manager = MQTTDeviceManager()
+    for topic, payload in (
+        ("bm/rood/status", b"offline"),
+        ("bm/rood/status", b"online"),
+        ("bm/rood/battery", b"50"),
+        ("bm/rood/battery", b"49"),
+    ):
+        manager._handle_message(Bericht(topic, payload))
+
+    assert [bericht[3] for bericht in _haal_alle(manager._status)] == ["offline", "online"]
+    assert [bericht[3] for bericht in _haal_alle(manager._telemetrie)] == ["49"]
+
+
+def test_fout_bericht_stopt_de_ontvangst_niet(caplog):
+    detecties = []
+    manager = MQTTDeviceManager()
+    manager.zet_detectie_callback(detecties.append)
+
+    with caplog.at_level(logging.ERROR):
+        manager._handle_message(Bericht("bm/rood/detect", b"\xff\xfe"))
+    manager._handle_message(Bericht("bm/rood/detect", b"120"))
+
+    assert "niet verwerkt" in caplog.text
+    assert [detectie["afstand"] for detectie in detecties] == [120]
@@ -5,6 +5,8 @@
 #include <VL53L0X.h>
 
 #define DEVICE_COLOR "geel"
+// Station van deze kegelset, leeg = standaard station (bm/<kleur>/...), anders bm/<station>/<kleur>/...
+#define DEVICE_STATION ""
 
 const char* WIFI_SSID = "BrainMoveG1";
 const char* WIFI_PASSWORD = "bmSecure1998";
@@ -45,7 +47,8 @@ WiFiClient wifiClient;
 PubSubClient mqttClient(wifiClient);
 VL53L0X tofSensor;
 
-String topic_detect, topic_battery, topic_status, topic_cmd, topic_cmd_all;
+String topic_detect, topic_battery, topic_status, topic_cmd, topic_cmd_all, topic_echo, topic_ack;
+String laatsteCommandoSeq = "";
 
 bool isPolling = false;
 bool isCorrectTarget = false;
@@ -86,11 +89,14 @@ void setup() {
   initHardware();
   if (ontwaakOorzaak == ESP_SLEEP_WAKEUP_GPIO) speelOntwaakGeluid();
   
-  topic_detect = String("bm/") + DEVICE_COLOR + "/detect";
-  topic_battery = String("bm/") + DEVICE_COLOR + "/battery";
-  topic_status = String("bm/") + DEVICE_COLOR + "/status";
-  topic_cmd = String("bm/") + DEVICE_COLOR + "/cmd";
-  topic_cmd_all = "bm/all/cmd";
+  String topic_basis = String("bm/") + (strlen(DEVICE_STATION) ? String(DEVICE_STATION) + "/" : String(""));
+  topic_detect = topic_basis + DEVICE_COLOR + "/detect";
+  topic_battery = topic_basis + DEVICE_COLOR + "/battery";
+  topic_status = topic_basis + DEVICE_COLOR + "/status";
+  topic_cmd = topic_basis + DEVICE_COLOR + "/cmd";
+  topic_cmd_all = topic_basis + "all/cmd";
+  topic_echo = topic_basis + DEVICE_COLOR + "/echo";
+  topic_ack = topic_basis + DEVICE_COLOR + "/ack";
   
   mqttClient.setServer(MQTT_BROKER, MQTT_PORT);
   mqttClient.setCallback(mqttCallback);
@@ -183,7 +189,7 @@ void verbindGeforceerd() {
 
     if (WiFi.status() != WL_CONNECTED) return;
 
-    String clientId = String("BM-") + DEVICE_COLOR + "-" + String(ESP.getEfuseMac(), HEX);
+    String clientId = String("BM-") + DEVICE_STATION + DEVICE_COLOR + "-" + String(ESP.getEfuseMac(), HEX);
 
     if (mqttClient.connect(clientId.c_str(), topic_status.c_str(), 1, true, "offline")) {
       Serial.println("MQTT OK!");
@@ -216,7 +222,21 @@ void verbindGeforceerd() {
 void mqttCallback(char* topic, byte* payload, unsigned int length) {
   String message = "";
   for (unsigned int i = 0; i < length; i++) message += (char)payload[i];
+  // Latentie kalibratie: volgnummer meteen terugsturen, geen activiteit (houdt de kegel niet wakker)
+  if (message.startsWith("ping:")) {
+    mqttClient.publish(topic_echo.c_str(), message.substring(5).c_str(), false);
+    return;
+  }
   laatsteActiviteitTijd = millis();
+  // Bevestigd commando "<commando>#<seq>": meteen ack sturen, een herhaling niet opnieuw uitvoeren
+  int hekje = message.indexOf('#');
+  if (hekje >= 0) {
+    String seq = message.substring(hekje + 1);
+    message = message.substring(0, hekje);
+    mqttClient.publish(topic_ack.c_str(), seq.c_str(), false);
+    if (seq == laatsteCommandoSeq) return;
+    laatsteCommandoSeq = seq;
+  }
   if (message == "start") {
     isPolling = true;
     WiFi.setSleep(false);
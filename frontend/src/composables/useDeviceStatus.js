@@ -1,6 +1,6 @@
 import { ref, onMounted, onUnmounted } from 'vue';
-import { connectSocket } from '../services/socket.js';
-import { getApiUrl } from '../config/api.js';
+import { connectSocket, subscribe, unsubscribe } from '../services/socket.js';
+import { getStationUrl } from '../config/api.js';
 
 const allDevicesConnected = ref(false);
 const connectedDevices = ref([]);
@@ -8,6 +8,9 @@ const disconnectedDevices = ref([]);
 let socket = null;
 let listenerCount = 0;
 let listenersAttached = false;
+// Versie van de laatst toegepaste telemetrie snapshot, null = eerst een volledige snapshot nodig
+let snapshotVersie = null;
+let connectHandler = null;
 const monitoringPaused = ref(false);
 
 function loadFromSessionStorage() {
@@ -68,12 +71,58 @@ export function useDeviceStatus() {
   }
 
   function resumeMonitoring() {
+    if (!monitoringPaused.value) return;
     monitoringPaused.value = false;
+    // Tijdens de pauze genegeerde diffs inhalen
+    snapshotVersie = null;
+    requestSnapshot();
   }
 
+  function setDevices(devices) {
+    connectedDevices.value = devices.filter((d) => d.status === 'online');
+    disconnectedDevices.value = devices.filter((d) => d.status !== 'online');
+    allDevicesConnected.value = connectedDevices.value.length === 4 && disconnectedDevices.value.length === 0;
+    saveToSessionStorage();
+  }
+
+  // Snapshot van de server: volledig (bij het abonneren) of een diff met enkel de gewijzigde kegels
+  function applySnapshot(snapshot) {
+    if (!snapshot || !Array.isArray(snapshot.apparaten) || monitoringPaused.value) return;
+    const updates = snapshot.apparaten.map(normalizeDevice);
+
+    if (snapshot.volledig) {
+      if (snapshotVersie !== null && snapshot.versie < snapshotVersie) return;
+      setDevices(updates);
+    } else {
+      if (snapshotVersie !== null && snapshot.versie <= snapshotVersie) return;
+      if (snapshotVersie === null || snapshot.versie !== snapshotVersie + 1) {
+        // Versie gemist: de diff is niet toe te passen, vraag de volledige toestand op
+        snapshotVersie = null;
+        requestSnapshot();
+        return;
+      }
+      const devices = [...connectedDevices.value, ...disconnectedDevices.value];
+      updates.forEach((update) => {
+        const idx = devices.findIndex((d) => d.kleur === update.kleur);
+        if (idx >= 0) devices[idx] = { ...devices[idx], ...update };
+        else devices.push(update);
+      });
+      setDevices(devices);
+    }
+    snapshotVersie = snapshot.versie;
+  }
+
+  function requestSnapshot() {
+    if (!socket || !socket.connected) return false;
+    socket.emit('apparaten_snapshot', {}, (snapshot) => applySnapshot(snapshot));
+    return true;
+  }
+
+  // Via de socket als die verbonden is, anders (eenmalig) via de REST API
   async function fetchDeviceStatus() {
+    if (requestSnapshot()) return;
     try {
-      const res = await fetch(getApiUrl('devices/status'));
+      const res = await fetch(getStationUrl('devices/status'));
       if (!res.ok) throw new Error(`Request failed: ${res.status}`);
       const data = await res.json();
 
@@ -100,32 +149,10 @@ export function useDeviceStatus() {
     }
   }
 
-  function applyBatteryUpdate(payload) {
-    if (!payload) return false;
-    const items = Array.isArray(payload)
-      ? payload
-      : Array.isArray(payload.apparaten)
-        ? payload.apparaten
-        : [payload];
-    let didUpdate = false;
-
-    items.forEach((item) => {
-      const update = normalizeDevice(item);
-      if (!update?.kleur) return;
-
-      const updateList = (list) => {
-        const idx = list.value.findIndex((d) => d.kleur === update.kleur);
-        if (idx < 0) return false;
-        list.value = list.value.map((d, i) => (i === idx ? { ...d, ...update } : d));
-        return true;
-      };
-
-      if (updateList(connectedDevices) || updateList(disconnectedDevices)) {
-        didUpdate = true;
-      }
-    });
-
-    return didUpdate;
+  function onConnect() {
+    // Na een (her)verbinding kunnen diffs gemist zijn
+    snapshotVersie = null;
+    requestSnapshot();
   }
 
   function setupListeners() {
@@ -135,6 +162,7 @@ export function useDeviceStatus() {
     }
 
     if (!listenersAttached) {
+      subscribe('apparaten');
       socket.on('all_devices_connected', (data) => {
         if (monitoringPaused.value) return;
         console.log('[useDeviceStatus] all_devices_connected:', data);
@@ -146,41 +174,10 @@ export function useDeviceStatus() {
         saveToSessionStorage();
       });
 
-      socket.on('device_connected', (data) => {
-        if (monitoringPaused.value) return;
-        console.log('[useDeviceStatus] device_connected:', data);
-        const dev = normalizeDevice(data);
-        const existingIndex = connectedDevices.value.findIndex((d) => d.kleur === dev.kleur);
-        if (existingIndex >= 0) {
-          connectedDevices.value[existingIndex] = { ...connectedDevices.value[existingIndex], ...dev };
-        } else {
-          connectedDevices.value = [...connectedDevices.value, dev];
-        }
-        disconnectedDevices.value = disconnectedDevices.value.filter((d) => d.kleur !== dev.kleur);
-        saveToSessionStorage();
-      });
-
-      socket.on('device_disconnected', (data) => {
-        if (monitoringPaused.value) return;
-        console.log('[useDeviceStatus] device_disconnected:', data);
-        allDevicesConnected.value = false;
-        const dev = normalizeDevice(data);
-        connectedDevices.value = connectedDevices.value.filter((d) => d.kleur !== dev.kleur);
-        const existingIndex = disconnectedDevices.value.findIndex((d) => d.kleur === dev.kleur);
-        if (existingIndex >= 0) {
-          disconnectedDevices.value[existingIndex] = { ...disconnectedDevices.value[existingIndex], ...dev };
-        } else {
-          disconnectedDevices.value = [...disconnectedDevices.value, dev];
-        }
-        saveToSessionStorage();
-      });
-
-      socket.on('device_battery_update', (data) => {
-        if (monitoringPaused.value) return;
-        console.log('[useDeviceStatus] device_battery_update:', data);
-        const updated = applyBatteryUpdate(data);
-        if (updated) saveToSessionStorage();
-      });
+      connectHandler = onConnect;
+      socket.on('connect', connectHandler);
+      socket.on('apparaten_snapshot', applySnapshot);
+      if (socket.connected) requestSnapshot();
 
       listenersAttached = true;
     }
@@ -196,9 +193,10 @@ export function useDeviceStatus() {
 
     if (listenerCount === 0) {
       socket.off('all_devices_connected');
-      socket.off('device_connected');
-      socket.off('device_disconnected');
-      socket.off('device_battery_update');
+      socket.off('connect', connectHandler);
+      socket.off('apparaten_snapshot');
+      snapshotVersie = null;
+      unsubscribe('apparaten');
       listenersAttached = false;
       isActive.value = false;
     }
@@ -1,5 +1,6 @@
 import { ref } from 'vue';
 import { useRouter } from 'vue-router';
+import { getStationUrl } from '../config/api.js';
 
 /**
  * Composable for game countdown (3, 2, 1, GO!)
@@ -31,7 +32,7 @@ export function useGameCountdown(options = {}) {
 
     if (gameId) {
       try {
-        const res = await fetch(`http://10.42.0.1:8000/games/${gameId}/play`, { method: 'GET' });
+        const res = await fetch(getStationUrl(`games/${gameId}/play`), { method: 'GET' });
 
         if (res.ok) {
           const data = await res.json();
@@ -1,6 +1,6 @@
 import { onMounted, onUnmounted } from 'vue';
 import { useRouter } from 'vue-router';
-import { getApiUrl } from '../config/api.js';
+import { getStationUrl } from '../config/api.js';
 
 function readChosenColors() {
   try {
@@ -61,7 +61,7 @@ export function useGameDeviceGuard(gameId) {
       sessionStorage.setItem('last_global_popup', JSON.stringify({ title, message }));
     } catch (err) {}
     try {
-      await fetch(getApiUrl('games/stop'), { method: 'GET' });
+      await fetch(getStationUrl('games/stop'), { method: 'GET' });
     } catch (err) {
       console.error('[useGameDeviceGuard] stop game failed', err);
     }
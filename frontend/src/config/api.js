@@ -11,10 +11,30 @@ export function getApiUrl(path) {
   return `${API_BASE_URL}/${cleanPath}`;
 }
 
+// Station (kegelset) van dit toestel: ?station=<naam> in de URL wordt onthouden, anders VITE_STATION
+function leesStation() {
+  try {
+    const uitUrl = new URLSearchParams(window.location.search).get('station');
+    if (uitUrl) localStorage.setItem('station', uitUrl);
+    return uitUrl || localStorage.getItem('station') || import.meta.env.VITE_STATION || 'default';
+  } catch (e) {
+    return import.meta.env.VITE_STATION || 'default';
+  }
+}
+
+export const STATION = leesStation();
+
+// API URL voor endpoints die per station werken (games, kegels)
+export function getStationUrl(path) {
+  const url = getApiUrl(path);
+  return `${url}${url.includes('?') ? '&' : '?'}station=${encodeURIComponent(STATION)}`;
+}
+
 // Export environment info for debugging
 export const ENV_INFO = {
   mode: import.meta.env.MODE,
   apiBaseUrl: API_BASE_URL,
+  station: STATION,
   isDevelopment: import.meta.env.DEV,
   isProduction: import.meta.env.PROD,
 };
@@ -0,0 +1,76 @@
+// Omzetting tussen de monotone klok van de backend (ms) en performance.now() van deze browser.
+// NTP-achtig: de client stuurt 'klok_sync' met t0, de backend antwoordt met server_ms. De meting met
+// de kleinste rtt uit het venster wordt gebruikt, want daar is de fout op de offset hoogstens rtt / 2.
+// Tot er een meting is, geeft server_ms uit game events een (te kleine) schatting.
+
+const SYNC_BURST = 5; // pings bij (her)verbinden
+const SYNC_BURST_INTERVAL_MS = 100;
+const SYNC_INTERVAL_MS = 10000;
+const SYNC_VENSTER = 8; // aantal bewaarde metingen
+const HERSTART_DREMPEL_MS = 1000; // grotere sprong = backend herstart, monotone klok begint opnieuw
+
+let samples = [];
+let best = null; // { rttMs, offsetMs }
+let fallbackOffsetMs = null;
+let timer = null;
+
+function chooseBest() {
+  best = samples.reduce((a, b) => (a === null || b.rttMs < a.rttMs ? b : a), null);
+}
+
+function ping(socket) {
+  if (!socket || !socket.connected) return;
+  const t0 = performance.now();
+  const payload = { t0 };
+  if (best) {
+    payload.rtt_ms = best.rttMs;
+    payload.offset_ms = best.offsetMs;
+  }
+  socket.timeout(2000).emit('klok_sync', payload, (err, ack) => {
+    if (err || !ack || ack.server_ms === undefined) return;
+    const t3 = performance.now();
+    const rttMs = t3 - t0;
+    const offsetMs = Number(ack.server_ms) - (t0 + rttMs / 2);
+    if (best && Math.abs(offsetMs - best.offsetMs) > HERSTART_DREMPEL_MS) samples = [];
+    samples.push({ rttMs, offsetMs });
+    if (samples.length > SYNC_VENSTER) samples.shift();
+    chooseBest();
+  });
+}
+
+export function startClockSync(socket) {
+  stopClockSync();
+  for (let i = 0; i < SYNC_BURST; i++) setTimeout(() => ping(socket), i * SYNC_BURST_INTERVAL_MS);
+  timer = setInterval(() => ping(socket), SYNC_INTERVAL_MS);
+}
+
+export function stopClockSync() {
+  if (timer !== null) clearInterval(timer);
+  timer = null;
+}
+
+export function registerServerTime(serverMs) {
+  const value = Number(serverMs);
+  if (isNaN(value)) return;
+  const sample = value - performance.now();
+  if (fallbackOffsetMs === null || sample > fallbackOffsetMs || fallbackOffsetMs - sample > HERSTART_DREMPEL_MS) fallbackOffsetMs = sample;
+}
+
+export function clockOffsetMs() {
+  if (best) return best.offsetMs;
+  return fallbackOffsetMs ?? 0;
+}
+
+export function serverToLocal(serverMs) {
+  return Number(serverMs) - clockOffsetMs();
+}
+
+export function clockSyncStats() {
+  return best ? { rttMs: best.rttMs, offsetMs: best.offsetMs, samples: samples.length } : null;
+}
+
+export function resetClockSync() {
+  samples = [];
+  best = null;
+  fallbackOffsetMs = null;
+}
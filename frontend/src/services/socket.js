@@ -1,7 +1,10 @@
 import { io } from 'socket.io-client';
-import { API_BASE_URL } from '../config/api.js';
+import { API_BASE_URL, STATION } from '../config/api.js';
+import { startClockSync, stopClockSync } from './clockSync.js';
 
 let socket = null;
+// Onderwerp ('game', 'apparaten') -> aantal componenten dat het volgt, opnieuw verstuurd bij elke (her)verbinding
+const abonnementen = new Map();
 
 export function getSocket() {
   if (!socket) {
@@ -13,6 +16,15 @@ export function getSocket() {
       reconnectionDelay: 500,
       timeout: 5000,
     });
+    socket.on('connect', () => {
+      // Enkel de events van het eigen station ontvangen
+      socket.emit('kies_station', { station: STATION });
+      for (const [onderwerp, aantal] of abonnementen) {
+        if (aantal > 0) socket.emit('abonneer', { onderwerp });
+      }
+      startClockSync(socket);
+    });
+    socket.on('disconnect', () => stopClockSync());
   }
   return socket;
 }
@@ -25,7 +37,21 @@ export function connectSocket() {
 
 export function disconnectSocket() {
   if (socket) {
+    stopClockSync();
     socket.disconnect();
     socket = null;
   }
 }
+
+// De server stuurt game en kegel events enkel naar clients die erop geabonneerd zijn
+export function subscribe(onderwerp) {
+  const aantal = (abonnementen.get(onderwerp) || 0) + 1;
+  abonnementen.set(onderwerp, aantal);
+  if (aantal === 1 && socket && socket.connected) socket.emit('abonneer', { onderwerp });
+}
+
+export function unsubscribe(onderwerp) {
+  const aantal = Math.max((abonnementen.get(onderwerp) || 0) - 1, 0);
+  abonnementen.set(onderwerp, aantal);
+  if (aantal === 0 && socket && socket.connected) socket.emit('afmelden', { onderwerp });
+}